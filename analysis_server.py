@@ -0,0 +1,42 @@
+import argparse
+import asyncio
+
+from src.service.analysis_server import AnalysisServer
+
+from config import settings
+
+def parse_arguments():
+    """ Parses the command line arguments of the analysis server """
+    parser = argparse.ArgumentParser(
+            description="Analyzes positions of the configured board for clients sending JSON lines")
+
+    parser.add_argument("--host", default=settings["server"]["HOST"],
+                        help="the TCP host (default: {})".format(settings["server"]["HOST"]))
+    parser.add_argument("--port", type=int, default=settings["server"]["PORT"],
+                        help="the TCP port (default: {})".format(settings["server"]["PORT"]))
+    parser.add_argument("--unix-socket", default=settings["server"]["UNIX_SOCKET"],
+                        help="the Unix socket path, used instead of TCP if given")
+    parser.add_argument("--workers", type=int, default=settings["server"]["WORKERS"],
+                        help="the number of worker processes (default: {})".format(settings["server"]["WORKERS"]))
+
+    return parser.parse_args()
+
+async def serve(arguments):
+    server = AnalysisServer(arguments.workers,
+                            settings["server"]["MAX_PENDING_REQUESTS"],
+                            settings["server"]["MAX_DEPTH"],
+                            settings["server"]["MAX_MOVE_TIME_MS"])
+
+    address = await server.start(arguments.host, arguments.port, arguments.unix_socket)
+    print("Listening on {}".format(address), flush=True)
+
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(serve(parse_arguments()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,100 @@
+"""
+Measures the cost of a MiniMaxAI search per visited node.
+
+Run from the repository root:
+    python -m benchmark.minimax_benchmark [DEPTH ...]
+
+For every depth it reports the number of visited nodes (pieces dropped by
+the search), the nodes searched per second, the board copies made per node
+and the peak traced memory per node.
+"""
+import sys
+import time
+import tracemalloc
+
+import src.ai.minimax_ai as minimax_module
+from src.ai.minimax_ai import MiniMaxAI
+from src.domain.board import Board
+
+from config import settings
+
+""" The columns played before the benchmarked move (players alternate) """
+OPENING_MOVES = [3, 3, 2, 4]
+
+DEFAULT_DEPTHS = [5, 6, 7]
+
+class CountingBoard(Board):
+    """ Board counting the pieces dropped into it (one per search node) """
+    drop_count = 0
+
+    def drop_piece(self, column_index, player_id):
+        CountingBoard.drop_count += 1
+        super().drop_piece(column_index, player_id)
+
+class CountingDeepCopy:
+    """ Wraps copy.deepcopy, counting the copies made by the AI module """
+    def __init__(self, deepcopy):
+        self.deepcopy = deepcopy
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+        return self.deepcopy(*args, **kwargs)
+
+def get_benchmark_board():
+    """ Returns the board position used by the benchmark """
+    board = CountingBoard(settings["game"]["BOARD_WIDTH"], settings["game"]["BOARD_HEIGHT"])
+
+    for move_index, column_index in enumerate(OPENING_MOVES):
+        board.drop_piece(column_index, move_index % 2 + 1)
+
+    return board
+
+def run_search(board, player):
+    """ Runs one search, returning (visited nodes, board copies, elapsed seconds) """
+    counting_deepcopy = CountingDeepCopy(minimax_module.deepcopy)
+    minimax_module.deepcopy = counting_deepcopy
+    CountingBoard.drop_count = 0
+    MiniMaxAI.clear_transposition_table()
+
+    try:
+        start_time = time.perf_counter()
+        MiniMaxAI.get_move(board, player)
+        elapsed_time = time.perf_counter() - start_time
+    finally:
+        minimax_module.deepcopy = counting_deepcopy.deepcopy
+
+    return CountingBoard.drop_count, counting_deepcopy.count, elapsed_time
+
+def benchmark_depth(depth):
+    """ Benchmarks a search at the given depth, returning a dict of results """
+    settings["ai"]["minimax"]["DEPTH"] = depth
+    player = len(OPENING_MOVES) % 2 + 1
+
+    nodes, board_copies, elapsed_time = run_search(get_benchmark_board(), player)
+
+    tracemalloc.start()
+    run_search(get_benchmark_board(), player)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "depth": depth,
+        "nodes": nodes,
+        "nodes_per_second": nodes / elapsed_time,
+        "board_copies_per_node": board_copies / max(nodes, 1),
+        "peak_bytes_per_node": peak_memory / max(nodes, 1),
+    }
+
+def main(depths):
+    print("{:>5} {:>10} {:>12} {:>14} {:>16}".format(
+        "depth", "nodes", "nodes/s", "copies/node", "peak bytes/node"))
+
+    for depth in depths:
+        result = benchmark_depth(depth)
+
+        print("{depth:>5} {nodes:>10} {nodes_per_second:>12.0f} "
+              "{board_copies_per_node:>14.4f} {peak_bytes_per_node:>16.2f}".format(**result))
+
+if __name__ == "__main__":
+    main([int(depth) for depth in sys.argv[1:]] or DEFAULT_DEPTHS)
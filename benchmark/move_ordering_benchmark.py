@@ -0,0 +1,47 @@
+"""
+Compares the MiniMaxAI move ordering heuristics.
+
+Run from the repository root:
+    python -m benchmark.move_ordering_benchmark [DEPTH]
+
+For every heuristic combination it reports the visited nodes, the search
+time, the rate of expanded nodes that were cut off and the rate of cutoffs
+caused by the first searched move.
+"""
+import sys
+
+from benchmark.minimax_benchmark import get_benchmark_board, run_search, OPENING_MOVES
+from src.ai.minimax_ai import MiniMaxAI
+from src.ai.move_ordering import MoveOrderer
+
+from config import settings
+
+DEFAULT_DEPTH = 6
+
+MOVE_ORDERINGS = [
+    [],
+    [MoveOrderer.CENTER],
+    [MoveOrderer.CENTER, MoveOrderer.KILLER],
+    [MoveOrderer.CENTER, MoveOrderer.HISTORY],
+    [MoveOrderer.CENTER, MoveOrderer.KILLER, MoveOrderer.HISTORY],
+]
+
+def main(depth):
+    settings["ai"]["minimax"]["DEPTH"] = depth
+    player = len(OPENING_MOVES) % 2 + 1
+
+    print("{:<24} {:>10} {:>10} {:>12} {:>18}".format(
+        "ordering", "nodes", "seconds", "cutoff rate", "first move cutoffs"))
+
+    for move_ordering in MOVE_ORDERINGS:
+        settings["ai"]["minimax"]["MOVE_ORDERING"] = move_ordering
+
+        nodes, _, elapsed_time = run_search(get_benchmark_board(), player)
+        statistics = MiniMaxAI.get_move_ordering_statistics()
+
+        print("{:<24} {:>10} {:>10.2f} {:>12.3f} {:>18.3f}".format(
+            ",".join(move_ordering) or "LEFT_TO_RIGHT", nodes, elapsed_time,
+            statistics["cutoff_rate"], statistics["first_move_cutoff_rate"]))
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_DEPTH)
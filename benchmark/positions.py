@@ -0,0 +1,50 @@
+"""
+Fixed corpus of benchmark positions.
+
+Every position is a board shape, a winning sequence length and the columns
+played from the empty board (players 1 and 2 alternating). In none of them
+has a player won or can win with the next piece. The player to move is the
+next one in the alternation.
+"""
+from src.domain.board import Board
+
+POSITIONS = {
+    "opening": {
+        "width": 7, "height": 6, "winning_sequence_length": 4,
+        "moves": [3, 3, 2, 4],
+    },
+    "midgame": {
+        "width": 7, "height": 6, "winning_sequence_length": 4,
+        "moves": [1, 4, 6, 6, 6, 0, 2, 0, 3, 6, 3, 3, 5, 3, 6, 1],
+    },
+    "near_endgame": {
+        "width": 7, "height": 6, "winning_sequence_length": 4,
+        "moves": [4, 6, 4, 0, 0, 5, 4, 5, 2, 3, 6, 0, 0, 2, 6, 0,
+                  2, 5, 6, 4, 4, 6, 2, 3, 2, 2, 3, 4, 5, 0, 1, 5],
+    },
+    "large": {
+        "width": 15, "height": 12, "winning_sequence_length": 5,
+        "moves": [7, 7, 6, 8, 8, 6, 5, 9, 7, 7, 9, 5],
+    },
+    "huge": {
+        "width": 50, "height": 50, "winning_sequence_length": 5,
+        "moves": [25, 25, 24, 26, 23, 27, 26, 24],
+    },
+}
+
+def get_position(name):
+    """
+    Returns the board of a corpus position and the player to move
+
+    :param name: the name of the position (a key of POSITIONS)
+    :tparam name: string
+
+    :rtype: tuple (Board, player id value)
+    """
+    position = POSITIONS[name]
+    board = Board(position["width"], position["height"])
+
+    for move_index, column_index in enumerate(position["moves"]):
+        board.drop_piece(column_index, move_index % 2 + 1)
+
+    return board, len(position["moves"]) % 2 + 1
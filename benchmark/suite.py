@@ -0,0 +1,213 @@
+"""
+Times the hot paths of the game and the AI on a fixed corpus of positions
+(see benchmark.positions).
+
+Run from the repository root:
+    python -m benchmark.suite [--output FILE] [--baseline FILE] [--tolerance RATIO]
+
+Micro benchmarks (per call):
+    - Board.drop_piece (timed together with the matching pop_piece)
+    - Board.get_valid_moves
+    - GameStateAnalyzer.is_player_winning
+    - the leaf evaluation: scoring a whole position (IncrementalEvaluator
+      construction) and updating it for a drop / removal
+Macro benchmarks:
+    - MiniMaxAI.get_move at several depths
+
+The results (seconds per call, the best of several runs) are written as JSON.
+Given a baseline file written by an earlier run, every benchmark slower than
+the baseline by more than the tolerance is reported and the exit code is 1.
+"""
+import argparse
+import json
+import platform
+import sys
+import timeit
+from datetime import datetime, timezone
+
+from benchmark.positions import POSITIONS, get_position
+from src.ai.incremental_evaluator import IncrementalEvaluator
+from src.ai.minimax_ai import MiniMaxAI
+from src.service.game_state_analyzer import GameStateAnalyzer
+
+from config import settings
+
+""" The MiniMaxAI depths benchmarked for every position (big boards are searched less deep) """
+GET_MOVE_DEPTHS = {
+    "opening": [2, 4, 6],
+    "midgame": [2, 4, 6],
+    "near_endgame": [2, 4, 6],
+    "large": [2, 3],
+    "huge": [2],
+}
+
+""" The number of timing runs of a benchmark, the best one is kept """
+REPEAT = 5
+
+DEFAULT_TOLERANCE = 0.2
+
+class PositionSettings:
+    """ Applies the board shape of a corpus position to the settings, restoring them on exit """
+
+    def __init__(self, name):
+        self.__position = POSITIONS[name]
+        self.__saved_settings = None
+
+    def __enter__(self):
+        game_settings = settings["game"]
+        self.__saved_settings = {key: game_settings[key]
+                                 for key in ("BOARD_WIDTH", "BOARD_HEIGHT", "WINNING_SEQUENCE_LENGTH")}
+
+        game_settings["BOARD_WIDTH"] = self.__position["width"]
+        game_settings["BOARD_HEIGHT"] = self.__position["height"]
+        game_settings["WINNING_SEQUENCE_LENGTH"] = self.__position["winning_sequence_length"]
+
+    def __exit__(self, *exception_info):
+        settings["game"].update(self.__saved_settings)
+
+def time_call(function, number=None):
+    """
+    Returns the seconds per call of a function (the best of REPEAT runs)
+
+    :param number: the calls per run / None to pick it so that a run takes at least 0.2s
+    """
+    timer = timeit.Timer(function)
+
+    if number is None:
+        number, _ = timer.autorange()
+
+    return min(timer.repeat(REPEAT, number)) / number
+
+def benchmark_position(name):
+    """ Runs all the benchmarks of a corpus position, returning a dict of name to seconds per call """
+    board, player = get_position(name)
+    opponent = 3 - player
+    column_index = board.get_valid_moves()[0]
+    results = {}
+
+    def drop_and_pop():
+        board.drop_piece(column_index, player)
+        board.pop_piece()
+
+    results["board.drop_piece+pop_piece"] = time_call(drop_and_pop)
+    results["board.get_valid_moves"] = time_call(board.get_valid_moves)
+
+    with PositionSettings(name):
+        results["analyzer.is_player_winning"] = time_call(
+                lambda: GameStateAnalyzer.is_player_winning(board, player))
+
+        winning_sequence_length = settings["game"]["WINNING_SEQUENCE_LENGTH"]
+        multiplier = settings["ai"]["minimax"]["CENTER_ARRAY_SCORE_MULTIPLIER"]
+        sequence_scores = settings["ai"]["minimax"]["EVALUATE_SEQUENCE_SCORES"]
+
+        create_evaluator = lambda: IncrementalEvaluator(
+                board, player, opponent, winning_sequence_length, multiplier, sequence_scores)
+        results["evaluation.score_position"] = time_call(create_evaluator)
+
+        evaluator = create_evaluator()
+        row_index = board.get_top_occupied_row_index(column_index) - 1
+
+        def update_evaluation():
+            evaluator.drop_piece(row_index, column_index, player)
+            evaluator.pop_piece()
+
+        results["evaluation.drop_piece+pop_piece"] = time_call(update_evaluation)
+
+        for depth in GET_MOVE_DEPTHS[name]:
+            settings["ai"]["minimax"]["DEPTH"] = depth
+
+            def get_move():
+                MiniMaxAI.clear_transposition_table()
+                MiniMaxAI.get_move(board, player)
+
+            results["minimax.get_move.depth_{}".format(depth)] = time_call(get_move, 1)
+
+    return {"{}/{}".format(name, benchmark): seconds for benchmark, seconds in results.items()}
+
+def run_benchmarks():
+    """ Runs the benchmarks of every corpus position, returning the JSON report """
+    configured_depth = settings["ai"]["minimax"]["DEPTH"]
+    results = {}
+
+    try:
+        for name in POSITIONS:
+            results.update(benchmark_position(name))
+            print("benchmarked {}".format(name), file=sys.stderr, flush=True)
+    finally:
+        settings["ai"]["minimax"]["DEPTH"] = configured_depth
+
+    return {
+        "metadata": {
+            "time": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+def compare(report, baseline, tolerance):
+    """
+    Compares a report with a baseline report
+
+    :returns: list of (benchmark name, baseline seconds, seconds, ratio) of every
+              benchmark slower than the baseline by more than the tolerance
+    """
+    regressions = []
+
+    for name, seconds in report["results"].items():
+        baseline_seconds = baseline["results"].get(name)
+
+        if baseline_seconds and seconds / baseline_seconds > 1 + tolerance:
+            regressions.append((name, baseline_seconds, seconds, seconds / baseline_seconds))
+
+    return regressions
+
+def print_report(report, baseline):
+    """ Prints the results, with the change from the baseline when given """
+    print("{:<50} {:>14} {:>10}".format("benchmark", "us/call", "change"))
+
+    for name, seconds in report["results"].items():
+        change = ""
+
+        if baseline is not None and baseline["results"].get(name):
+            change = "{:+.1%}".format(seconds / baseline["results"][name] - 1)
+
+        print("{:<50} {:>14.2f} {:>10}".format(name, seconds * 1e6, change))
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Times the game and AI hot paths on a fixed position corpus")
+
+    parser.add_argument("--output", help="the path of the JSON report to be written")
+    parser.add_argument("--baseline", help="the path of a JSON report to compare with")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="the slowdown ratio reported as a regression (default: {})".format(DEFAULT_TOLERANCE))
+
+    return parser.parse_args()
+
+def main(arguments):
+    baseline = None
+    if arguments.baseline:
+        with open(arguments.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+
+    report = run_benchmarks()
+
+    if arguments.output:
+        with open(arguments.output, "w") as output_file:
+            json.dump(report, output_file, indent=4)
+
+    print_report(report, baseline)
+
+    if baseline is None:
+        return 0
+
+    regressions = compare(report, baseline, arguments.tolerance)
+
+    for name, baseline_seconds, seconds, ratio in regressions:
+        print("REGRESSION {}: {:.2f}us -> {:.2f}us ({:.2f}x)".format(
+            name, baseline_seconds * 1e6, seconds * 1e6, ratio))
+
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main(parse_arguments()))
@@ -0,0 +1,57 @@
+"""
+Measures the VectorBoard game throughput.
+
+Run from the repository root:
+    python -m benchmark.vector_board_benchmark [NUMBER_OF_GAMES] [SECONDS]
+
+Plays random and greedy (winning move first) games on the configured board
+for the given time and reports the finished games per minute, the moves per
+second and the results.
+"""
+import sys
+from time import perf_counter
+
+import numpy as np
+
+from src.domain.vector_board import VectorBoard
+
+from config import settings
+
+DEFAULT_NUMBER_OF_GAMES = 10_000
+DEFAULT_SECONDS = 5
+
+def run_policy(policy_name, number_of_games, seconds):
+    """ Plays games with a VectorBoard move policy, returning (games per minute, moves per second, VectorBoard) """
+    vector_board = VectorBoard(number_of_games,
+                               settings["game"]["BOARD_WIDTH"],
+                               settings["game"]["BOARD_HEIGHT"],
+                               settings["game"]["WINNING_SEQUENCE_LENGTH"],
+                               settings["game"]["NUMBER_OF_PLAYERS"])
+    random_generator = np.random.default_rng(0)
+    policy = getattr(vector_board, "get_{}_moves".format(policy_name))
+
+    steps = 0
+    start_time = perf_counter()
+
+    while perf_counter() - start_time < seconds:
+        vector_board.step(policy(random_generator))
+        steps += 1
+
+    elapsed_time = perf_counter() - start_time
+    finished_games = int(vector_board.wins.sum()) + vector_board.draws
+
+    return finished_games / elapsed_time * 60, steps * number_of_games / elapsed_time, vector_board
+
+def main(number_of_games, seconds):
+    print("{:<8} {:>14} {:>14}   {}".format("policy", "games/minute", "moves/second", "wins by player / draws"))
+
+    for policy_name in ("random", "greedy"):
+        games_per_minute, moves_per_second, vector_board = run_policy(policy_name, number_of_games, seconds)
+
+        print("{:<8} {:>14.0f} {:>14.0f}   {} / {}".format(
+            policy_name, games_per_minute, moves_per_second,
+            vector_board.wins[1:].tolist(), vector_board.draws))
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_NUMBER_OF_GAMES,
+         float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_SECONDS)
@@ -0,0 +1,47 @@
+import argparse
+from time import perf_counter
+
+from src.domain.board import Board
+from src.ai.minimax_ai import MiniMaxAI
+from src.ai.opening_book import OpeningBook
+
+from config import settings
+
+def parse_arguments():
+    """ Parses the command line arguments of the opening book builder """
+    parser = argparse.ArgumentParser(
+            description="Builds an opening book for the configured board by deep MiniMaxAI searches")
+
+    parser.add_argument("output", help="the path of the book file to be written")
+    parser.add_argument("--plies", type=int, default=4,
+                        help="the book covers the positions with less pieces than this (default: 4)")
+    parser.add_argument("--depth", type=int, default=8,
+                        help="the MiniMaxAI search depth of every book position (default: 8)")
+
+    arguments = parser.parse_args()
+
+    if settings["game"]["NUMBER_OF_PLAYERS"] != 2:
+        parser.error("opening books are built for two player games (NUMBER_OF_PLAYERS is {})".format(
+            settings["game"]["NUMBER_OF_PLAYERS"]))
+
+    return arguments
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+
+    """ The book is built by searching, it can not consult another book """
+    settings["ai"]["minimax"]["OPENING_BOOK"] = None
+    settings["ai"]["minimax"]["MOVE_TIME_MS"] = 0
+    settings["ai"]["minimax"]["DEPTH"] = arguments.depth
+
+    start_time = perf_counter()
+    entries = OpeningBook.build(Board(settings["game"]["BOARD_WIDTH"], settings["game"]["BOARD_HEIGHT"]),
+                                arguments.plies, MiniMaxAI.get_move)
+
+    OpeningBook.write(arguments.output,
+                      settings["game"]["BOARD_WIDTH"],
+                      settings["game"]["BOARD_HEIGHT"],
+                      settings["game"]["WINNING_SEQUENCE_LENGTH"],
+                      entries)
+
+    print("Wrote {} positions to {} in {:.1f}s".format(len(entries), arguments.output, perf_counter() - start_time))
@@ -0,0 +1,62 @@
+import argparse
+import asyncio
+import json
+
+from src.service.game_host import GameHost
+from src.service.tournament import EngineSpec
+
+from config import settings
+
+def parse_arguments():
+    """ Parses the command line arguments of the game host """
+    parser = argparse.ArgumentParser(
+            description="Hosts games of the configured board for clients sending JSON lines")
+
+    parser.add_argument("--engine", type=EngineSpec.parse, default=EngineSpec.parse(settings["host"]["ENGINE"]),
+                        help="the engine making the AI moves, as name or name:depth (default: {})".format(
+                            settings["host"]["ENGINE"]))
+    parser.add_argument("--host", default=settings["host"]["HOST"],
+                        help="the TCP host (default: {})".format(settings["host"]["HOST"]))
+    parser.add_argument("--port", type=int, default=settings["host"]["PORT"],
+                        help="the TCP port (default: {})".format(settings["host"]["PORT"]))
+    parser.add_argument("--unix-socket", default=settings["host"]["UNIX_SOCKET"],
+                        help="the Unix socket path, used instead of TCP if given")
+    parser.add_argument("--workers", type=int, default=settings["host"]["WORKERS"],
+                        help="the number of worker processes (default: {})".format(settings["host"]["WORKERS"]))
+    parser.add_argument("--metrics-interval", type=float, default=0,
+                        help="the seconds between the metrics printed (default: 0, never)")
+
+    return parser.parse_args()
+
+async def print_metrics(host, interval):
+    while True:
+        await asyncio.sleep(interval)
+        print(json.dumps(host.get_metrics()), flush=True)
+
+async def serve(arguments):
+    host = GameHost(arguments.engine,
+                    arguments.workers,
+                    settings["host"]["MAX_SESSIONS"],
+                    settings["host"]["MAX_QUEUED_AI_MOVES"],
+                    settings["host"]["AI_MOVE_TIMEOUT_MS"] / 1000,
+                    settings["host"]["MAX_AI_MOVE_TIMEOUT_MS"] / 1000,
+                    settings["host"]["MAX_PENDING_REQUESTS"],
+                    settings["host"]["LATENCY_SAMPLES"])
+
+    await host.start()
+    address = await host.listen(arguments.host, arguments.port, arguments.unix_socket)
+    print("Listening on {}".format(address), flush=True)
+
+    if arguments.metrics_interval:
+        metrics_printer = asyncio.create_task(print_metrics(host, arguments.metrics_interval))
+
+    try:
+        await host.serve_forever()
+    finally:
+        await host.close()
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(serve(parse_arguments()))
+    except KeyboardInterrupt:
+        pass
@@ -1,11 +1,26 @@
 import unittest
 
 from test.board_test import BoardTest
+from test.bitboard_test import BitBoardTest
+from test.vector_board_test import VectorBoardTest
 from test.game_test import GameTest
 from test.game_state_analyzer_test import GameStateAnalyzerTest
 from test.random_ai_test import RandomAITest
 from test.minimax_ai_test import MiniMaxAITest
+from test.transposition_table_test import ZobristHasherTest, TranspositionTableTest
+from test.shared_transposition_table_test import SharedTranspositionTableTest
+from test.opening_book_test import OpeningBookTest
+from test.game_record_test import GameRecordTest
+from test.analysis_server_test import AnalysisServerTest
+from test.game_host_test import GameHostTest
+from test.solver_ai_test import SolverAITest
+from test.mcts_ai_test import MCTSAITest
+from test.incremental_evaluator_test import IncrementalEvaluatorTest
+from test.batch_evaluator_test import BatchEvaluatorTest
+from test.move_ordering_test import MoveOrdererTest
 from test.master_controller_test import MasterControllerTest
+from test.ai_worker_test import AIWorkerTest
+from test.tournament_test import TournamentTest
 
 if __name__ == "__main__":
     unittest.main()
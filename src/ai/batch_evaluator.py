@@ -0,0 +1,55 @@
+import numpy as np
+
+from src.ai.incremental_evaluator import IncrementalEvaluator
+from src.service.game_state_analyzer import GameStateAnalyzer
+
+class BatchEvaluator:
+    """
+    Heuristic score of a stack of boards, computed with NumPy in one call.
+
+    Gives the same scores as IncrementalEvaluator: every window of every
+    board is gathered at once, its player / opponent / empty counts are
+    used to look up the window scores, which are summed per board.
+    """
+
+    @staticmethod
+    def score_boards(boards, player, opponent, winning_sequence_length, center_multiplier, sequence_scores):
+        """
+        Returns the scores of a stack of boards for a player
+
+        :param boards: the boards to be scored
+        :tparam boards: array of shape (N, height, width)
+
+        :param player: the player the scores are given for
+        :tparam player: player id value
+
+        :param opponent: the opponent of the player
+        :tparam opponent: player id value
+
+        :param winning_sequence_length: the length of the windows
+        :tparam winning_sequence_length: positive integer
+
+        :param center_multiplier: the score of a player piece in the center column
+        :tparam center_multiplier: number
+
+        :param sequence_scores: the EVALUATE_SEQUENCE_SCORES weights
+        :tparam sequence_scores: list of numbers
+
+        :returns: array of N scores
+        """
+        boards = np.asarray(boards)
+        number_of_boards, height, width = boards.shape
+
+        window_indices = GameStateAnalyzer.get_window_indices(width, height, winning_sequence_length)
+        window_scores = np.asarray(IncrementalEvaluator.get_window_scores(winning_sequence_length, sequence_scores))
+
+        windows = boards.reshape(number_of_boards, height * width)[:, window_indices]
+
+        player_counts = (windows == player).sum(axis=2)
+        opponent_counts = (windows == opponent).sum(axis=2)
+        empty_counts = (windows == 0).sum(axis=2)
+
+        scores = window_scores[player_counts, opponent_counts, empty_counts].sum(axis=1)
+        scores += (boards[:, :, width // 2] == player).sum(axis=1) * center_multiplier
+
+        return scores
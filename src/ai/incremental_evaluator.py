@@ -0,0 +1,178 @@
+from functools import lru_cache
+
+import numpy as np
+
+from src.service.game_state_analyzer import GameStateAnalyzer
+
+class IncrementalEvaluator:
+    """
+    Heuristic score of a board for a player, kept up to date on every
+    piece drop / removal instead of being recomputed at every leaf.
+
+    Every window (possible winning sequence) keeps the number of pieces of
+    the player, of the opponent and of empty cells. A drop / removal only
+    updates the windows passing through the changed cell, adjusting the
+    running total by the difference of their scores.
+
+    Window scores (EVALUATE_SEQUENCE_SCORES):
+        - [1] for (length - 1) player pieces and an empty cell
+        - [2] for (length - 2) player pieces and two empty cells
+        - [3] for (length - 1) opponent pieces and an empty cell
+    Every player piece in the center column adds CENTER_ARRAY_SCORE_MULTIPLIER.
+    """
+
+    def __init__(self, board, player, opponent, winning_sequence_length, center_multiplier, sequence_scores):
+        """
+        Initializes the IncrementalEvaluator instance, scoring the given board once.
+
+        :param board: the board whose changes are reported to the evaluator
+        :tparam board: Board
+
+        :param player: the player the score is given for
+        :tparam player: player id value
+
+        :param opponent: the opponent of the player
+        :tparam opponent: player id value
+
+        :param winning_sequence_length: the length of the windows
+        :tparam winning_sequence_length: positive integer
+
+        :param center_multiplier: the score of a player piece in the center column
+        :tparam center_multiplier: number
+
+        :param sequence_scores: the EVALUATE_SEQUENCE_SCORES weights
+        :tparam sequence_scores: list of numbers
+        """
+        self.__player = player
+        self.__opponent = opponent
+        self.__width = board.width
+        self.__center_column_index = board.width // 2
+        self.__center_multiplier = center_multiplier
+
+        self.__cell_windows = IncrementalEvaluator.get_cell_windows(
+                board.width, board.height, winning_sequence_length)
+        self.__window_scores = IncrementalEvaluator.get_window_scores(winning_sequence_length, sequence_scores)
+
+        window_count = len(GameStateAnalyzer.get_window_indices(board.width, board.height, winning_sequence_length))
+
+        self.__player_counts = [0] * window_count
+        self.__opponent_counts = [0] * window_count
+        self.__empty_counts = [winning_sequence_length] * window_count
+
+        self.__score = 0
+        self.__changes = []
+
+        cells = np.asarray(board[:])
+
+        """ Only the occupied cells are visited, the windows around them are updated """
+        for row_index, column_index in np.argwhere(cells != 0):
+            self.__update(int(row_index), int(column_index), int(cells[row_index, column_index]), 1)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get_cell_windows(width, height, sequence_length):
+        """
+        Returns the indexes of the windows passing through every cell
+        (windows as numbered by GameStateAnalyzer.get_window_indices)
+
+        Computed once per board shape and cached.
+
+        :returns: tuple of tuples, indexed by the flat row-major cell index
+        """
+        cell_windows = [[] for _ in range(width * height)]
+
+        for window_index, window in enumerate(GameStateAnalyzer.get_window_indices(width, height, sequence_length)):
+            for cell_index in window:
+                cell_windows[cell_index].append(window_index)
+
+        return tuple(tuple(windows) for windows in cell_windows)
+
+    @staticmethod
+    def get_window_scores(sequence_length, sequence_scores):
+        """
+        Returns the window score table, indexed by [player count][opponent count][empty count]
+
+        Computed once per sequence length and weights, and cached.
+
+        :rtype: nested lists of numbers
+        """
+        return IncrementalEvaluator.__get_window_score_table(sequence_length, tuple(sequence_scores))
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def __get_window_score_table(sequence_length, sequence_scores):
+        """ Builds the window score table (see get_window_scores) """
+        window_scores = [[[0] * (sequence_length + 1) for _ in range(sequence_length + 1)]
+                         for _ in range(sequence_length + 1)]
+
+        for player_count in range(sequence_length + 1):
+            for opponent_count in range(sequence_length + 1):
+                for empty_count in range(sequence_length + 1):
+                    if player_count == sequence_length - 1 and empty_count == 1:
+                        score = sequence_scores[1]
+                    elif player_count == sequence_length - 2 and empty_count == 2:
+                        score = sequence_scores[2]
+                    elif opponent_count == sequence_length - 1 and empty_count == 1:
+                        score = sequence_scores[3]
+                    else:
+                        score = 0
+
+                    window_scores[player_count][opponent_count][empty_count] = score
+
+        return window_scores
+
+    def __update(self, row_index, column_index, piece, change):
+        """ Adds (change = 1) / removes (change = -1) a piece, updating the windows through its cell """
+        player_change = change if piece == self.__player else 0
+        opponent_change = change if piece == self.__opponent else 0
+
+        player_counts, opponent_counts, empty_counts = \
+                self.__player_counts, self.__opponent_counts, self.__empty_counts
+        window_scores = self.__window_scores
+        score = self.__score
+
+        for window_index in self.__cell_windows[row_index * self.__width + column_index]:
+            player_count = player_counts[window_index]
+            opponent_count = opponent_counts[window_index]
+            empty_count = empty_counts[window_index]
+
+            score -= window_scores[player_count][opponent_count][empty_count]
+
+            player_count += player_change
+            opponent_count += opponent_change
+            empty_count -= change
+
+            score += window_scores[player_count][opponent_count][empty_count]
+
+            player_counts[window_index] = player_count
+            opponent_counts[window_index] = opponent_count
+            empty_counts[window_index] = empty_count
+
+        if column_index == self.__center_column_index and piece == self.__player:
+            score += change * self.__center_multiplier
+
+        self.__score = score
+
+    def drop_piece(self, row_index, column_index, piece):
+        """
+        Reports a piece added to the board
+
+        :param row_index: the row of the added piece
+        :tparam row_index: nonnegative integer
+
+        :param column_index: the column of the added piece
+        :tparam column_index: nonnegative integer
+
+        :param piece: the player the piece belongs to
+        :tparam piece: player id value
+        """
+        self.__update(row_index, column_index, piece, 1)
+        self.__changes.append((row_index, column_index, piece))
+
+    def pop_piece(self):
+        """ Reports the removal of the last piece reported through drop_piece """
+        self.__update(*self.__changes.pop(), -1)
+
+    def get_score(self):
+        """ Returns the score of the current board """
+        return self.__score
@@ -0,0 +1,153 @@
+import atexit
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from src.ai.root_parallel_search import get_search_settings, apply_search_settings
+from src.ai.search_context import SearchTimeoutException, SharedStopFlag
+from src.ai.shared_transposition_table import SharedTranspositionTable
+from config import settings
+
+""" The flag telling the helper searches of the worker process to stop """
+worker_stop_flag = None
+
+def initialize_worker(engine, table_name, table_size, stop_flag):
+    """
+    Initializes a helper process of the LazySMPSearch pool
+    (attaches the engine of the process to the shared transposition table)
+
+    :param engine: the AI engine of the helper searches
+    :tparam engine: MiniMaxAI
+
+    :param table_name: the name of the shared transposition table memory block
+    :tparam table_name: string
+
+    :param table_size: the number of slots of the shared transposition table
+    :tparam table_size: positive integer
+
+    :param stop_flag: the flag stopping the helper searches (lock-free, it is checked at every node)
+    :tparam stop_flag: SharedStopFlag
+    """
+    global worker_stop_flag
+    worker_stop_flag = stop_flag
+
+    engine.set_transposition_table(SharedTranspositionTable(table_size, table_name))
+
+def search_helper(engine, board, player, depth, root_first_move, deadline, search_settings):
+    """
+    Searches a position in a helper process until done or stopped
+    (only the entries it adds to the shared transposition table are used)
+
+    :param search_settings: the settings of the calling process (see get_search_settings),
+                            so the helper stores the scores the main search would compute
+    :tparam search_settings: dict
+    """
+    apply_search_settings(search_settings)
+
+    try:
+        engine.search_position(board, player, depth, deadline, root_first_move, worker_stop_flag)
+    except SearchTimeoutException:
+        pass
+
+class LazySMPSearch:
+    """
+    Lazy SMP parallel search.
+
+    The main search runs in the calling process while helper processes search
+    the same position. All of them read and write one SharedTranspositionTable
+    without locks, so the helpers fill the table with results the main search
+    picks up instead of searching them again. The helpers use different depths
+    and first root moves, so they do not all search the same nodes.
+
+    The result is the one of the main search. It is not deterministic, since it
+    depends on what the helpers stored before the main search needed it.
+    """
+
+    """ The PARALLEL_MODE selecting this search """
+    MODE = "LAZY_SMP"
+
+    """ The helper pool and its shared state, created on first use and kept between moves """
+    __executor = None
+    __workers = None
+    __transposition_table = None
+    __stop_flag = None
+
+    @staticmethod
+    def search(engine, board, player, depth, workers, deadline, main_search):
+        """
+        Runs the main search while (workers - 1) helper processes search the same position
+
+        :param engine: the AI engine of the helper searches
+        :tparam engine: MiniMaxAI
+
+        :param board: the board to be searched
+        :tparam board: Board
+
+        :param player: the player represented by the AI
+        :tparam player: player id value
+
+        :param depth: the depth of the main search
+        :tparam depth: positive integer
+
+        :param workers: the number of searching processes, counting this one
+        :tparam workers: positive integer
+
+        :param deadline: the perf_counter time when the search has to stop / None
+        :tparam deadline: float / None
+
+        :param main_search: runs the main search in this process
+        :tparam main_search: callable returning the (column, score) tuple
+
+        :returns: the result of main_search
+        """
+        executor = LazySMPSearch.__get_executor(engine, workers)
+        LazySMPSearch.__stop_flag.clear()
+
+        valid_moves = board.get_valid_moves()
+        search_settings = get_search_settings()
+        futures = [executor.submit(search_helper, engine, board, player, depth + helper_index % 2,
+                                   valid_moves[helper_index % len(valid_moves)], deadline, search_settings)
+                   for helper_index in range(workers - 1)]
+
+        """ The main search uses the shared table, the engine gets its default table back afterwards """
+        engine.set_transposition_table(LazySMPSearch.__transposition_table)
+
+        try:
+            return main_search()
+        finally:
+            LazySMPSearch.__stop_flag.set()
+            wait(futures)
+
+            engine.set_transposition_table(None)
+
+    @staticmethod
+    def shutdown():
+        """ Stops the helper processes and frees the shared transposition table """
+        if LazySMPSearch.__executor is None:
+            return
+
+        LazySMPSearch.__stop_flag.set()
+        LazySMPSearch.__executor.shutdown()
+        LazySMPSearch.__executor = None
+
+        LazySMPSearch.__transposition_table.close()
+        LazySMPSearch.__transposition_table = None
+
+    @staticmethod
+    def __get_executor(engine, workers):
+        """ Returns the helper pool, (re)creating it for the given number of workers """
+        table_size = settings["ai"]["minimax"]["SHARED_TRANSPOSITION_TABLE_SIZE"]
+
+        if LazySMPSearch.__executor is None or LazySMPSearch.__workers != workers \
+                or LazySMPSearch.__transposition_table.size != table_size:
+            LazySMPSearch.shutdown()
+
+            LazySMPSearch.__transposition_table = SharedTranspositionTable(table_size)
+            LazySMPSearch.__stop_flag = SharedStopFlag()
+            LazySMPSearch.__executor = ProcessPoolExecutor(
+                    workers - 1, initializer=initialize_worker,
+                    initargs=(engine, LazySMPSearch.__transposition_table.name,
+                              table_size, LazySMPSearch.__stop_flag))
+            LazySMPSearch.__workers = workers
+
+        return LazySMPSearch.__executor
+
+atexit.register(LazySMPSearch.shutdown)
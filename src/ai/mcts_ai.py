@@ -0,0 +1,419 @@
+from math import log, sqrt
+from random import choice, randrange
+from time import perf_counter
+
+from config import settings
+
+class MCTSPosition:
+    """
+    Lightweight board of the Monte Carlo tree search (a bitboard for every player)
+
+    Bit (column * (height + 1) + row) is set if the player has a piece there,
+    rows counted from the bottom. The extra bit on top of every column stays
+    empty, so that the lines of pieces do not wrap from a column to the next one.
+    """
+
+    def __init__(self, width, height, winning_sequence_length, number_of_players):
+        """
+        Initializes an empty MCTSPosition.
+
+        :param width: the number of columns
+        :tparam width: positive integer
+
+        :param height: the number of rows
+        :tparam height: positive integer
+
+        :param winning_sequence_length: the number of pieces in a row that win the game
+        :tparam winning_sequence_length: positive integer
+
+        :param number_of_players: the number of players
+        :tparam number_of_players: positive integer
+        """
+        self.width = width
+        self.height = height
+        self.winning_sequence_length = winning_sequence_length
+        self.number_of_players = number_of_players
+
+        """ The pieces of every player, indexed by player id (index 0 is unused) """
+        self.player_masks = [0] * (number_of_players + 1)
+        self.column_heights = [0] * width
+        self.moves = 0
+
+        self.__run_shifts = MCTSPosition.__get_run_shifts(height, winning_sequence_length)
+
+    @staticmethod
+    def __get_run_shifts(height, winning_sequence_length):
+        """
+        Returns, for every line direction, the shifts turning a player mask into
+        the mask of the winning runs starting at each bit
+
+        Runs of length 2L are found from the runs of length L (one shift per
+        doubling), the last shift combines two overlapping runs.
+        """
+        run_shifts = []
+
+        """ Vertical, horizontal, diagonal (/), diagonal (\\) """
+        for direction in (1, height + 1, height + 2, height):
+            shifts = []
+            run_length = 1
+
+            while run_length * 2 <= winning_sequence_length:
+                shifts.append(run_length * direction)
+                run_length *= 2
+
+            if run_length < winning_sequence_length:
+                shifts.append((winning_sequence_length - run_length) * direction)
+
+            run_shifts.append(shifts)
+
+        return run_shifts
+
+    @staticmethod
+    def from_board(board, number_of_players, winning_sequence_length):
+        """ Returns the MCTSPosition of a Board """
+        position = MCTSPosition(board.width, board.height, winning_sequence_length, number_of_players)
+        cells = board.get_view()
+
+        for column_index in range(board.width):
+            column_height = board.get_column_height(column_index)
+
+            for height_index in range(column_height):
+                player = int(cells[board.height - 1 - height_index, column_index])
+                position.player_masks[player] |= 1 << (column_index * (board.height + 1) + height_index)
+
+            position.column_heights[column_index] = column_height
+            position.moves += column_height
+
+        return position
+
+    def copy(self):
+        """ Returns a copy of the position """
+        position = MCTSPosition.__new__(MCTSPosition)
+        position.__dict__.update(self.__dict__)
+
+        position.player_masks = self.player_masks[:]
+        position.column_heights = self.column_heights[:]
+
+        return position
+
+    def get_valid_moves(self):
+        """ Returns the columns that are not full """
+        return [column_index for column_index, column_height in enumerate(self.column_heights)
+                if column_height < self.height]
+
+    def play(self, column_index, player):
+        """ Drops a piece of a player into a column (that is not full) """
+        self.player_masks[player] |= 1 << (column_index * (self.height + 1) + self.column_heights[column_index])
+        self.column_heights[column_index] += 1
+        self.moves += 1
+
+    def undo(self, column_index, player):
+        """ Removes the top piece of a column, dropped by a player """
+        self.column_heights[column_index] -= 1
+        self.player_masks[player] ^= 1 << (column_index * (self.height + 1) + self.column_heights[column_index])
+        self.moves -= 1
+
+    def is_winning(self, player):
+        """ Checks if a player has WINNING_SEQUENCE_LENGTH pieces in a row """
+        mask = self.player_masks[player]
+
+        for shifts in self.__run_shifts:
+            run_mask = mask
+
+            for shift in shifts:
+                run_mask &= run_mask >> shift
+
+            if run_mask:
+                return True
+
+        return False
+
+    def is_full(self):
+        """ Checks if every cell is occupied """
+        return self.moves == self.width * self.height
+
+    def get_next_player(self, player):
+        """ Returns the player moving after a given one """
+        return player % self.number_of_players + 1
+
+class MCTSNode:
+    """ A node of the Monte Carlo search tree (the position after a move) """
+
+    __slots__ = ("move", "player", "parent", "children", "untried_moves", "result", "visits", "reward")
+
+    """ The result of a node that is not the end of the game """
+    UNFINISHED = None
+    """ The result of a node ending the game with a draw (otherwise the result is the winner) """
+    DRAW = 0
+
+    def __init__(self, move, player, parent, untried_moves, result=None):
+        """
+        Initializes the MCTSNode instance.
+
+        :param move: the column of the move leading to the node / None for a root
+        :param player: the player that made the move
+        :param parent: the parent node / None for a root
+        :param untried_moves: the moves without a child node yet
+        :param result: UNFINISHED / DRAW / the winner
+        """
+        self.move = move
+        self.player = player
+        self.parent = parent
+        self.children = []
+        self.untried_moves = untried_moves
+        self.result = result
+
+        self.visits = 0
+        """ The sum of the playout rewards of the player that made the move """
+        self.reward = 0
+
+class MCTSAI:
+    """
+    Implements AI decision making using Monte Carlo tree search with the
+    UCT selection rule.
+
+    Every iteration descends the tree choosing the child maximizing
+    reward / visits + EXPLORATION * sqrt(ln(parent visits) / visits) for the
+    player to move, adds a child, plays random moves to the end of the game
+    (a playout) and credits the result to the players on the path: 1 for the
+    winner, 1 / NUMBER_OF_PLAYERS for every player on a draw. With
+    GUIDED_PLAYOUTS the playouts take a winning move whenever there is one.
+
+    The search stops after PLAYOUTS playouts, or after MOVE_TIME_MS if it is
+    set. The subtree of the position reached is kept and reused by the next
+    move if the game continued from it.
+
+    Supports any NUMBER_OF_PLAYERS and WINNING_SEQUENCE_LENGTH.
+    """
+
+    """ The root of the kept search tree, its position and the board move history leading to it """
+    __root = None
+    __root_position = None
+    __root_history = None
+    """ The counters of the last search """
+    __last_search_statistics = None
+
+    @staticmethod
+    def get_move(board, player, stop_event=None):
+        """
+        Returns the move of the AI using Monte Carlo tree search
+
+        :param board: the Board to be used
+        :tparam board: Board
+
+        :param player: the player represented by the AI (the player to move)
+        :tparam player: player id value
+
+        :param stop_event: event that stops the search when set (the best move so far is returned) / None
+        :tparam stop_event: threading.Event / None
+
+        :return: chosen move column / None if no move is possible
+        :rtype: nonnegative integer / None
+        """
+        position = MCTSPosition.from_board(board, settings["game"]["NUMBER_OF_PLAYERS"],
+                                           settings["game"]["WINNING_SEQUENCE_LENGTH"])
+        valid_moves = position.get_valid_moves()
+
+        if len(valid_moves) <= 1:
+            return valid_moves[0] if valid_moves else None
+
+        for column_index in valid_moves:
+            position.play(column_index, player)
+            is_winning = position.is_winning(player)
+            position.undo(column_index, player)
+
+            if is_winning:
+                return column_index
+
+        history = board.get_move_history()
+        root = MCTSAI.__get_kept_subtree(position, player, history)
+        reused_playouts = 0 if root is None else root.visits
+
+        if root is None:
+            previous_player = (player - 2) % position.number_of_players + 1
+            root = MCTSNode(None, previous_player, None, valid_moves)
+
+        playouts, elapsed_time = MCTSAI.__search(root, position, stop_event)
+
+        MCTSAI.__last_search_statistics = {
+            "playouts": playouts,
+            "reused_playouts": reused_playouts,
+            "elapsed_time": elapsed_time,
+            "playouts_per_second": playouts / elapsed_time if elapsed_time else 0,
+        }
+
+        if not root.children:
+            return choice(valid_moves)
+
+        best_child = max(root.children, key=lambda child: child.visits)
+
+        """ The tree below the chosen move is kept for the next move """
+        best_child.parent = None
+        position.play(best_child.move, player)
+
+        MCTSAI.__root = best_child
+        MCTSAI.__root_position = position
+        MCTSAI.__root_history = history + (best_child.move,)
+
+        return best_child.move
+
+    @staticmethod
+    def get_search_statistics():
+        """
+        Returns the counters of the last get_move search / None if no search was run
+
+        :returns: dict with the playouts, the playouts of the reused subtree
+                  (reused_playouts), the elapsed_time (seconds) and the playouts_per_second
+        """
+        return MCTSAI.__last_search_statistics
+
+    @staticmethod
+    def clear_tree():
+        """ Drops the kept search tree """
+        MCTSAI.__root = None
+        MCTSAI.__root_position = None
+        MCTSAI.__root_history = None
+
+    @staticmethod
+    def __get_kept_subtree(position, player, history):
+        """
+        Returns the node of the kept tree matching a position / None
+        (if the game did not continue from the kept root)
+        """
+        root, root_history = MCTSAI.__root, MCTSAI.__root_history
+
+        if root is None or history[:len(root_history)] != root_history:
+            return None
+
+        node = root
+        node_position = MCTSAI.__root_position.copy()
+
+        for column_index in history[len(root_history):]:
+            node = next((child for child in node.children if child.move == column_index), None)
+
+            if node is None:
+                return None
+
+            node_position.play(column_index, node.player)
+
+        if node_position.player_masks != position.player_masks or \
+                position.get_next_player(node.player) != player:
+            return None
+
+        node.parent = None
+
+        return node
+
+    @staticmethod
+    def __search(root, position, stop_event):
+        """
+        Runs the Monte Carlo tree search iterations from a root node
+
+        :returns: tuple (the number of playouts, the elapsed seconds)
+        """
+        playout_limit = settings["ai"]["mcts"]["PLAYOUTS"]
+        move_time = settings["ai"]["mcts"]["MOVE_TIME_MS"]
+        exploration = settings["ai"]["mcts"]["EXPLORATION"]
+        is_guided = settings["ai"]["mcts"]["GUIDED_PLAYOUTS"]
+        draw_reward = 1 / position.number_of_players
+
+        start_time = perf_counter()
+        deadline = start_time + move_time / 1000 if move_time else None
+        playouts = 0
+
+        while deadline is not None or playouts < playout_limit:
+            if deadline is not None and perf_counter() >= deadline:
+                break
+            if stop_event is not None and stop_event.is_set():
+                break
+
+            node = root
+            playout_position = position.copy()
+
+            """ Selection """
+            while not node.untried_moves and node.children:
+                log_visits = log(node.visits)
+                best_value = -1
+
+                for child in node.children:
+                    value = child.reward / child.visits + exploration * sqrt(log_visits / child.visits)
+
+                    if value > best_value:
+                        best_value, best_child = value, child
+
+                node = best_child
+                playout_position.play(node.move, node.player)
+
+            """ Expansion """
+            if node.untried_moves:
+                column_index = node.untried_moves.pop(randrange(len(node.untried_moves)))
+                player = playout_position.get_next_player(node.player)
+                playout_position.play(column_index, player)
+
+                if playout_position.is_winning(player):
+                    child = MCTSNode(column_index, player, node, [], player)
+                elif playout_position.is_full():
+                    child = MCTSNode(column_index, player, node, [], MCTSNode.DRAW)
+                else:
+                    child = MCTSNode(column_index, player, node, playout_position.get_valid_moves())
+
+                node.children.append(child)
+                node = child
+
+            """ Simulation """
+            if node.result is MCTSNode.UNFINISHED:
+                result = MCTSAI.__playout(playout_position, playout_position.get_next_player(node.player),
+                                          is_guided)
+            else:
+                result = node.result
+
+            """ Backpropagation """
+            while node is not None:
+                node.visits += 1
+
+                if result == node.player:
+                    node.reward += 1
+                elif result == MCTSNode.DRAW:
+                    node.reward += draw_reward
+
+                node = node.parent
+
+            playouts += 1
+
+        return playouts, perf_counter() - start_time
+
+    @staticmethod
+    def __playout(position, player, is_guided):
+        """
+        Plays random moves until the game ends (changes the position)
+
+        :param player: the player to move
+        :param is_guided: True to play a winning move whenever there is one
+
+        :returns: the winner / MCTSNode.DRAW
+        """
+        valid_moves = position.get_valid_moves()
+        height = position.height
+
+        while valid_moves:
+            if is_guided:
+                for column_index in valid_moves:
+                    position.play(column_index, player)
+
+                    if position.is_winning(player):
+                        return player
+
+                    position.undo(column_index, player)
+
+            column_index = choice(valid_moves)
+            position.play(column_index, player)
+
+            if position.is_winning(player):
+                return player
+
+            if position.column_heights[column_index] == height:
+                valid_moves.remove(column_index)
+
+            player = position.get_next_player(player)
+
+        return MCTSNode.DRAW
@@ -1,8 +1,20 @@
 from copy import deepcopy
 from math import inf
 from random import choice
+from time import perf_counter
+
+import numpy as np
 
 from src.service.game_state_analyzer import GameStateAnalyzer
+from src.ai.search_context import SearchContext, SearchTimeoutException
+from src.ai.search_statistics import SearchStatistics
+from src.ai.transposition_table import TranspositionTable, ZobristHasher
+from src.ai.move_ordering import MoveOrderer
+from src.ai.incremental_evaluator import IncrementalEvaluator
+from src.ai.batch_evaluator import BatchEvaluator
+from src.ai.root_parallel_search import RootParallelSearch
+from src.ai.lazy_smp_search import LazySMPSearch
+from src.ai.opening_book import OpeningBook
 from config import settings
 
 class MiniMaxAI:
@@ -10,8 +22,8 @@ class MiniMaxAI:
     Implements AI decision making using the minimax algorithm paired with the
     alpha beta pruning search technique
 
-    Currently supports only WINNING_SEQUENCE_LENGTH=4 and one opponent
-    (use with 2 players)
+    Supports any WINNING_SEQUENCE_LENGTH (the evaluated windows have the
+    configured length) and one opponent (use with 2 players)
     """
 
     """ The score given assigned to an AI move when it wins the game """
@@ -24,23 +36,544 @@ class MiniMaxAI:
     """ The index of the score in the minimax return tuple """
     SCORE_INDEX = 1
 
+    """ Cache of searched positions, kept between moves """
+    __transposition_table = None
+    """ Cache installed through set_transposition_table (replaces the default one) """
+    __installed_transposition_table = None
+    """ Zobrist key generators, by board shape """
+    __zobrist_hashers = {}
+    """ The move ordering stage of the last search """
+    __last_move_orderer = None
+    """ The counters of the last search (COLLECT_STATISTICS) """
+    __last_search_statistics = None
+    """ The (depth, column, score) results of the last ponder, by position (see ponder) """
+    __pondered_moves = {}
+    """ The opened opening books, by file name """
+    __opening_books = {}
+
     @staticmethod
-    def get_move(board, player):
+    def get_move(board, player, stop_event=None):
         """ 
         Returns the move of the AI using the alpha-beta pruning minimax algorithm
 
+        Plays the OPENING_BOOK move if the position is in the book. Otherwise
+        searches to a fixed DEPTH, or deepens one ply at a time while the
+        MOVE_TIME_MS budget lasts if it is set. A search of the position done
+        by ponder is not repeated (the deepening starts below its depth).
+
         :param board: the Board to be used
         :tparam board: Board
 
         :param player: the player represented by the AI
         :tparam player: player score id
 
+        :param stop_event: event that stops the search when set / None
+                           (the best move found so far is returned)
+        :tparam stop_event: threading.Event / None
+
         :return: chosen move column
         :rtype: nonnegative integer
+
+        :raises: SearchTimeoutException if a fixed DEPTH search was stopped
+                 before any root move was searched
+        """
+        statistics = SearchStatistics() if settings["ai"]["minimax"]["COLLECT_STATISTICS"] else None
+        MiniMaxAI.__last_search_statistics = statistics
+
+        if statistics is None:
+            return MiniMaxAI.__get_move(board, player, stop_event, None)
+
+        statistics.start()
+
+        try:
+            return MiniMaxAI.__get_move(board, player, stop_event, statistics)
+        finally:
+            statistics.stop()
+
+    @staticmethod
+    def __get_move(board, player, stop_event, statistics):
+        """ Returns the move of the AI, collecting the search counters into statistics if not None """
+        book_column_index = MiniMaxAI.__get_book_move(board, player)
+        if book_column_index is not None:
+            return book_column_index
+
+        """ The search drops and removes pieces in place, so it works on a private copy """
+        board = deepcopy(board)
+
+        winning_column_index = MiniMaxAI.__get_winning_move(board, player)
+        if winning_column_index is not None:
+            return winning_column_index
+
+        move_orderer = MoveOrderer(board.width, settings["ai"]["minimax"]["MOVE_ORDERING"])
+        MiniMaxAI.__last_move_orderer = move_orderer
+
+        pondered_move = MiniMaxAI.__pondered_moves.get(MiniMaxAI.__get_position_key(board, player))
+
+        move_time = settings["ai"]["minimax"]["MOVE_TIME_MS"]
+        if move_time:
+            return MiniMaxAI.__iterative_deepening_search(
+                    board, player, move_orderer, move_time, stop_event, statistics, pondered_move
+            )[MiniMaxAI.COLUMN_INDEX]
+
+        root_first_move = None
+
+        if pondered_move is not None:
+            if pondered_move[0] >= settings["ai"]["minimax"]["DEPTH"]:
+                return pondered_move[1]
+
+            root_first_move = pondered_move[1]
+
+        try:
+            return MiniMaxAI.__search(
+                    board, player, settings["ai"]["minimax"]["DEPTH"], move_orderer,
+                    root_first_move=root_first_move, stop_event=stop_event, statistics=statistics
+            )[MiniMaxAI.COLUMN_INDEX]
+        except SearchTimeoutException as exception:
+            if exception.best_move is None:
+                raise
+
+            return exception.best_move
+
+    @staticmethod
+    def analyze(board, player, depth=None, move_time=None):
+        """
+        Searches a position, returning the best move with its score and the
+        principal variation (the line both players are expected to play)
+        (used by the analysis server)
+
+        :param board: the Board to be used (left unchanged)
+        :tparam board: Board
+
+        :param player: the player to move
+        :tparam player: player score id
+
+        :param depth: the depth of the search / None for the configured DEPTH
+        :tparam depth: positive integer / None
+
+        :param move_time: if set, the time budget in milliseconds of an iterative
+                          deepening search (depth is ignored, at least depth 1 is
+                          searched even if the budget runs out before) / None
+        :tparam move_time: positive number / None
+
+        :returns: tuple (column, score, principal variation: list of columns
+                  starting with the move, searched depth)
+        """
+        board = deepcopy(board)
+        move_orderer = MoveOrderer(board.width, settings["ai"]["minimax"]["MOVE_ORDERING"])
+
+        if move_time:
+            column_index, score, depth = MiniMaxAI.__iterative_deepening_search(
+                    board, player, move_orderer, move_time)
+
+            """ The budget ran out before depth 1, its search is cheap and gives a scored move with a PV """
+            if not depth:
+                depth = 1
+                column_index, score = MiniMaxAI.__search(board, player, depth, move_orderer)
+        else:
+            depth = depth or settings["ai"]["minimax"]["DEPTH"]
+            column_index, score = MiniMaxAI.__search(board, player, depth, move_orderer)
+
+        return column_index, score, MiniMaxAI.__get_principal_variation(board, player, column_index, depth), depth
+
+    @staticmethod
+    def __get_principal_variation(board, player, column_index, length):
+        """
+        Returns the move of a searched position followed by the best replies
+        stored in the transposition table (at most length moves, ending with the game)
+        """
+        opponent = MiniMaxAI.__get_opponent(player)
+        context = SearchContext(board, player, opponent, length,
+                                MiniMaxAI.__get_transposition_table(),
+                                MiniMaxAI.__get_zobrist_hasher(board), None,
+                                MiniMaxAI.__get_evaluator(board, player))
+
+        principal_variation = []
+        maximizing_player = True
+
+        while column_index is not None and len(principal_variation) < length and board.is_valid_move(column_index):
+            context.drop_piece(column_index, player if maximizing_player else opponent)
+            principal_variation.append(column_index)
+
+            if GameStateAnalyzer.is_winning_move(board, *context.get_last_move()) or not board.get_valid_moves():
+                break
+
+            maximizing_player = not maximizing_player
+            entry = context.transposition_table.probe(context.get_position_key(maximizing_player))
+            column_index = entry[TranspositionTable.MOVE_INDEX] if entry is not None else None
+
+        for _ in principal_variation:
+            context.pop_piece()
+
+        return principal_variation
+
+    @staticmethod
+    def ponder(board, player, stop_event):
+        """
+        Searches the positions after the replies of the opponent until stopped
+        (or, with a fixed DEPTH, until they are all searched to DEPTH), so that
+        the get_move following the actual reply can reuse the search: the best
+        moves found are remembered and the searched positions stay in the
+        transposition table.
+
+        The replies are deepened one ply at a time, the most likely ones (the
+        best for the opponent in the previous iteration) first. After the first
+        iteration, only the PONDER_REPLIES most likely ones are kept (0 keeps all).
+
+        :param board: the Board to be used, with the opponent to move (left unchanged)
+        :tparam board: Board
+
+        :param player: the player represented by the AI (moving after the opponent)
+        :tparam player: player score id
+
+        :param stop_event: event that stops pondering when set
+        :tparam stop_event: threading.Event
+        """
+        board = deepcopy(board)
+        opponent = MiniMaxAI.__get_opponent(player)
+        MiniMaxAI.__pondered_moves = {}
+
+        """ The replies ending the game leave nothing to search """
+        replies = []
+        for column_index in board.get_valid_moves():
+            board.drop_piece(column_index, opponent)
+            is_game_over = GameStateAnalyzer.is_winning_move(
+                    board, board.get_top_occupied_row_index(column_index), column_index, opponent) \
+                    or not board.get_valid_moves()
+            board.pop_piece()
+
+            if not is_game_over:
+                replies.append(column_index)
+
+        if settings["ai"]["minimax"]["MOVE_TIME_MS"]:
+            max_depth = board.width * board.height - int((board[:] != 0).sum()) - 1
+        else:
+            max_depth = settings["ai"]["minimax"]["DEPTH"]
+
+        reply_count = settings["ai"]["minimax"]["PONDER_REPLIES"]
+
+        try:
+            for depth in range(1, max_depth + 1):
+                scores = {}
+
+                for column_index in replies:
+                    board.drop_piece(column_index, opponent)
+
+                    try:
+                        position_key = MiniMaxAI.__get_position_key(board, player)
+                        pondered_move = MiniMaxAI.__pondered_moves.get(position_key)
+
+                        best_column_index, score = MiniMaxAI.__search_single_process(
+                                board, player, depth,
+                                MoveOrderer(board.width, settings["ai"]["minimax"]["MOVE_ORDERING"]),
+                                root_first_move=pondered_move[1] if pondered_move else None,
+                                stop_event=stop_event)
+                    finally:
+                        board.pop_piece()
+
+                    MiniMaxAI.__pondered_moves[position_key] = (depth, best_column_index, score)
+                    scores[column_index] = score
+
+                replies.sort(key=scores.get)
+
+                if reply_count:
+                    replies = replies[:reply_count]
+        except SearchTimeoutException:
+            pass
+
+    @staticmethod
+    def score_move(board, player, column_index, depth, alpha=-inf, deadline=None, stop_event=None):
+        """
+        Returns the score of a move, searched to the given depth
+        (used by the workers of the parallel search)
+
+        :param board: the Board to be used (left unchanged)
+        :tparam board: Board
+
+        :param player: the player represented by the AI
+        :tparam player: player score id
+
+        :param column_index: the move to be scored
+        :tparam column_index: nonnegative integer
+
+        :param depth: the depth of the search, counting the scored move
+        :tparam depth: positive integer
+
+        :param alpha: the score the move has to beat, a score not above it
+                      is only an upper bound
+        :tparam alpha: number
+
+        :param deadline: the perf_counter time when the search has to stop / None
+        :tparam deadline: float / None
+
+        :param stop_event: event that stops the search when set / None
+        :tparam stop_event: SharedStopFlag / None
+
+        :raises: SearchTimeoutException if the deadline has passed or the search was stopped
+        """
+        context = SearchContext(board, player, MiniMaxAI.__get_opponent(player), depth,
+                                MiniMaxAI.__get_transposition_table(),
+                                MiniMaxAI.__get_zobrist_hasher(board),
+                                MoveOrderer(board.width, settings["ai"]["minimax"]["MOVE_ORDERING"]),
+                                MiniMaxAI.__get_evaluator(board, player), deadline, stop_event=stop_event,
+                                active_column_distance=MiniMaxAI.__get_active_column_distance())
+
+        context.drop_piece(column_index, player)
+
+        try:
+            return MiniMaxAI.__minimax(context, depth - 1, alpha, inf, False)[MiniMaxAI.SCORE_INDEX]
+        finally:
+            context.pop_piece()
+
+    @staticmethod
+    def get_move_ordering_statistics():
+        """
+        Returns the node and cutoff counters of the last get_move search
+        (see MoveOrderer.get_statistics) / None if no search was run
+        """
+        if MiniMaxAI.__last_move_orderer is None:
+            return None
+
+        return MiniMaxAI.__last_move_orderer.get_statistics()
+
+    @staticmethod
+    def get_search_statistics():
+        """
+        Returns the counters of the last get_move search (nodes per ply, leaf
+        evaluations, cutoffs, evaluation / win detection time, nodes per second)
+
+        :rtype: SearchStatistics / None if COLLECT_STATISTICS was not set
         """
-        return MiniMaxAI.__minimax(
-                board, player, settings["ai"]["minimax"]["DEPTH"], -inf, inf, True
-        )[MiniMaxAI.COLUMN_INDEX]
+        return MiniMaxAI.__last_search_statistics
+
+    @staticmethod
+    def search_position(board, player, depth, deadline=None, root_first_move=None, stop_event=None):
+        """
+        Runs a single process search of the given depth
+        (used by the helper workers of the Lazy SMP search)
+
+        :param board: the Board to be searched (left unchanged)
+        :tparam board: Board
+
+        :param player: the player represented by the AI
+        :tparam player: player score id
+
+        :param depth: the depth of the search
+        :tparam depth: positive integer
+
+        :param deadline: the perf_counter time when the search has to stop / None
+        :tparam deadline: float / None
+
+        :param root_first_move: the move to be searched first at the root / None
+        :tparam root_first_move: nonnegative integer / None
+
+        :param stop_event: event that stops the search when set / None
+        :tparam stop_event: threading.Event / SharedStopFlag / None
+
+        :returns: the (column, score) tuple of the best move
+        :raises: SearchTimeoutException if the search was stopped
+        """
+        move_orderer = MoveOrderer(board.width, settings["ai"]["minimax"]["MOVE_ORDERING"])
+
+        return MiniMaxAI.__search_single_process(
+                board, player, depth, move_orderer, deadline, root_first_move, stop_event)
+
+    @staticmethod
+    def __search(board, player, depth, move_orderer, deadline=None, root_first_move=None,
+                 stop_event=None, statistics=None):
+        """
+        Runs a search of the given depth, returning the minimax (column, score) tuple
+
+        If more than one of WORKERS is configured, the search uses the PARALLEL_MODE:
+            - ROOT: the root moves are split across the worker processes
+            - LAZY_SMP: helper processes search the same position, sharing
+                        the transposition table with this one
+        """
+        workers = settings["ai"]["minimax"]["WORKERS"]
+
+        if workers > 1 and settings["ai"]["minimax"]["PARALLEL_MODE"] == LazySMPSearch.MODE:
+            return LazySMPSearch.search(
+                    MiniMaxAI, board, player, depth, workers, deadline,
+                    lambda: MiniMaxAI.__search_single_process(
+                        board, player, depth, move_orderer, deadline, root_first_move,
+                        stop_event, statistics))
+
+        if workers > 1:
+            return RootParallelSearch.search(MiniMaxAI, board, player, depth, workers, deadline,
+                                             root_first_move, stop_event)
+
+        return MiniMaxAI.__search_single_process(board, player, depth, move_orderer, deadline,
+                                                 root_first_move, stop_event, statistics)
+
+    @staticmethod
+    def __search_single_process(board, player, depth, move_orderer, deadline=None,
+                                root_first_move=None, stop_event=None, statistics=None):
+        """ Runs a search of the given depth in this process """
+        context = SearchContext(board, player, MiniMaxAI.__get_opponent(player), depth,
+                                MiniMaxAI.__get_transposition_table(),
+                                MiniMaxAI.__get_zobrist_hasher(board),
+                                move_orderer, MiniMaxAI.__get_evaluator(board, player),
+                                deadline, root_first_move, stop_event,
+                                MiniMaxAI.__get_active_column_distance(), statistics)
+
+        try:
+            return MiniMaxAI.__minimax(context, depth, -inf, inf, True)
+        except SearchTimeoutException as exception:
+            exception.best_move = context.root_best_move
+            raise
+
+    @staticmethod
+    def __iterative_deepening_search(board, player, move_orderer, move_time, stop_event=None,
+                                     statistics=None, pondered_move=None):
+        """
+        Searches with increasing depth until the time budget runs out
+
+        Every iteration searches the best move of the previous one first.
+        The result of the deepest completed iteration is returned.
+
+        :param move_time: the time budget of the move in milliseconds
+        :tparam move_time: positive number
+
+        :param pondered_move: the (depth, column, score) search result of ponder / None
+        :tparam pondered_move: tuple / None
+
+        :returns: tuple (column, score, depth) / (random valid column, None, 0)
+                  if no iteration completed
+        """
+        deadline = perf_counter() + move_time / 1000
+        empty_cells = board.width * board.height - int((board[:] != 0).sum())
+
+        best_column_index, best_score, best_depth = None, None, 0
+
+        if pondered_move is not None:
+            best_depth, best_column_index, best_score = pondered_move
+
+            if best_score in (MiniMaxAI.WINNING_SCORE, MiniMaxAI.LOSING_SCORE):
+                return best_column_index, best_score, best_depth
+
+        for depth in range(best_depth + 1, empty_cells + 1):
+            try:
+                column_index, score = MiniMaxAI.__search(
+                        board, player, depth, move_orderer, deadline, best_column_index,
+                        stop_event, statistics)
+            except SearchTimeoutException:
+                break
+
+            best_column_index, best_score, best_depth = column_index, score, depth
+
+            """ A forced win / loss was found, deeper searches can not change it """
+            if score in (MiniMaxAI.WINNING_SCORE, MiniMaxAI.LOSING_SCORE):
+                break
+
+        if best_column_index is None and board.get_valid_moves():
+            best_column_index = choice(board.get_valid_moves())
+
+        return best_column_index, best_score, best_depth
+
+    @staticmethod
+    def clear_transposition_table():
+        """ Removes all the positions cached by previous searches (and the pondered moves) """
+        MiniMaxAI.__pondered_moves = {}
+
+        if MiniMaxAI.__transposition_table is not None:
+            MiniMaxAI.__transposition_table.clear()
+
+        if MiniMaxAI.__installed_transposition_table is not None:
+            MiniMaxAI.__installed_transposition_table.clear()
+
+    @staticmethod
+    def set_transposition_table(transposition_table):
+        """
+        Makes the searches use the given transposition table
+        (e.g. a SharedTranspositionTable), None restores the default one
+
+        :param transposition_table: the table to be used / None
+        :tparam transposition_table: object with the TranspositionTable interface / None
+        """
+        MiniMaxAI.__installed_transposition_table = transposition_table
+
+    @staticmethod
+    def __get_transposition_table():
+        """
+        Returns the transposition table shared by the searches
+        (created on first use, with TRANSPOSITION_TABLE_SIZE slots)
+        """
+        if MiniMaxAI.__installed_transposition_table is not None:
+            return MiniMaxAI.__installed_transposition_table
+
+        size = settings["ai"]["minimax"]["TRANSPOSITION_TABLE_SIZE"]
+
+        if MiniMaxAI.__transposition_table is None or MiniMaxAI.__transposition_table.size != size:
+            MiniMaxAI.__transposition_table = TranspositionTable(size)
+
+        return MiniMaxAI.__transposition_table
+
+    @staticmethod
+    def __get_zobrist_hasher(board):
+        """ Returns the Zobrist key generator for the shape of a board """
+        shape = (board.width, board.height)
+
+        if shape not in MiniMaxAI.__zobrist_hashers:
+            MiniMaxAI.__zobrist_hashers[shape] = ZobristHasher(board.width, board.height)
+
+        return MiniMaxAI.__zobrist_hashers[shape]
+
+    @staticmethod
+    def __get_position_key(board, player):
+        """ Returns the key of a position in the pondered moves """
+        return board.get_view().tobytes(), player
+
+    @staticmethod
+    def __get_evaluator(board, player):
+        """ Returns the heuristic evaluation of a board, updated by the search """
+        return IncrementalEvaluator(board, player, MiniMaxAI.__get_opponent(player),
+                                    settings["game"]["WINNING_SEQUENCE_LENGTH"],
+                                    settings["ai"]["minimax"]["CENTER_ARRAY_SCORE_MULTIPLIER"],
+                                    settings["ai"]["minimax"]["EVALUATE_SEQUENCE_SCORES"])
+
+    @staticmethod
+    def __get_active_column_distance():
+        """
+        Returns how far from the nonempty columns the moves are searched
+        (ACTIVE_COLUMNS_ONLY: a move further than WINNING_SEQUENCE_LENGTH - 1
+        columns from every piece can not share a window with one) / None to search all the columns
+        """
+        if not settings["ai"]["minimax"]["ACTIVE_COLUMNS_ONLY"]:
+            return None
+
+        return settings["game"]["WINNING_SEQUENCE_LENGTH"] - 1
+
+    @staticmethod
+    def __get_book_move(board, player):
+        """ Returns the move of the configured OPENING_BOOK / None if there is no book move """
+        file_name = settings["ai"]["minimax"]["OPENING_BOOK"]
+
+        if not file_name:
+            return None
+
+        if file_name not in MiniMaxAI.__opening_books:
+            MiniMaxAI.__opening_books[file_name] = OpeningBook(file_name)
+
+        return MiniMaxAI.__opening_books[file_name].get_move(
+                board, player, settings["game"]["WINNING_SEQUENCE_LENGTH"], settings["game"]["NUMBER_OF_PLAYERS"])
+
+    @staticmethod
+    def __get_winning_move(board, player):
+        """
+        Returns a move that wins the game right away / None
+
+        The search scores every winning line the same, so the immediate
+        win is looked up first to avoid delaying the game end.
+        """
+        for column_index in board.get_valid_moves():
+            board.drop_piece(column_index, player)
+            is_winning = GameStateAnalyzer.is_winning_move(
+                    board, board.get_top_occupied_row_index(column_index), column_index, player)
+            board.pop_piece()
+
+            if is_winning:
+                return column_index
+
+        return None
 
     @staticmethod
     def __get_opponent(player):
@@ -56,52 +589,68 @@ class MiniMaxAI:
         return opponent_player
 
     @staticmethod
-    def __maximize(board, player, depth, alpha, beta):
+    def __maximize(context, depth, alpha, beta, first_move):
         """ Maximizes the score of the AI player """
+        if depth == 1 and settings["ai"]["minimax"]["BATCHED_LEAF_EVALUATION"]:
+            return MiniMaxAI.__evaluate_leaves(context, alpha, beta, first_move, True)
+
         score = -inf
-        chosen_column_index = choice(board.get_valid_moves())
+        moves = context.get_moves()
+        chosen_column_index = choice(moves)
+        ply = context.root_depth - depth
 
-        for column_index in board.get_valid_moves():
-            board_copy = deepcopy(board)
-            board_copy.drop_piece(column_index, player)
-
-            new_score = MiniMaxAI.__minimax(
-                board_copy, player, depth - 1, alpha, beta, False
-            )[MiniMaxAI.SCORE_INDEX]
-
-            """ No more messing around (find a better way) """
-            if depth == settings["ai"]["minimax"]["DEPTH"] and new_score == MiniMaxAI.WINNING_SCORE:
-                for winning_column_index in board.get_valid_moves():
-                    board_copy = deepcopy(board)
-                    board_copy.drop_piece(winning_column_index, player)
-                    
-                    if GameStateAnalyzer.is_player_winning(board_copy, player):
-                        return winning_column_index, MiniMaxAI.WINNING_SCORE
+        ordered_moves = context.move_orderer.order_moves(moves, ply, first_move)
+
+        for move_index, column_index in enumerate(ordered_moves):
+            context.drop_piece(column_index, context.player)
+
+            try:
+                new_score = MiniMaxAI.__minimax(
+                    context, depth - 1, alpha, beta, False
+                )[MiniMaxAI.SCORE_INDEX]
+            finally:
+                context.pop_piece()
 
             if new_score > score:
                 score = new_score
                 chosen_column_index = column_index
 
+                if ply == 0:
+                    context.root_best_move = column_index
+
             alpha = max(alpha, score)
 
             if alpha >= beta:
+                context.move_orderer.record_cutoff(column_index, ply, depth, move_index)
+
+                if context.statistics is not None:
+                    context.statistics.record_cutoff(move_index)
                 break
 
         return chosen_column_index, score 
 
     @staticmethod
-    def __minimize(board, player, depth, alpha, beta):
+    def __minimize(context, depth, alpha, beta, first_move):
         """ Minimizes the score of the opponent of the AI player """
+        if depth == 1 and settings["ai"]["minimax"]["BATCHED_LEAF_EVALUATION"]:
+            return MiniMaxAI.__evaluate_leaves(context, alpha, beta, first_move, False)
+
         score = inf
-        chosen_column_index = choice(board.get_valid_moves())
+        moves = context.get_moves()
+        chosen_column_index = choice(moves)
+        ply = context.root_depth - depth
 
-        for column_index in board.get_valid_moves():
-            board_copy = deepcopy(board)
-            board_copy.drop_piece(column_index, MiniMaxAI.__get_opponent(player))
+        ordered_moves = context.move_orderer.order_moves(moves, ply, first_move)
+
+        for move_index, column_index in enumerate(ordered_moves):
+            context.drop_piece(column_index, context.opponent)
 
-            new_score = MiniMaxAI.__minimax(
-                board_copy, player, depth - 1, alpha, beta, True
-            )[MiniMaxAI.SCORE_INDEX]
+            try:
+                new_score = MiniMaxAI.__minimax(
+                    context, depth - 1, alpha, beta, True
+                )[MiniMaxAI.SCORE_INDEX]
+            finally:
+                context.pop_piece()
 
             if new_score < score:
                 score = new_score
@@ -110,79 +659,153 @@ class MiniMaxAI:
             beta = min(beta, score)
 
             if alpha >= beta:
+                context.move_orderer.record_cutoff(column_index, ply, depth, move_index)
+
+                if context.statistics is not None:
+                    context.statistics.record_cutoff(move_index)
                 break
 
         return chosen_column_index, score
 
     @staticmethod
-    def __evaluate_sequence(sequence, player):
-        """ Gives a score to a sequence """
-        if sequence.count(player) == 3 and sequence.count(0) == 1:
-            return settings["ai"]["minimax"]["EVALUATE_SEQUENCE_SCORES"][1]
-        elif sequence.count(player) == 2 and sequence.count(0) == 2:
-            return settings["ai"]["minimax"]["EVALUATE_SEQUENCE_SCORES"][2]
-        elif sequence.count(MiniMaxAI.__get_opponent(player)) == 3 and sequence.count(0) == 1:
-            return settings["ai"]["minimax"]["EVALUATE_SEQUENCE_SCORES"][3]
+    def __evaluate_leaves(context, alpha, beta, first_move, maximizing_player):
+        """
+        Scores all the children of a depth 1 node at once (BatchEvaluator),
+        returning the (column, score) tuple of the best one
+
+        Gives the same result as searching the children one by one, except that
+        no child is pruned (a cutoff is still reported to the move ordering).
+        """
+        context.check_deadline()
+
+        board = context.board
+        ply = context.root_depth - 1
+        ordered_moves = context.move_orderer.order_moves(context.get_moves(), ply, first_move)
+        moving_player = context.player if maximizing_player else context.opponent
+
+        children = np.repeat(np.array(board[:])[np.newaxis], len(ordered_moves), axis=0)
+        children[np.arange(len(ordered_moves)),
+                 [board.get_top_occupied_row_index(column_index) - 1 for column_index in ordered_moves],
+                 ordered_moves] = moving_player
+
+        statistics = context.statistics
+        if statistics is not None:
+            statistics.record_node(ply + 1, len(ordered_moves))
+            statistics.leaf_evaluations += len(ordered_moves)
+            start_time = perf_counter()
+
+        scores = BatchEvaluator.score_boards(children, context.player, context.opponent,
+                                             settings["game"]["WINNING_SEQUENCE_LENGTH"],
+                                             settings["ai"]["minimax"]["CENTER_ARRAY_SCORE_MULTIPLIER"],
+                                             settings["ai"]["minimax"]["EVALUATE_SEQUENCE_SCORES"])
+
+        if statistics is not None:
+            statistics.evaluation_time += perf_counter() - start_time
+            start_time = perf_counter()
+
+        """ Only the moving player can have won, a full board without a winner is a draw """
+        scores[(children[:, 0, :] != 0).all(axis=1)] = 0
+        scores[GameStateAnalyzer.is_player_winning_batch(children, moving_player)] = \
+                MiniMaxAI.WINNING_SCORE if maximizing_player else MiniMaxAI.LOSING_SCORE
+
+        if statistics is not None:
+            statistics.win_detection_time += perf_counter() - start_time
+
+        """ The first best move in search order, like the sequential search """
+        if maximizing_player:
+            best_index = int(np.argmax(scores))
+            cutoffs = np.flatnonzero(scores >= beta)
+        else:
+            best_index = int(np.argmin(scores))
+            cutoffs = np.flatnonzero(scores <= alpha)
+
+        if cutoffs.size:
+            context.move_orderer.record_cutoff(ordered_moves[cutoffs[0]], ply, 1, int(cutoffs[0]))
 
-        return 0
+        return ordered_moves[best_index], int(scores[best_index])
 
     @staticmethod
-    def __score_position(board, player):
-        """ Gets a score for the game state of the current node """
-        score = 0
+    def __get_terminal_score(context):
+        """ Returns the score of the searched position if the game is over / None """
+        board, player = context.board, context.player
+        last_move = context.get_last_move()
+
+        """ Below the root, only the last dropped piece can have ended the game """
+        if last_move is None:
+            if GameStateAnalyzer.is_player_winning(board, player):
+                return MiniMaxAI.WINNING_SCORE
+            if GameStateAnalyzer.is_player_winning(board, context.opponent):
+                return MiniMaxAI.LOSING_SCORE
+        elif GameStateAnalyzer.is_winning_move(board, *last_move):
+            return MiniMaxAI.WINNING_SCORE if last_move[2] == player else MiniMaxAI.LOSING_SCORE
+        if not board.get_valid_moves():
+            return 0
 
-        center_array = list(board[:, settings["game"]["BOARD_WIDTH"] // 2])
-        center_count = center_array.count(player)
-        score += center_count * settings["ai"]["minimax"]["CENTER_ARRAY_SCORE_MULTIPLIER"] 
+        return None
 
-        winning_sequence_length = settings["game"]["WINNING_SEQUENCE_LENGTH"]
+    @staticmethod
+    def __minimax(context, depth, alpha, beta, maximizing_player):
+        """ Minimax algorithm """
+        context.check_deadline()
 
-        """ Horizontal """
-        for row_index in range(board.height):
-            row_array = list(board[row_index, :])
+        statistics = context.statistics
 
-            for column_index in range(board.width - winning_sequence_length + 1):
-                sequence = row_array[column_index:column_index + winning_sequence_length]
-                score += MiniMaxAI.__evaluate_sequence(sequence, player)
+        if statistics is None:
+            terminal_score = MiniMaxAI.__get_terminal_score(context)
+        else:
+            statistics.record_node(context.root_depth - depth)
 
-        """ Vertical """
-        for column_index in range(board.width):
-            column_array = list(board[:, column_index])
+            start_time = perf_counter()
+            terminal_score = MiniMaxAI.__get_terminal_score(context)
+            statistics.win_detection_time += perf_counter() - start_time
 
-            for row_index in range(board.height - winning_sequence_length + 1):
-                sequence = column_array[row_index:row_index + winning_sequence_length]
-                score += MiniMaxAI.__evaluate_sequence(sequence, player)
+        if terminal_score is not None:
+            return (None, terminal_score)
+        if depth == 0:
+            if statistics is not None:
+                statistics.leaf_evaluations += 1
 
-        """ Positive slope diagonals """
-        for row_index in range(board.height - winning_sequence_length + 1):
-            for column_index in range(board.width - winning_sequence_length + 1):
-                sequence = [board[row_index + sequence_index][column_index + sequence_index] 
-                        for sequence_index in range(winning_sequence_length)] 
-                score += MiniMaxAI.__evaluate_sequence(sequence, player)
+            return (None, context.evaluator.get_score())
 
-        """ Negative slope diagonals """
-        for row_index in range(board.height - winning_sequence_length + 1):
-            for column_index in range(board.width - winning_sequence_length + 1):
-                sequence =              \
-                [board[row_index - winning_sequence_length + 1 - sequence_index][column_index + sequence_index] 
-                        for sequence_index in range(winning_sequence_length)] 
-                score += MiniMaxAI.__evaluate_sequence(sequence, player)
+        position_key = context.get_position_key(maximizing_player)
+        entry = context.transposition_table.probe(position_key)
+        best_move = context.root_first_move if depth == context.root_depth else None
 
-        return score
+        if statistics is not None:
+            statistics.transposition_probes += 1
+            statistics.transposition_hits += entry is not None
 
-    @staticmethod
-    def __minimax(board, player, depth, alpha, beta, maximizing_player):
-        """ Minimax algorithm """
-        if GameStateAnalyzer.is_player_winning(board, player):
-            return (None, MiniMaxAI.WINNING_SCORE)
-        if GameStateAnalyzer.is_player_winning(board, MiniMaxAI.__get_opponent(player)):
-            return (None, MiniMaxAI.LOSING_SCORE)
-        if not board.get_valid_moves():
-            return (None, 0)
-        if depth == 0:
-            return (None, MiniMaxAI.__score_position(board, player))
+        if entry is not None:
+            _, entry_depth, entry_score, entry_bound, entry_move = entry
+            best_move = entry_move if best_move is None else best_move
+
+            """ The root node always searches, it has to return a move """
+            if entry_depth >= depth and depth != context.root_depth:
+                if entry_bound == TranspositionTable.EXACT:
+                    return (entry_move, entry_score)
+                if entry_bound == TranspositionTable.LOWER_BOUND:
+                    alpha = max(alpha, entry_score)
+                else:
+                    beta = min(beta, entry_score)
+
+                if alpha >= beta:
+                    return (entry_move, entry_score)
 
         if maximizing_player:
-            return MiniMaxAI.__maximize(board, player, depth, alpha, beta)
+            column_index, score = MiniMaxAI.__maximize(context, depth, alpha, beta, best_move)
+        else:
+            column_index, score = MiniMaxAI.__minimize(context, depth, alpha, beta, best_move)
+
+        if score <= alpha:
+            bound = TranspositionTable.UPPER_BOUND
+        elif score >= beta:
+            bound = TranspositionTable.LOWER_BOUND
+        else:
+            bound = TranspositionTable.EXACT
+
+        context.transposition_table.store(position_key, depth, score, bound, column_index)
+
+        if statistics is not None:
+            statistics.transposition_stores += 1
 
-        return MiniMaxAI.__minimize(board, player, depth, alpha, beta)
+        return (column_index, score)
@@ -0,0 +1,133 @@
+class MoveOrderer:
+    """
+    Orders the moves searched by MiniMaxAI, so that alpha-beta pruning
+    cuts off as early as possible.
+
+    Supported heuristics (any combination):
+        - CENTER: static center-out column order
+        - KILLER: the last moves that caused a cutoff at the same ply
+        - HISTORY: the moves that caused the most (deep) cutoffs overall
+    Without any heuristic the moves are searched left to right.
+
+    Also counts the expanded nodes and the cutoffs, so the ordering
+    quality of a search can be reported.
+    """
+
+    CENTER = "CENTER"
+    KILLER = "KILLER"
+    HISTORY = "HISTORY"
+
+    """ The number of killer moves kept for every ply """
+    KILLER_MOVES_PER_PLY = 2
+
+    def __init__(self, width, heuristics):
+        """
+        Initializes the MoveOrderer instance.
+
+        :param width: the width of the searched board
+        :tparam width: positive integer
+
+        :param heuristics: the heuristics to be used
+        :tparam heuristics: iterable of CENTER / KILLER / HISTORY
+        """
+        heuristics = set(heuristics)
+
+        self.__use_center = MoveOrderer.CENTER in heuristics
+        self.__use_killer = MoveOrderer.KILLER in heuristics
+        self.__use_history = MoveOrderer.HISTORY in heuristics
+
+        center_column_index = (width - 1) / 2
+        self.__center_distances = [abs(column_index - center_column_index) if self.__use_center else 0
+                                   for column_index in range(width)]
+
+        self.__killer_moves = {}
+        self.__history_scores = [0] * width
+
+        self.__expanded_nodes = 0
+        self.__cutoffs = 0
+        self.__first_move_cutoffs = 0
+
+    def order_moves(self, valid_moves, ply, first_move=None):
+        """
+        Returns the valid moves in the order they should be searched
+
+        :param valid_moves: the moves to be ordered (left unchanged)
+        :tparam valid_moves: sequence of nonnegative integers
+
+        :param ply: the distance of the node from the search root
+        :tparam ply: nonnegative integer
+
+        :param first_move: move to be searched before all others (best move
+                           of a previous search) / None
+        :tparam first_move: nonnegative integer / None
+
+        :rtype: list of nonnegative integers
+        """
+        self.__expanded_nodes += 1
+
+        if self.__use_center or self.__use_history:
+            valid_moves = sorted(valid_moves, key=lambda column_index: (
+                -self.__history_scores[column_index], self.__center_distances[column_index]))
+        else:
+            """ The moves can be the cached tuple of the board, they are reordered in a copy """
+            valid_moves = list(valid_moves)
+
+        if self.__use_killer:
+            for killer_move in reversed(self.__killer_moves.get(ply, ())):
+                if killer_move in valid_moves:
+                    valid_moves.remove(killer_move)
+                    valid_moves.insert(0, killer_move)
+
+        if first_move in valid_moves:
+            valid_moves.remove(first_move)
+            valid_moves.insert(0, first_move)
+
+        return valid_moves
+
+    def record_cutoff(self, move, ply, depth, move_index):
+        """
+        Records a move that caused a cutoff
+
+        :param move: the move that caused the cutoff
+        :tparam move: nonnegative integer
+
+        :param ply: the distance of the node from the search root
+        :tparam ply: nonnegative integer
+
+        :param depth: the remaining search depth of the node
+        :tparam depth: positive integer
+
+        :param move_index: the position of the move in the searched order
+        :tparam move_index: nonnegative integer
+        """
+        self.__cutoffs += 1
+
+        if move_index == 0:
+            self.__first_move_cutoffs += 1
+
+        if self.__use_killer:
+            killer_moves = self.__killer_moves.setdefault(ply, [])
+
+            if move in killer_moves:
+                killer_moves.remove(move)
+
+            killer_moves.insert(0, move)
+            del killer_moves[MoveOrderer.KILLER_MOVES_PER_PLY:]
+
+        if self.__use_history:
+            self.__history_scores[move] += depth * depth
+
+    def get_statistics(self):
+        """
+        Returns the counters of the searches that used the MoveOrderer
+
+        :returns: dict with the expanded nodes, the cutoffs, the cutoffs caused
+                  by the first searched move and the cutoff rates
+        """
+        return {
+            "expanded_nodes": self.__expanded_nodes,
+            "cutoffs": self.__cutoffs,
+            "first_move_cutoffs": self.__first_move_cutoffs,
+            "cutoff_rate": self.__cutoffs / max(self.__expanded_nodes, 1),
+            "first_move_cutoff_rate": self.__first_move_cutoffs / max(self.__cutoffs, 1),
+        }
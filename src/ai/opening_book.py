@@ -0,0 +1,263 @@
+import mmap
+import os
+import struct
+from copy import deepcopy
+
+from src.service.game_state_analyzer import GameStateAnalyzer
+
+class OpeningBookException(Exception):
+    """ General exception raised by OpeningBook """
+    pass
+
+class OpeningBookFormatException(OpeningBookException):
+    """ Raised by OpeningBook when the opened file is not an opening book """
+    pass
+
+class OpeningBook:
+    """
+    Precomputed best moves of the first positions of two player games,
+    read from a memory-mapped file.
+
+    File layout (little endian):
+        - header: magic, version, board width, board height,
+                  winning sequence length, number of entries
+        - entries sorted by position key: (position key: 8 bytes, move: 1 byte)
+
+    Only the header is parsed when the book is opened, a lookup is a binary
+    search over the mapped entries. A position and its mirror image share
+    one entry, keyed by the smaller of their keys.
+    """
+
+    MAGIC = b"C4OB"
+    VERSION = 1
+
+    HEADER_FORMAT = "<4sHBBBI"
+    ENTRY_FORMAT = "<QB"
+
+    HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+    ENTRY_SIZE = struct.calcsize(ENTRY_FORMAT)
+
+    def __init__(self, file_name):
+        """
+        Opens an opening book file.
+
+        :param file_name: the path of the book
+        :tparam file_name: string
+
+        :raises: OpeningBookFormatException if the file is not a valid book
+        """
+        with open(file_name, "rb") as book_file:
+            """ An empty file can not be mapped """
+            if os.fstat(book_file.fileno()).st_size < OpeningBook.HEADER_SIZE:
+                raise OpeningBookFormatException
+
+            self.__book = mmap.mmap(book_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.__width, self.__height, self.__winning_sequence_length, self.__entry_count = \
+                struct.unpack_from(OpeningBook.HEADER_FORMAT, self.__book)
+
+        if magic != OpeningBook.MAGIC or version != OpeningBook.VERSION or \
+                len(self.__book) != OpeningBook.HEADER_SIZE + self.__entry_count * OpeningBook.ENTRY_SIZE:
+            self.__book.close()
+            raise OpeningBookFormatException
+
+    @staticmethod
+    def get_position_key(board, mirrored=False):
+        """
+        Returns the key of a two player position
+
+        Every column takes (height + 1) bits: one bit for each piece, set for
+        the pieces of player 1, followed by a set bit marking the column top.
+
+        :param board: the board position
+        :tparam board: Board
+
+        :param mirrored: True to get the key of the mirror image of the position
+        :tparam mirrored: bool
+
+        :rtype: nonnegative integer
+        """
+        key = 0
+
+        for column_index in range(board.width):
+            source_column_index = board.width - 1 - column_index if mirrored else column_index
+            column_key = 0
+            column_height = 0
+
+            for row_index in range(board.height - 1, -1, -1):
+                piece = board[row_index][source_column_index]
+
+                if piece == 0:
+                    break
+
+                column_key |= int(piece == 1) << column_height
+                column_height += 1
+
+            column_key |= 1 << column_height
+            key |= column_key << (column_index * (board.height + 1))
+
+        return key
+
+    @staticmethod
+    def get_canonical_entry(board, move):
+        """
+        Returns the (key, move) entry of a position, keyed by the smaller of
+        the position and mirrored position keys
+
+        :param board: the board position
+        :tparam board: Board
+
+        :param move: the best move of the position
+        :tparam move: nonnegative integer
+
+        :rtype: tuple (nonnegative integer, nonnegative integer)
+        """
+        key = OpeningBook.get_position_key(board)
+        mirrored_key = OpeningBook.get_position_key(board, True)
+
+        if mirrored_key < key:
+            return mirrored_key, board.width - 1 - move
+
+        return key, move
+
+    def __find(self, key):
+        """ Returns the move stored for a key / None (binary search over the entries) """
+        low, high = 0, self.__entry_count - 1
+
+        while low <= high:
+            middle = (low + high) // 2
+            entry_key, move = struct.unpack_from(
+                    OpeningBook.ENTRY_FORMAT, self.__book, OpeningBook.HEADER_SIZE + middle * OpeningBook.ENTRY_SIZE)
+
+            if entry_key == key:
+                return move
+            if entry_key < key:
+                low = middle + 1
+            else:
+                high = middle - 1
+
+        return None
+
+    def get_move(self, board, player, winning_sequence_length, number_of_players):
+        """
+        Returns the book move of a position / None if the position is not in the book
+        (or the game is not a two player game with the board and rules of the book)
+
+        :param board: the board position
+        :tparam board: Board
+
+        :param player: the player to move (1 or 2)
+        :tparam player: player id value
+
+        :param winning_sequence_length: the winning sequence length of the game
+        :tparam winning_sequence_length: positive integer
+
+        :param number_of_players: the number of players of the game
+        :tparam number_of_players: positive integer
+
+        :rtype: nonnegative integer / None
+        """
+        """ The positions of the book are keyed (and searched) as two player games """
+        if number_of_players != 2:
+            return None
+
+        if (board.width, board.height, winning_sequence_length) != \
+                (self.__width, self.__height, self.__winning_sequence_length):
+            return None
+
+        """ The book only has positions where players 1 and 2 alternated, starting with player 1 """
+        piece_count = int((board[:] != 0).sum())
+        if player != piece_count % 2 + 1:
+            return None
+
+        move = self.__find(OpeningBook.get_position_key(board))
+        if move is not None:
+            return move
+
+        move = self.__find(OpeningBook.get_position_key(board, True))
+        if move is not None:
+            return board.width - 1 - move
+
+        return None
+
+    def close(self):
+        """ Unmaps the book file """
+        self.__book.close()
+
+    def __len__(self):
+        """ Returns the number of positions in the book """
+        return self.__entry_count
+
+    @staticmethod
+    def write(file_name, width, height, winning_sequence_length, entries):
+        """
+        Writes an opening book file
+
+        :param file_name: the path of the book
+        :tparam file_name: string
+
+        :param entries: the (key, move) entries of the book
+        :tparam entries: dict / iterable of tuples (nonnegative integer, nonnegative integer)
+
+        :raises: OpeningBookException if the position keys of the board do not fit in 64 bits
+        """
+        if width * (height + 1) > 64:
+            raise OpeningBookException("{}x{} positions do not fit in 64-bit keys".format(width, height))
+
+        entries = sorted(dict(entries).items())
+
+        with open(file_name, "wb") as book_file:
+            book_file.write(struct.pack(OpeningBook.HEADER_FORMAT, OpeningBook.MAGIC, OpeningBook.VERSION,
+                                        width, height, winning_sequence_length, len(entries)))
+
+            for key, move in entries:
+                book_file.write(struct.pack(OpeningBook.ENTRY_FORMAT, key, move))
+
+    @staticmethod
+    def build(board, plies, get_move):
+        """
+        Computes the entries of an opening book
+
+        All the positions reachable from the given board in less than the
+        given number of plies (players 1 and 2 alternating, no finished games)
+        are searched with get_move.
+
+        :param board: the starting (usually empty) board, left unchanged
+        :tparam board: Board
+
+        :param plies: the number of plies covered by the book
+        :tparam plies: nonnegative integer
+
+        :param get_move: the engine move function, get_move(board, player)
+        :tparam get_move: callable
+
+        :returns: dict of position key to move
+        """
+        board = deepcopy(board)
+        entries = {}
+
+        def add_positions(remaining_plies):
+            piece_count = int((board[:] != 0).sum())
+            player = piece_count % 2 + 1
+
+            key, _ = OpeningBook.get_canonical_entry(board, 0)
+            if key in entries or not board.get_valid_moves():
+                return
+
+            entries[key] = OpeningBook.get_canonical_entry(board, get_move(board, player))[1]
+
+            if remaining_plies == 1:
+                return
+
+            for column_index in board.get_valid_moves():
+                board.drop_piece(column_index, player)
+
+                if not GameStateAnalyzer.is_player_winning(board, player):
+                    add_positions(remaining_plies - 1)
+
+                board.pop_piece()
+
+        if plies:
+            add_positions(plies)
+
+        return entries
@@ -6,13 +6,15 @@ class RandomAI:
     """ Implements random choice AI """
 
     @staticmethod
-    def get_move(board, player=0):
+    def get_move(board, player=0, stop_event=None):
         """
         Returns random move that can be made on a given board.
 
         :param board: the board to be considered
         :tparam board: Board
 
+        :param stop_event: unused (the choice is instant), accepted like the other AI engines
+
         :return: move column index / None if no choice is available
         :rtype: nonnegative integer / None
         """
@@ -0,0 +1,206 @@
+from concurrent.futures import ProcessPoolExecutor, wait
+from math import inf
+from multiprocessing import Value
+
+from src.ai.move_ordering import MoveOrderer
+from src.ai.search_context import SearchTimeoutException, SharedStopFlag
+from config import settings
+
+""" The best root score found so far by the workers of the current search """
+worker_shared_alpha = None
+""" The flag stopping the searches of the workers """
+worker_stop_flag = None
+
+def initialize_worker(shared_alpha, stop_flag):
+    """
+    Initializes a worker process of the RootParallelSearch pool
+
+    :param shared_alpha: the best root score shared by all the workers
+    :tparam shared_alpha: multiprocessing.Value of type double
+
+    :param stop_flag: the flag stopping the searches of the workers
+    :tparam stop_flag: SharedStopFlag
+    """
+    global worker_shared_alpha, worker_stop_flag
+    worker_shared_alpha = shared_alpha
+    worker_stop_flag = stop_flag
+
+def get_search_settings():
+    """ Returns the game and minimax settings of the calling process, sent with every root move """
+    return {"game": dict(settings["game"]), "minimax": dict(settings["ai"]["minimax"])}
+
+def apply_search_settings(search_settings):
+    """
+    Applies the settings of the calling process to a worker process
+
+    The workers keep the settings they had when the pool was created, so the
+    changes made since then (e.g. MOVE_ORDERING, TRANSPOSITION_TABLE_SIZE,
+    ACTIVE_COLUMNS_ONLY or the evaluation settings) are applied before every
+    root move. The worker runs its searches in that process only.
+
+    :param search_settings: the settings returned by get_search_settings
+    :tparam search_settings: dict
+    """
+    settings["game"].update(search_settings["game"])
+    settings["ai"]["minimax"].update(search_settings["minimax"], WORKERS=1)
+
+def search_root_move(engine, board, player, column_index, depth, deadline, search_settings):
+    """
+    Scores a root move in a worker process
+
+    The move is searched with a window starting just below the best root score
+    found so far by the other workers (read when the move is started), so it is
+    cut off as soon as it is known to be worse. Moves scoring at least as much
+    as the best one get an exact score. The worker cache is cleared for every
+    root move, so a score does not depend on the moves the worker searched before.
+
+    :param engine: the AI engine scoring the move
+    :tparam engine: MiniMaxAI
+
+    :param search_settings: the settings of the calling process (see get_search_settings)
+    :tparam search_settings: dict
+
+    :returns: the score of the move (an upper bound if it is worse than
+              the best root move)
+    """
+    apply_search_settings(search_settings)
+    engine.clear_transposition_table()
+
+    """ The scores are integers, so the moves as good as the best one are searched exactly """
+    alpha = worker_shared_alpha.value - 1
+
+    score = engine.score_move(board, player, column_index, depth, alpha, deadline, worker_stop_flag)
+
+    with worker_shared_alpha.get_lock():
+        if score > worker_shared_alpha.value:
+            worker_shared_alpha.value = score
+
+    return score
+
+class RootParallelSearch:
+    """
+    Splits the root moves of a search across a pool of worker processes.
+
+    The workers share the best root score found so far (alpha bound), so
+    later root moves are still pruned. The moves are searched in a fixed order
+    (the root_first_move, then center-out), ties are broken by that order and
+    every root move is searched with an empty worker cache, so the chosen move
+    at a fixed depth does not depend on the scheduling of the workers.
+
+    The search statistics and the move ordering counters of the calling
+    process are not updated by the workers.
+    """
+
+    """ The worker pool, created on first use and kept between moves """
+    __executor = None
+    __workers = None
+    __shared_alpha = None
+    __stop_flag = None
+
+    """ The seconds between the checks of the stop event of the calling process """
+    STOP_POLL_INTERVAL = 0.01
+
+    @staticmethod
+    def search(engine, board, player, depth, workers, deadline=None, root_first_move=None, stop_event=None):
+        """
+        Searches the root moves in parallel
+
+        :param engine: the AI engine scoring the root moves
+        :tparam engine: MiniMaxAI
+
+        :param board: the board to be searched
+        :tparam board: Board
+
+        :param player: the player represented by the AI
+        :tparam player: player id value
+
+        :param depth: the depth of the search
+        :tparam depth: positive integer
+
+        :param workers: the number of worker processes
+        :tparam workers: positive integer
+
+        :param deadline: the perf_counter time when the search has to stop / None
+        :tparam deadline: float / None
+
+        :param root_first_move: the move to be searched first / None
+        :tparam root_first_move: nonnegative integer / None
+
+        :param stop_event: event that stops the search when set / None
+        :tparam stop_event: threading.Event / None
+
+        :returns: the (column, score) tuple of the best move
+        :raises: SearchTimeoutException if the deadline passed or the search was
+                 stopped before all the root moves were searched (with the best
+                 of the searched root moves)
+        """
+        executor = RootParallelSearch.__get_executor(workers)
+
+        RootParallelSearch.__shared_alpha.value = -inf
+        RootParallelSearch.__stop_flag.clear()
+
+        root_moves = MoveOrderer(board.width, [MoveOrderer.CENTER]).order_moves(board.get_valid_moves(), 0)
+
+        if root_first_move in root_moves:
+            root_moves.remove(root_first_move)
+            root_moves.insert(0, root_first_move)
+
+        search_settings = get_search_settings()
+        futures = [executor.submit(search_root_move, engine, board, player, column_index, depth, deadline,
+                                   search_settings)
+                   for column_index in root_moves]
+
+        """ Every task has to finish (or be stopped) before the next search starts """
+        pending_futures = futures
+
+        while pending_futures:
+            if stop_event is None:
+                wait(pending_futures)
+                break
+
+            _, pending_futures = wait(pending_futures, RootParallelSearch.STOP_POLL_INTERVAL)
+
+            if stop_event.is_set():
+                RootParallelSearch.__stop_flag.set()
+                wait(pending_futures)
+                break
+
+        best_column_index, best_score = None, -inf
+        is_stopped = False
+
+        for column_index, future in zip(root_moves, futures):
+            try:
+                score = future.result()
+            except SearchTimeoutException:
+                is_stopped = True
+                continue
+
+            if score > best_score:
+                best_column_index, best_score = column_index, score
+
+        if is_stopped:
+            raise SearchTimeoutException(best_column_index)
+
+        return best_column_index, best_score
+
+    @staticmethod
+    def shutdown():
+        """ Stops the worker processes """
+        if RootParallelSearch.__executor is not None:
+            RootParallelSearch.__executor.shutdown()
+            RootParallelSearch.__executor = None
+
+    @staticmethod
+    def __get_executor(workers):
+        """ Returns the worker pool, (re)creating it for the given number of workers """
+        if RootParallelSearch.__executor is None or RootParallelSearch.__workers != workers:
+            RootParallelSearch.shutdown()
+
+            RootParallelSearch.__shared_alpha = Value("d", -inf)
+            RootParallelSearch.__stop_flag = SharedStopFlag()
+            RootParallelSearch.__executor = ProcessPoolExecutor(
+                    workers, initializer=initialize_worker,
+                    initargs=(RootParallelSearch.__shared_alpha, RootParallelSearch.__stop_flag))
+            RootParallelSearch.__workers = workers
+
+        return RootParallelSearch.__executor
@@ -0,0 +1,228 @@
+from multiprocessing.sharedctypes import RawValue
+from time import perf_counter
+
+import numpy as np
+
+class SearchTimeoutException(Exception):
+    """ Raised by SearchContext when the time budget of the search ran out or the search was stopped """
+
+    def __init__(self, best_move=None):
+        super().__init__()
+
+        """ The best root move fully searched before the search stopped / None """
+        self.best_move = best_move
+
+class SharedStopFlag:
+    """
+    Flag stopping the searches of other processes, with the is_set / set / clear
+    interface of an Event. It is a shared byte read without a lock, so the
+    searches can check it often.
+    """
+
+    def __init__(self):
+        self.__flag = RawValue("b", 0)
+
+    def is_set(self):
+        return bool(self.__flag.value)
+
+    def set(self):
+        self.__flag.value = 1
+
+    def clear(self):
+        self.__flag.value = 0
+
+class SearchContext:
+    """
+    State shared by the nodes of a single MiniMaxAI search.
+    (the searched board, the players, the Zobrist hash and the heuristic
+    evaluation of the current position, updated on every drop / removal,
+    and the caches)
+    """
+
+    def __init__(self, board, player, opponent, root_depth, transposition_table, zobrist_hasher,
+                 move_orderer, evaluator, deadline=None, root_first_move=None, stop_event=None,
+                 active_column_distance=None, statistics=None):
+        """
+        Initializes the SearchContext instance.
+
+        :param board: the board searched in place
+        :tparam board: Board
+
+        :param player: the player represented by the AI
+        :tparam player: player id value
+
+        :param opponent: the opponent of the AI player
+        :tparam opponent: player id value
+
+        :param root_depth: the depth of the search at the root node
+        :tparam root_depth: positive integer
+
+        :param transposition_table: the cache of searched positions
+        :tparam transposition_table: TranspositionTable
+
+        :param zobrist_hasher: the Zobrist key generator of the board shape
+        :tparam zobrist_hasher: ZobristHasher
+
+        :param move_orderer: the move ordering stage of the search
+        :tparam move_orderer: MoveOrderer
+
+        :param evaluator: the heuristic evaluation of the searched board
+        :tparam evaluator: IncrementalEvaluator
+
+        :param deadline: the perf_counter time when the search has to stop / None
+        :tparam deadline: float / None
+
+        :param root_first_move: the move to be searched first at the root / None
+        :tparam root_first_move: nonnegative integer / None
+
+        :param stop_event: event that stops the search when set / None
+        :tparam stop_event: threading.Event / SharedStopFlag / None
+
+        :param active_column_distance: if set, only the columns at most this far
+                                       from a nonempty column are searched / None
+        :tparam active_column_distance: nonnegative integer / None
+
+        :param statistics: the counters of the search / None if they are not collected
+        :tparam statistics: SearchStatistics / None
+        """
+        self.board = board
+        self.player = player
+        self.opponent = opponent
+        self.root_depth = root_depth
+        self.transposition_table = transposition_table
+        self.move_orderer = move_orderer
+        self.evaluator = evaluator
+        self.root_first_move = root_first_move
+        self.statistics = statistics
+
+        """ The best root move fully searched so far """
+        self.root_best_move = None
+
+        self.__deadline = deadline
+        self.__stop_event = stop_event
+
+        self.__zobrist_hasher = zobrist_hasher
+        self.__board_hash = zobrist_hasher.hash_board(board)
+        self.__piece_keys = []
+        self.__moves = []
+
+        self.__active_column_distance = active_column_distance
+        self.__active_column_counts = None
+
+        if active_column_distance is not None:
+            """ The number of pieces at most active_column_distance columns away, for every column """
+            self.__active_column_counts = [0] * board.width
+
+            for column_index, piece_count in enumerate(np.count_nonzero(np.asarray(board[:]), axis=0)):
+                self.__update_active_columns(column_index, int(piece_count))
+
+    def drop_piece(self, column_index, player):
+        """
+        Drops a piece into the searched board, updating the position hash and evaluation
+
+        :param column_index: the column where the piece is dropped
+        :tparam column_index: nonnegative integer
+
+        :param player: the player that drops the piece
+        :tparam player: player id value
+        """
+        self.board.drop_piece(column_index, player)
+        row_index = self.board.get_top_occupied_row_index(column_index)
+
+        piece_key = self.__zobrist_hasher.get_piece_key(row_index, column_index, player)
+
+        if self.statistics is None:
+            self.evaluator.drop_piece(row_index, column_index, player)
+        else:
+            start_time = perf_counter()
+            self.evaluator.drop_piece(row_index, column_index, player)
+            self.statistics.evaluation_time += perf_counter() - start_time
+
+        self.__board_hash ^= piece_key
+        self.__piece_keys.append(piece_key)
+        self.__moves.append((row_index, column_index, player))
+
+        if self.__active_column_counts is not None:
+            self.__update_active_columns(column_index, 1)
+
+    def pop_piece(self):
+        """ Removes the last piece dropped through drop_piece, updating the position hash and evaluation """
+        self.board.pop_piece()
+
+        if self.statistics is None:
+            self.evaluator.pop_piece()
+        else:
+            start_time = perf_counter()
+            self.evaluator.pop_piece()
+            self.statistics.evaluation_time += perf_counter() - start_time
+
+        self.__board_hash ^= self.__piece_keys.pop()
+
+        _, column_index, _ = self.__moves.pop()
+
+        if self.__active_column_counts is not None:
+            self.__update_active_columns(column_index, -1)
+
+    def __update_active_columns(self, column_index, piece_count_change):
+        """ Adds / removes pieces of a column to the counts of the columns around it """
+        first_column_index = max(column_index - self.__active_column_distance, 0)
+        last_column_index = min(column_index + self.__active_column_distance, self.board.width - 1)
+
+        for active_column_index in range(first_column_index, last_column_index + 1):
+            self.__active_column_counts[active_column_index] += piece_count_change
+
+    def get_moves(self):
+        """
+        Returns the moves to be searched from the current node
+        (the valid moves, restricted to the active columns if active_column_distance is set)
+
+        An empty board has only its center column active. If no active column
+        is playable, all the valid moves are returned.
+
+        :rtype: sequence of nonnegative integers (the cached tuple of the board
+                / a list of the active moves), not to be changed
+        """
+        valid_moves = self.board.get_valid_moves()
+
+        if self.__active_column_counts is None:
+            return valid_moves
+
+        active_column_counts = self.__active_column_counts
+
+        if not any(active_column_counts):
+            active_moves = [column_index for column_index in valid_moves if column_index == self.board.width // 2]
+        else:
+            active_moves = [column_index for column_index in valid_moves if active_column_counts[column_index]]
+
+        return active_moves or valid_moves
+
+    def get_last_move(self):
+        """
+        Returns the last piece dropped through drop_piece
+
+        :returns: tuple (row index, column index, player) / None at the root of the search
+        """
+        return self.__moves[-1] if self.__moves else None
+
+    def get_position_key(self, maximizing_player):
+        """
+        Returns the transposition table key of the current node
+
+        :param maximizing_player: True if the node is a maximizing one
+        :tparam maximizing_player: bool
+
+        :rtype: nonnegative integer
+        """
+        return self.__board_hash ^ self.__zobrist_hasher.get_side_key(self.player, maximizing_player)
+
+    def check_deadline(self):
+        """
+        Stops the search if its time budget ran out or it was asked to stop
+
+        :raises: SearchTimeoutException if the deadline has passed or the stop event is set
+        """
+        if self.__deadline is not None and perf_counter() >= self.__deadline:
+            raise SearchTimeoutException
+
+        if self.__stop_event is not None and self.__stop_event.is_set():
+            raise SearchTimeoutException
@@ -0,0 +1,109 @@
+from time import perf_counter
+
+class SearchStatistics:
+    """
+    Counters and timers of a MiniMaxAI move search
+    (collected only when COLLECT_STATISTICS is set)
+
+    Public attributes:
+        - nodes_per_ply: the nodes visited at every distance from the root
+                         (all the iterations of an iterative deepening search)
+        - leaf_evaluations: the heuristic evaluations of depth 0 nodes
+        - cutoffs: the beta cutoffs (of both maximizing and minimizing nodes)
+        - first_move_cutoffs: the cutoffs caused by the first searched move
+        - transposition_probes: the transposition table lookups
+        - transposition_hits: the lookups finding an entry of the position
+        - transposition_stores: the entries written to the transposition table
+        - evaluation_time: the seconds spent updating / computing the evaluation
+        - win_detection_time: the seconds spent checking for finished games
+        - elapsed_time: the seconds of the whole move search
+
+    Only the nodes searched in the calling process are counted (not the ones
+    of the ROOT / LAZY_SMP worker processes).
+    """
+
+    def __init__(self):
+        """ Initializes the SearchStatistics instance (all counters at 0) """
+        self.nodes_per_ply = []
+        self.leaf_evaluations = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.transposition_probes = 0
+        self.transposition_hits = 0
+        self.transposition_stores = 0
+        self.evaluation_time = 0
+        self.win_detection_time = 0
+        self.elapsed_time = 0
+
+        self.__start_time = None
+
+    def start(self):
+        """ Starts timing the search """
+        self.__start_time = perf_counter()
+
+    def stop(self):
+        """ Stops timing the search """
+        self.elapsed_time += perf_counter() - self.__start_time
+
+    def record_node(self, ply, count=1):
+        """
+        Counts visited nodes
+
+        :param ply: the distance of the nodes from the search root
+        :tparam ply: nonnegative integer
+
+        :param count: the number of visited nodes
+        :tparam count: positive integer
+        """
+        while len(self.nodes_per_ply) <= ply:
+            self.nodes_per_ply.append(0)
+
+        self.nodes_per_ply[ply] += count
+
+    def record_cutoff(self, move_index):
+        """
+        Counts a beta cutoff
+
+        :param move_index: the position of the move causing the cutoff in the searched order
+        :tparam move_index: nonnegative integer
+        """
+        self.cutoffs += 1
+
+        if move_index == 0:
+            self.first_move_cutoffs += 1
+
+    @property
+    def nodes(self):
+        """ Returns the number of visited nodes """
+        return sum(self.nodes_per_ply)
+
+    def get_first_move_cutoff_rate(self):
+        """ Returns the rate of the cutoffs caused by the first searched move """
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0
+
+    def get_transposition_hit_rate(self):
+        """ Returns the rate of the transposition table lookups finding an entry """
+        return self.transposition_hits / self.transposition_probes if self.transposition_probes else 0
+
+    def get_nodes_per_second(self):
+        """ Returns the number of nodes visited per second of search """
+        return self.nodes / self.elapsed_time if self.elapsed_time else 0
+
+    def as_dict(self):
+        """ Returns all the statistics as a dict """
+        return {
+            "nodes": self.nodes,
+            "nodes_per_ply": list(self.nodes_per_ply),
+            "leaf_evaluations": self.leaf_evaluations,
+            "cutoffs": self.cutoffs,
+            "first_move_cutoffs": self.first_move_cutoffs,
+            "first_move_cutoff_rate": self.get_first_move_cutoff_rate(),
+            "transposition_probes": self.transposition_probes,
+            "transposition_hits": self.transposition_hits,
+            "transposition_hit_rate": self.get_transposition_hit_rate(),
+            "transposition_stores": self.transposition_stores,
+            "evaluation_time": self.evaluation_time,
+            "win_detection_time": self.win_detection_time,
+            "elapsed_time": self.elapsed_time,
+            "nodes_per_second": self.get_nodes_per_second(),
+        }
@@ -0,0 +1,156 @@
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+class SharedTranspositionTable:
+    """
+    Transposition table stored in shared memory, read and written by
+    several processes at the same time without locks.
+
+    Has the same interface and two-tier replacement policy as TranspositionTable.
+    Every entry is packed into two 64-bit words: (key XOR data, data).
+    A reader recomputes the key from both words, so an entry torn by a
+    concurrent write does not verify and is treated as missing.
+
+    Data word layout (low to high bits):
+        - 32 bits: score, offset by 2^31
+        -  8 bits: depth
+        -  2 bits: bound
+        -  8 bits: best move + 1 (0 for no move)
+    """
+
+    """ The number of bytes of an entry (two 64-bit words) """
+    ENTRY_BYTES = 16
+    """ The number of entries in a slot (depth-preferred and always-replace) """
+    TIERS = 2
+
+    SCORE_OFFSET = 1 << 31
+    SCORE_MASK = (1 << 32) - 1
+    DEPTH_SHIFT = 32
+    DEPTH_MASK = (1 << 8) - 1
+    BOUND_SHIFT = 40
+    BOUND_MASK = (1 << 2) - 1
+    MOVE_SHIFT = 42
+    MOVE_MASK = (1 << 8) - 1
+
+    def __init__(self, size, name=None):
+        """
+        Creates a new shared table or attaches to an existing one.
+
+        :param size: the number of slots of the table
+        :tparam size: positive integer
+
+        :param name: the name of an existing shared memory block / None to create one
+        :tparam name: string / None
+        """
+        self.__size = size
+        self.__is_owner = name is None
+
+        if self.__is_owner:
+            self.__shared_memory = SharedMemory(
+                    create=True, size=size * SharedTranspositionTable.TIERS * SharedTranspositionTable.ENTRY_BYTES)
+        else:
+            self.__shared_memory = SharedMemory(name=name)
+
+        self.__entries = np.ndarray((size, SharedTranspositionTable.TIERS, 2),
+                                    dtype=np.uint64, buffer=self.__shared_memory.buf)
+
+        if self.__is_owner:
+            self.__entries.fill(0)
+
+    @staticmethod
+    def __pack(depth, score, bound, best_move):
+        """ Packs the values of an entry into its data word """
+        move_value = 0 if best_move is None else best_move + 1
+
+        return ((int(score) + SharedTranspositionTable.SCORE_OFFSET) & SharedTranspositionTable.SCORE_MASK) \
+                | min(depth, SharedTranspositionTable.DEPTH_MASK) << SharedTranspositionTable.DEPTH_SHIFT \
+                | bound << SharedTranspositionTable.BOUND_SHIFT \
+                | move_value << SharedTranspositionTable.MOVE_SHIFT
+
+    @staticmethod
+    def __unpack(key, data):
+        """ Unpacks a data word into an entry tuple """
+        move_value = data >> SharedTranspositionTable.MOVE_SHIFT & SharedTranspositionTable.MOVE_MASK
+
+        return (key,
+                data >> SharedTranspositionTable.DEPTH_SHIFT & SharedTranspositionTable.DEPTH_MASK,
+                (data & SharedTranspositionTable.SCORE_MASK) - SharedTranspositionTable.SCORE_OFFSET,
+                data >> SharedTranspositionTable.BOUND_SHIFT & SharedTranspositionTable.BOUND_MASK,
+                None if move_value == 0 else move_value - 1)
+
+    def __read(self, slot_index, tier):
+        """ Returns the (key, data) words of a stored entry / None if the entry is empty or torn """
+        checked_key, data = int(self.__entries[slot_index, tier, 0]), int(self.__entries[slot_index, tier, 1])
+
+        if data == 0:
+            return None
+
+        return checked_key ^ data, data
+
+    def __write(self, slot_index, tier, key, data):
+        """ Writes the (key XOR data, data) words of an entry """
+        self.__entries[slot_index, tier, 0] = key ^ data
+        self.__entries[slot_index, tier, 1] = data
+
+    def probe(self, key):
+        """
+        Returns the entry stored for a position / None
+
+        :param key: the hash of the position (64 bits)
+        :tparam key: nonnegative integer
+
+        :rtype: entry tuple (key, depth, score, bound, best move) / None
+        """
+        slot_index = key % self.__size
+
+        for tier in range(SharedTranspositionTable.TIERS):
+            words = self.__read(slot_index, tier)
+
+            if words is not None and words[0] == key:
+                return SharedTranspositionTable.__unpack(key, words[1])
+
+        return None
+
+    def store(self, key, depth, score, bound, best_move):
+        """
+        Stores the result of a search (see TranspositionTable.store)
+
+        :param key: the hash of the position (64 bits)
+        :tparam key: nonnegative integer
+        """
+        slot_index = key % self.__size
+        data = SharedTranspositionTable.__pack(depth, score, bound, best_move)
+
+        stored_words = self.__read(slot_index, 0)
+
+        if stored_words is None or stored_words[0] == key:
+            self.__write(slot_index, 0, key, data)
+        elif depth >= stored_words[1] >> SharedTranspositionTable.DEPTH_SHIFT & SharedTranspositionTable.DEPTH_MASK:
+            """ The replaced entry is demoted to the second tier """
+            self.__write(slot_index, 0, key, data)
+            self.__write(slot_index, 1, *stored_words)
+        else:
+            self.__write(slot_index, 1, key, data)
+
+    def clear(self):
+        """ Removes all the stored entries """
+        self.__entries.fill(0)
+
+    def close(self):
+        """ Detaches from the shared memory, removing it if this instance created it """
+        self.__entries = None
+        self.__shared_memory.close()
+
+        if self.__is_owner:
+            self.__shared_memory.unlink()
+
+    @property
+    def name(self):
+        """ Returns the name of the shared memory block (used to attach to the table) """
+        return self.__shared_memory.name
+
+    @property
+    def size(self):
+        """ Returns the number of slots of the SharedTranspositionTable """
+        return self.__size
@@ -0,0 +1,450 @@
+from src.ai.transposition_table import TranspositionTable
+from src.ai.search_context import SearchTimeoutException
+from config import settings
+
+class SolverAIException(Exception):
+    """ Raised by SolverAI when the game can not be solved by it """
+    pass
+
+class SolverPosition:
+    """
+    Bitboard position used by SolverAI, seen from the player to move.
+
+    Stores the pieces of the player to move and the mask of all the pieces,
+    column by column, each column using (height + 1) bits (the top bit of
+    every column is a sentinel, always empty).
+    """
+
+    def __init__(self, width, height, winning_sequence_length, current_mask=0, mask=0, moves=0):
+        """
+        Initializes the SolverPosition instance.
+
+        :param current_mask: the pieces of the player to move
+        :tparam current_mask: nonnegative integer
+
+        :param mask: all the pieces on the board
+        :tparam mask: nonnegative integer
+
+        :param moves: the number of pieces on the board
+        :tparam moves: nonnegative integer
+        """
+        self.width = width
+        self.height = height
+        self.winning_sequence_length = winning_sequence_length
+
+        self.current_mask = current_mask
+        self.mask = mask
+        self.moves = moves
+
+        column_stride = height + 1
+        self.bottom_mask = sum(1 << (column_index * column_stride) for column_index in range(width))
+        self.board_mask = self.bottom_mask * ((1 << height) - 1)
+
+        self.__column_top_masks = [1 << (height - 1 + column_index * column_stride) for column_index in range(width)]
+        self.__column_bottom_masks = [1 << (column_index * column_stride) for column_index in range(width)]
+        self.__column_masks = [((1 << height) - 1) << (column_index * column_stride) for column_index in range(width)]
+        self.__shifts = (1, column_stride, column_stride + 1, column_stride - 1)
+
+    @staticmethod
+    def from_board(board, player, winning_sequence_length):
+        """
+        Returns the SolverPosition of a board, with the given player to move
+
+        :param board: the board position
+        :tparam board: Board
+
+        :param player: the player to move
+        :tparam player: player id value
+
+        :param winning_sequence_length: the winning sequence length of the game
+        :tparam winning_sequence_length: positive integer
+
+        :rtype: SolverPosition
+        """
+        position = SolverPosition(board.width, board.height, winning_sequence_length)
+
+        for column_index in range(board.width):
+            for filled_index in range(board.height):
+                piece = board[board.height - 1 - filled_index][column_index]
+
+                if piece == 0:
+                    break
+
+                piece_bit = 1 << (column_index * (board.height + 1) + filled_index)
+
+                position.mask |= piece_bit
+                position.moves += 1
+
+                if piece == player:
+                    position.current_mask |= piece_bit
+
+        return position
+
+    def get_key(self):
+        """ Returns a key identifying the position (unique for the board shape) """
+        return self.current_mask + self.mask
+
+    def can_play(self, column_index):
+        """ Checks if a piece can be dropped in a given column """
+        return not self.mask & self.__column_top_masks[column_index]
+
+    def play(self, column_index):
+        """ Drops a piece of the player to move, the opponent is to move next """
+        self.current_mask ^= self.mask
+        self.mask |= self.mask + self.__column_bottom_masks[column_index]
+        self.moves += 1
+
+    def undo(self, column_index):
+        """ Removes the top piece of a column, played by the previous player to move """
+        column_mask = self.mask & self.__column_masks[column_index]
+
+        """ The top piece is the highest set bit of the column """
+        top_piece = 1 << (column_mask.bit_length() - 1)
+
+        self.mask ^= top_piece
+        self.current_mask ^= self.mask
+        self.moves -= 1
+
+    def get_possible_mask(self):
+        """ Returns the mask of the cells where a piece can be dropped """
+        return (self.mask + self.bottom_mask) & self.board_mask
+
+    def get_winning_mask(self, pieces_mask):
+        """
+        Returns the empty cells completing a winning sequence with the given pieces
+
+        A cell wins if, in some direction, it has a consecutive pieces on one
+        side and (length - 1 - a) on the other.
+        """
+        if self.winning_sequence_length == 4:
+            return self.__get_four_winning_mask(pieces_mask)
+
+        winning_mask = 0
+        sequence_length = self.winning_sequence_length
+
+        for shift in self.__shifts:
+            lower_runs = [-1]
+            upper_runs = [-1]
+
+            for run_length in range(1, sequence_length):
+                lower_runs.append(lower_runs[-1] & (pieces_mask << (run_length * shift)))
+                upper_runs.append(upper_runs[-1] & (pieces_mask >> (run_length * shift)))
+
+            for lower_length in range(sequence_length):
+                winning_mask |= lower_runs[lower_length] & upper_runs[sequence_length - 1 - lower_length]
+
+        return winning_mask & self.board_mask & ~self.mask
+
+    def __get_four_winning_mask(self, pieces_mask):
+        """ Unrolled get_winning_mask for the standard sequence length (4, the hot path of the solver) """
+
+        """ Vertical, only the pieces below an empty cell count """
+        winning_mask = (pieces_mask << 1) & (pieces_mask << 2) & (pieces_mask << 3)
+
+        for shift in self.__shifts[1:]:
+            lower_pair = (pieces_mask << shift) & (pieces_mask << 2 * shift)
+            winning_mask |= lower_pair & ((pieces_mask << 3 * shift) | (pieces_mask >> shift))
+
+            upper_pair = (pieces_mask >> shift) & (pieces_mask >> 2 * shift)
+            winning_mask |= upper_pair & ((pieces_mask >> 3 * shift) | (pieces_mask << shift))
+
+        return winning_mask & self.board_mask & ~self.mask
+
+    def can_win_next(self):
+        """ Checks if the player to move can win with the next piece """
+        return bool(self.get_winning_mask(self.current_mask) & self.get_possible_mask())
+
+    def get_non_losing_mask(self):
+        """
+        Returns the moves (as cells) that do not let the opponent win right away
+        (0 if every move loses)
+
+        Must not be called when the player to move can win with the next piece.
+        """
+        possible_mask = self.get_possible_mask()
+        opponent_winning_mask = self.get_winning_mask(self.current_mask ^ self.mask)
+        forced_mask = possible_mask & opponent_winning_mask
+
+        if forced_mask:
+            """ More than one opponent threat can not be blocked """
+            if forced_mask & (forced_mask - 1):
+                return 0
+
+            possible_mask = forced_mask
+
+        """ Do not play below a cell where the opponent wins """
+        return possible_mask & ~(opponent_winning_mask >> 1)
+
+    def get_move_score(self, move_mask):
+        """ Returns the number of winning cells the player to move has after playing a move """
+        return bin(self.get_winning_mask(self.current_mask | move_mask)).count("1")
+
+    def get_column_mask(self, column_index):
+        """ Returns the mask of a column """
+        return self.__column_masks[column_index]
+
+class SolverAI:
+    """
+    Implements perfect play by solving positions exactly.
+
+    Uses negamax with alpha-beta pruning, a null window search narrowing
+    the score interval (like a binary search), a transposition table,
+    non losing move pruning and threat based move ordering.
+
+    The score of a position, for the player to move, is:
+        - 0 for a draw
+        - positive if the player wins: 1 if it wins with its last piece,
+          2 if it wins with its second to last piece, ...
+        - negative if the player loses: -1 if the opponent wins with its last
+          piece, ...
+
+    Supports two players, any WINNING_SEQUENCE_LENGTH. Midgame positions of
+    the standard 7x6 board are solved in seconds, the first moves of a game
+    and bigger boards can take too long.
+    """
+
+    """ Cache of solved positions, kept between moves of the same board shape and rules """
+    __transposition_table = None
+    """ The (width, height, WINNING_SEQUENCE_LENGTH) of the cached positions """
+    __transposition_table_rules = None
+
+    """ The number of nodes searched between two checks of the stop event """
+    STOP_CHECK_INTERVAL = 4096
+    """ The nodes left until the next check of the stop event """
+    __nodes_until_stop_check = STOP_CHECK_INTERVAL
+
+    @staticmethod
+    def get_move(board, player, stop_event=None):
+        """
+        Returns the best move of the player to move
+
+        :param board: the Board to be used
+        :tparam board: Board
+
+        :param player: the player represented by the AI (the player to move)
+        :tparam player: player id value
+
+        :param stop_event: event that stops the search when set / None
+                           (checked every STOP_CHECK_INTERVAL nodes, the best of
+                           the moves solved so far is returned)
+        :tparam stop_event: threading.Event / None
+
+        :return: chosen move column / None if no move is possible
+        :rtype: nonnegative integer / None
+
+        :raises: SearchTimeoutException if the search was stopped before any move was solved
+        :raises: SolverAIException if the game does not have two players
+        """
+        position = SolverAI.__get_position(board, player)
+
+        best_column_index, best_score = None, None
+
+        for column_index in SolverAI.__get_column_order(position.width):
+            if not position.can_play(column_index):
+                continue
+
+            if SolverAI.__is_winning_move(position, column_index):
+                return column_index
+
+            position.play(column_index)
+
+            try:
+                score = -SolverAI.__solve_position(position, stop_event)
+            except SearchTimeoutException:
+                if best_column_index is None:
+                    raise
+
+                return best_column_index
+
+            position.undo(column_index)
+
+            if best_score is None or score > best_score:
+                best_column_index, best_score = column_index, score
+
+        return best_column_index
+
+    @staticmethod
+    def solve(board, player):
+        """
+        Returns the exact score of a position for the player to move
+
+        :param board: the Board to be solved
+        :tparam board: Board
+
+        :param player: the player to move
+        :tparam player: player id value
+
+        :return: the score of the position (see SolverAI)
+        :rtype: integer
+
+        :raises: SolverAIException if the game does not have two players
+        """
+        return SolverAI.__solve_position(SolverAI.__get_position(board, player))
+
+    @staticmethod
+    def clear_transposition_table():
+        """ Removes all the positions cached by previous solves """
+        if SolverAI.__transposition_table is not None:
+            SolverAI.__transposition_table.clear()
+
+    @staticmethod
+    def __get_position(board, player):
+        """ Returns the SolverPosition of a board (every piece not of the player is of the opponent) """
+        if settings["game"]["NUMBER_OF_PLAYERS"] != 2:
+            raise SolverAIException("SolverAI supports only two players")
+
+        return SolverPosition.from_board(board, player, settings["game"]["WINNING_SEQUENCE_LENGTH"])
+
+    @staticmethod
+    def __get_transposition_table(position):
+        """
+        Returns the transposition table (created on first use)
+
+        The keys only identify positions of one board shape, so the table is
+        cleared when the shape or the WINNING_SEQUENCE_LENGTH of the searched
+        position changes.
+        """
+        size = settings["ai"]["solver"]["TRANSPOSITION_TABLE_SIZE"]
+        rules = (position.width, position.height, position.winning_sequence_length)
+
+        if SolverAI.__transposition_table is None or SolverAI.__transposition_table.size != size:
+            SolverAI.__transposition_table = TranspositionTable(size)
+        elif SolverAI.__transposition_table_rules != rules:
+            SolverAI.__transposition_table.clear()
+
+        SolverAI.__transposition_table_rules = rules
+
+        return SolverAI.__transposition_table
+
+    @staticmethod
+    def __get_column_order(width):
+        """ Returns the columns in center-out order """
+        return sorted(range(width), key=lambda column_index: abs(column_index - (width - 1) / 2))
+
+    @staticmethod
+    def __is_winning_move(position, column_index):
+        """ Checks if a move of the player to move wins right away """
+        move_mask = (position.mask + (1 << (column_index * (position.height + 1)))) \
+                    & position.get_column_mask(column_index)
+
+        return bool(position.get_winning_mask(position.current_mask) & move_mask)
+
+    @staticmethod
+    def __solve_position(position, stop_event=None):
+        """ Returns the score of a position, narrowing the score interval with null window searches """
+        cells = position.width * position.height
+
+        if position.moves == cells:
+            return 0
+        if position.can_win_next():
+            return (cells + 1 - position.moves) // 2
+
+        transposition_table = SolverAI.__get_transposition_table(position)
+        column_order = SolverAI.__get_column_order(position.width)
+
+        minimum = -((cells - position.moves) // 2)
+        maximum = (cells + 1 - position.moves) // 2
+
+        while minimum < maximum:
+            if stop_event is not None and stop_event.is_set():
+                raise SearchTimeoutException
+
+            median = minimum + (maximum - minimum) // 2
+
+            if median <= 0 and minimum // 2 < median:
+                median = minimum // 2
+            elif median >= 0 and maximum // 2 > median:
+                median = maximum // 2
+
+            score = SolverAI.__negamax(position, median, median + 1, transposition_table, column_order, stop_event)
+
+            if score <= median:
+                maximum = score
+            else:
+                minimum = score
+
+        return minimum
+
+    @staticmethod
+    def __negamax(position, alpha, beta, transposition_table, column_order, stop_event=None):
+        """
+        Negamax with alpha-beta pruning
+        (the player to move can not win with its next piece)
+
+        :returns: the exact score if it is inside (alpha, beta), an upper bound
+                  if it is not above alpha, a lower bound if it is not below beta
+        :raises: SearchTimeoutException if the stop_event is set (nothing is
+                 stored for the unfinished nodes, the position is left changed)
+        """
+        if stop_event is not None:
+            SolverAI.__nodes_until_stop_check -= 1
+
+            if not SolverAI.__nodes_until_stop_check:
+                SolverAI.__nodes_until_stop_check = SolverAI.STOP_CHECK_INTERVAL
+
+                if stop_event.is_set():
+                    raise SearchTimeoutException
+
+        non_losing_mask = position.get_non_losing_mask()
+        if not non_losing_mask:
+            return -((position.width * position.height - position.moves) // 2)
+
+        cells = position.width * position.height
+        if position.moves >= cells - 2:
+            return 0
+
+        """ The opponent can not win with its next piece """
+        minimum = -((cells - 2 - position.moves) // 2)
+        if alpha < minimum:
+            alpha = minimum
+            if alpha >= beta:
+                return alpha
+
+        """ The player to move can not win with its next piece """
+        maximum = (cells - 1 - position.moves) // 2
+
+        key = position.get_key()
+        entry = transposition_table.probe(key)
+
+        if entry is not None:
+            entry_score = entry[TranspositionTable.SCORE_INDEX]
+
+            if entry[TranspositionTable.BOUND_INDEX] == TranspositionTable.UPPER_BOUND:
+                maximum = min(maximum, entry_score)
+            else:
+                if alpha < entry_score:
+                    alpha = entry_score
+                    if alpha >= beta:
+                        return alpha
+
+        if beta > maximum:
+            beta = maximum
+            if alpha >= beta:
+                return beta
+
+        moves = []
+        for column_index in column_order:
+            move_mask = non_losing_mask & position.get_column_mask(column_index)
+
+            if move_mask:
+                moves.append((position.get_move_score(move_mask), column_index))
+
+        """ Stable sort, the columns with the same score stay center-out """
+        moves.sort(key=lambda move: -move[0])
+        depth = cells - position.moves
+
+        for _, column_index in moves:
+            position.play(column_index)
+            score = -SolverAI.__negamax(position, -beta, -alpha, transposition_table, column_order, stop_event)
+            position.undo(column_index)
+
+            if score >= beta:
+                transposition_table.store(key, depth, score, TranspositionTable.LOWER_BOUND, column_index)
+                return score
+
+            if score > alpha:
+                alpha = score
+
+        transposition_table.store(key, depth, alpha, TranspositionTable.UPPER_BOUND, None)
+
+        return alpha
@@ -0,0 +1,208 @@
+from random import Random
+
+class ZobristHasher:
+    """
+    Generates Zobrist keys for the positions of a board shape.
+
+    Every (player, cell) pair gets a random 64-bit key and the hash of a position
+    is the XOR of the keys of its pieces, so dropping or removing a piece updates
+    the hash with a single XOR. The keys are generated from a fixed seed, so
+    the hashes are the same in every process.
+    """
+
+    """ The number of bits of a key """
+    KEY_BITS = 64
+
+    def __init__(self, width, height):
+        """
+        Initializes the ZobristHasher instance.
+
+        :param width: the width of the hashed boards
+        :tparam width: positive integer
+
+        :param height: the height of the hashed boards
+        :tparam height: positive integer
+        """
+        self.__width = width
+        self.__height = height
+
+        self.__piece_keys = {}
+        self.__side_keys = {}
+
+    def get_piece_key(self, row_index, column_index, player):
+        """
+        Returns the key of a player's piece placed on a given cell
+
+        :param row_index: the row of the piece
+        :tparam row_index: nonnegative integer
+
+        :param column_index: the column of the piece
+        :tparam column_index: nonnegative integer
+
+        :param player: the player that owns the piece
+        :tparam player: player id value
+
+        :rtype: nonnegative integer
+        """
+        player_keys = self.__piece_keys.get(player)
+
+        if player_keys is None:
+            random = Random("{}x{}:{}".format(self.__width, self.__height, player))
+            player_keys = [random.getrandbits(ZobristHasher.KEY_BITS)
+                           for _ in range(self.__width * self.__height)]
+
+            self.__piece_keys[player] = player_keys
+
+        return player_keys[row_index * self.__width + column_index]
+
+    def get_side_key(self, player, maximizing_player):
+        """
+        Returns the key of the search side, to be XORed with a position hash
+        (the same position is scored differently for every AI player and
+        for maximizing / minimizing nodes)
+
+        :param player: the player represented by the AI
+        :tparam player: player id value
+
+        :param maximizing_player: True if the node is a maximizing one
+        :tparam maximizing_player: bool
+
+        :rtype: nonnegative integer
+        """
+        side = (player, maximizing_player)
+        side_key = self.__side_keys.get(side)
+
+        if side_key is None:
+            side_key = Random("{}x{}:{}:{}".format(
+                self.__width, self.__height, player, maximizing_player)).getrandbits(ZobristHasher.KEY_BITS)
+
+            self.__side_keys[side] = side_key
+
+        return side_key
+
+    def hash_board(self, board):
+        """
+        Returns the hash of a board position (XOR of all its pieces keys)
+
+        :param board: the board to be hashed
+        :tparam board: Board
+
+        :rtype: nonnegative integer
+        """
+        board_hash = 0
+
+        for row_index in range(board.height):
+            for column_index in range(board.width):
+                player = int(board[row_index][column_index])
+
+                if player:
+                    board_hash ^= self.get_piece_key(row_index, column_index, player)
+
+        return board_hash
+
+class TranspositionTable:
+    """
+    Fixed size cache of searched positions, indexed by their Zobrist hash.
+
+    Every slot holds two entries (two-tier replacement):
+        - a depth-preferred entry, replaced only by searches at least as deep
+        - an always-replace entry, which takes whatever the first tier rejects
+    so the memory used never grows past the configured number of slots.
+
+    Entries are tuples (key, depth, score, bound, best move).
+    """
+
+    """ The score is the exact minimax value """
+    EXACT = 0
+    """ The score is a lower bound (the search failed high) """
+    LOWER_BOUND = 1
+    """ The score is an upper bound (the search failed low) """
+    UPPER_BOUND = 2
+
+    """ The indexes of the values in an entry tuple """
+    KEY_INDEX = 0
+    DEPTH_INDEX = 1
+    SCORE_INDEX = 2
+    BOUND_INDEX = 3
+    MOVE_INDEX = 4
+
+    def __init__(self, size):
+        """
+        Initializes the TranspositionTable instance.
+
+        :param size: the number of slots of the table (0 disables the table)
+        :tparam size: nonnegative integer
+        """
+        self.__size = size
+
+        self.__depth_preferred = [None] * size
+        self.__always_replace = [None] * size
+
+    def probe(self, key):
+        """
+        Returns the entry stored for a position / None
+
+        :param key: the hash of the position
+        :tparam key: nonnegative integer
+
+        :rtype: entry tuple / None
+        """
+        if not self.__size:
+            return None
+
+        slot_index = key % self.__size
+
+        entry = self.__depth_preferred[slot_index]
+        if entry is not None and entry[TranspositionTable.KEY_INDEX] == key:
+            return entry
+
+        entry = self.__always_replace[slot_index]
+        if entry is not None and entry[TranspositionTable.KEY_INDEX] == key:
+            return entry
+
+        return None
+
+    def store(self, key, depth, score, bound, best_move):
+        """
+        Stores the result of a search
+
+        :param key: the hash of the position
+        :tparam key: nonnegative integer
+
+        :param depth: the depth of the search
+        :tparam depth: nonnegative integer
+
+        :param score: the score found by the search
+        :tparam score: number
+
+        :param bound: the type of the score (EXACT / LOWER_BOUND / UPPER_BOUND)
+
+        :param best_move: the best move found by the search / None
+        :tparam best_move: nonnegative integer / None
+        """
+        if not self.__size:
+            return
+
+        slot_index = key % self.__size
+        entry = (key, depth, score, bound, best_move)
+
+        stored_entry = self.__depth_preferred[slot_index]
+
+        if stored_entry is None or stored_entry[TranspositionTable.KEY_INDEX] == key:
+            self.__depth_preferred[slot_index] = entry
+        elif depth >= stored_entry[TranspositionTable.DEPTH_INDEX]:
+            """ The replaced entry is demoted to the second tier """
+            self.__depth_preferred[slot_index] = entry
+            self.__always_replace[slot_index] = stored_entry
+        else:
+            self.__always_replace[slot_index] = entry
+
+    def clear(self):
+        """ Removes all the stored entries """
+        self.__depth_preferred = [None] * self.__size
+        self.__always_replace = [None] * self.__size
+
+    @property
+    def size(self):
+        """ Returns the number of slots of the TranspositionTable """
+        return self.__size
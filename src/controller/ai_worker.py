@@ -0,0 +1,84 @@
+from copy import deepcopy
+from threading import Event, Thread
+
+from src.ai.search_context import SearchTimeoutException
+
+class AIWorker:
+    """
+    Runs the get_move of an AI engine in a background thread, so that the
+    UI keeps running while the AI thinks. The controller polls is_done.
+
+    The worker can also run the ponder method of an engine, searching on the
+    time of the opponent.
+
+    A thread (not a process) is used so that the engines keep their caches
+    (e.g. the transposition tables) between the moves.
+    """
+
+    def __init__(self, ai_engine, board, player, ponder=False):
+        """
+        Initializes the AIWorker instance.
+
+        :param ai_engine: the AI engine choosing the move
+        :tparam ai_engine: class with a get_move(board, player, stop_event) method
+
+        :param board: the Board to be used (copied, the original can change meanwhile)
+        :tparam board: Board
+
+        :param player: the player represented by the AI
+        :tparam player: player id value
+
+        :param ponder: True to run ai_engine.ponder (with the opponent of player to move)
+                       instead of get_move
+        :tparam ponder: bool
+        """
+        self.__stop_event = Event()
+        self.__result = None
+        self.__exception = None
+
+        self.__thread = Thread(target=self.__run, args=(ai_engine, deepcopy(board), player, ponder), daemon=True)
+
+    def __run(self, ai_engine, board, player, ponder):
+        """ Searches the move (run by the worker thread) """
+        try:
+            if ponder:
+                ai_engine.ponder(board, player, self.__stop_event)
+            else:
+                self.__result = ai_engine.get_move(board, player, stop_event=self.__stop_event)
+        except SearchTimeoutException:
+            self.__result = None
+        except Exception as exception:
+            self.__exception = exception
+
+    def start(self):
+        """ Starts searching the move """
+        self.__thread.start()
+
+    def is_done(self):
+        """ Returns True if the search has finished (or was not started) """
+        return not self.__thread.is_alive()
+
+    def cancel(self):
+        """ Asks the engine to stop searching (is_done tells when it has stopped) """
+        self.__stop_event.set()
+
+    def is_cancelled(self):
+        """ Returns True if the search was cancelled """
+        return self.__stop_event.is_set()
+
+    def get_result(self):
+        """
+        Returns the chosen move, waiting for the search to finish
+
+        :return: chosen move column / None if the search was cancelled before finding a move
+                 (or the worker was pondering)
+        :rtype: nonnegative integer / None
+
+        :raises: the exception raised by the engine, if any
+        """
+        self.__thread.join()
+
+        if self.__exception is not None:
+            raise self.__exception
+
+        return self.__result
@@ -6,6 +6,8 @@ from src.ui.console import ConsoleUI
 from src.ui.graphical import PyGameUI
 from src.ai.random_ai import RandomAI
 from src.ai.minimax_ai import MiniMaxAI
+from src.controller.ai_worker import AIWorker
+from src.service.game_record import GameRecord
 
 from config import settings
 
@@ -30,30 +32,93 @@ class MasterController:
     Main dispatcher of the program. Connects UI, AI and Game.
     """
 
-    def __init__(self, board, game, ai_engine, ui, ai_players):
-        """ Initializes the Board, UI, AI and turn iterator """
+    def __init__(self, board, game, ai_engine, ui, ai_players, game_recorder=None):
+        """
+        Initializes the Board, UI, AI and turn iterator
+
+        :param game_recorder: the writer of the finished games / None not to record them
+        :tparam game_recorder: GameRecordWriter / None
+        """
         self.__board = board
         self.__game = game
         self.__ai_engine = ai_engine
         self.__ui = ui 
+        self.__game_recorder = game_recorder
 
         self.__ai_players = ai_players
         self.__player_turn_iterator = player_turn_sequence_generator()
 
+    def __get_ai_move(self, player):
+        """
+        Returns the move of the AI, searched in the background while the UI
+        keeps showing the board (see the display_thinking method of the UIs)
+
+        If the user cancels the search (through the UI or with Ctrl+C at any
+        point of the polling), the engine plays the best move found so far, or
+        a random valid move if it did not find one.
+        """
+        worker = AIWorker(self.__ai_engine, self.__board, player)
+        worker.start()
+
+        while not worker.is_done():
+            try:
+                while not worker.is_done():
+                    if not self.__ui.display_thinking(self.__board, player) and not worker.is_cancelled():
+                        worker.cancel()
+            except KeyboardInterrupt:
+                worker.cancel()
+
+        column_choice = worker.get_result()
+
+        if column_choice is None:
+            column_choice = choice(self.__board.get_valid_moves())
+
+        return column_choice
+
+    def __get_human_move(self, player):
+        """
+        Returns the move of a human player
+
+        If PONDER is set and the next player is an AI one with a pondering
+        engine, the AI searches the replies meanwhile (see AIWorker).
+        """
+        next_player = player % settings["game"]["NUMBER_OF_PLAYERS"] + 1
+        ponder_worker = None
+
+        if settings["game"]["PONDER"] and hasattr(self.__ai_engine, "ponder") and \
+                "PLAYER_{}".format(next_player) in self.__ai_players:
+            ponder_worker = AIWorker(self.__ai_engine, self.__board, next_player, ponder=True)
+            ponder_worker.start()
+
+        try:
+            return self.__ui.get_move(player, self.__board.get_valid_moves())
+        finally:
+            if ponder_worker is not None:
+                ponder_worker.cancel()
+                ponder_worker.get_result()
+
     def run(self):
         """ Runs the game loop """
-        while self.__game.get_winner() is None:
+        while not self.__game.is_over():
             self.__ui.draw(self.__board)
 
             current_player = next(self.__player_turn_iterator)
 
             if "PLAYER_{}".format(current_player) in self.__ai_players:
-                column_choice = self.__ai_engine.get_move(self.__board, current_player)
+                column_choice = self.__get_ai_move(current_player)
             else:
-                column_choice = self.__ui.get_move(current_player, self.__board.get_valid_moves())
+                column_choice = self.__get_human_move(current_player)
 
             self.__ui.make_move(column_choice, current_player)
             self.__game.make_move(column_choice, current_player)
 
         self.__ui.draw(self.__board)
-        self.__ui.display_winner(self.__game.get_winner())
+
+        if self.__game_recorder is not None:
+            self.__game_recorder.write(self.__board.get_move_history(),
+                                       GameRecord.DRAW if self.__game.is_draw() else self.__game.get_winner())
+
+        if self.__game.is_draw():
+            self.__ui.display_draw()
+        else:
+            self.__ui.display_winner(self.__game.get_winner())
@@ -0,0 +1,228 @@
+import numpy as np
+
+from src.domain.board import BoardFullColumnDropException, BoardEmptyUndoException
+
+class BitBoard:
+    """
+    Bitboard implementation of Connect 4 board.
+    (one integer mask per player and the height of every column)
+
+    Exposes the same interface as Board, so it can be used as a
+    drop-in replacement by Game, the AI engines and the UIs.
+
+    The cells are stored column by column, each column using (height + 1) bits.
+    The bit on top of every column is always empty (sentinel bit), so
+    shifting a mask never carries a sequence over into the next column.
+    Python integers are used for the masks, so any board size is supported.
+    """
+
+    def __init__(self, width, height):
+        """
+        Initializes the BitBoard instance.
+        (empty board contains 0 in all positions)
+
+        :param width: the width of the BitBoard
+        :tparam width: positive integer
+
+        :param height: the height of the BitBoard
+        :tparam height: positive integer
+        """
+        self.__width = width
+        self.__height = height
+        self.__column_stride = height + 1
+
+        self.__player_masks = {}
+        self.__column_heights = [0] * width
+        self.__move_stack = []
+
+        self.__cells = None
+
+    def __get_cells(self):
+        """
+        Returns the matrix representation of the BitBoard
+        (built lazily and cached until the next drop)
+
+        :rtype: read-only numpy int8 array of shape (height, width)
+        """
+        if self.__cells is None:
+            cells = np.zeros((self.__height, self.__width), dtype=np.int8)
+
+            for player, mask in self.__player_masks.items():
+                for column_index in range(self.__width):
+                    column_mask = mask >> (column_index * self.__column_stride)
+
+                    for filled_index in range(self.__column_heights[column_index]):
+                        if column_mask >> filled_index & 1:
+                            cells[self.__height - 1 - filled_index][column_index] = player
+
+            cells.setflags(write=False)
+            self.__cells = cells
+
+        return self.__cells
+
+    def __getitem__(self, row_index):
+        """
+        Returns a row of the BitBoard.
+
+        :param row_index: the index of the row to be returned
+        :tparam row_index: nonnegative integer
+
+        :returns: read-only list of player id values
+        """
+        return self.__get_cells()[row_index]
+
+    def get_view(self):
+        """
+        Returns the cells of the BitBoard
+        (the matrix cached until the next drop / removal, not a live view)
+
+        :rtype: read-only numpy int8 array of shape (height, width)
+        """
+        return self.__get_cells()
+
+    def drop_piece(self, column_index, player_id):
+        """
+        Drops a piece into the BitBoard.
+        (sets the bit above the top piece of the column in the player's mask)
+
+        :param column_index: the column where the piece should be dropped
+        :tparam column_index: nonnegative integer
+
+        :param player_id: the id of the player that dropped the piece
+        :tparam player_id: nonnegative integer
+
+        :raises: BoardFullColumnDropException on full column drop attempt
+        """
+        column_height = self.__column_heights[column_index]
+
+        if column_height == self.__height:
+            raise BoardFullColumnDropException
+
+        piece_bit = 1 << (column_index * self.__column_stride + column_height)
+        self.__player_masks[player_id] = self.__player_masks.get(player_id, 0) | piece_bit
+        self.__column_heights[column_index] = column_height + 1
+        self.__move_stack.append((column_index, player_id))
+
+        self.__cells = None
+
+    def pop_piece(self):
+        """
+        Removes the last dropped piece from the BitBoard.
+        (undoes the last drop_piece call)
+
+        :returns: the column from which the piece was removed
+        :rtype: nonnegative integer
+
+        :raises: BoardEmptyUndoException if no piece was dropped
+        """
+        if not self.__move_stack:
+            raise BoardEmptyUndoException
+
+        column_index, player_id = self.__move_stack.pop()
+        column_height = self.__column_heights[column_index] - 1
+
+        self.__player_masks[player_id] ^= 1 << (column_index * self.__column_stride + column_height)
+        self.__column_heights[column_index] = column_height
+
+        self.__cells = None
+
+        return column_index
+
+    def get_top_occupied_row_index(self, column_index):
+        """
+        Returns the index of the top occupied row on a given column
+
+        :param column_index: the column to look by
+        :tparam column_index: nonnegative integer
+
+        :returns: the index of the top occupied row
+        :rtype: positive integer
+        """
+        return self.__height - self.__column_heights[column_index]
+
+    def get_column_height(self, column_index):
+        """
+        Returns the number of pieces in a given column
+
+        :param column_index: the column to look by
+        :tparam column_index: nonnegative integer
+
+        :rtype: nonnegative integer
+        """
+        return self.__column_heights[column_index]
+
+    def get_move_history(self):
+        """
+        Returns the columns of the dropped pieces, in the order they were dropped
+
+        :rtype: tuple of nonnegative integers
+        """
+        return tuple(column_index for column_index, _ in self.__move_stack)
+
+    def is_valid_move(self, column_index):
+        """
+        Checks if a piece can be dropped in a given column
+        (checks if the column is full)
+
+        :param column_index: the column to look into
+        :tparam column_index: nonnegative integer
+        """
+        return self.__column_heights[column_index] < self.__height
+
+    def get_valid_moves(self):
+        """
+        Returns the valid moves
+
+        :rtype: tuple of nonnegative integers
+        """
+        return tuple(column_index for column_index in range(self.__width)
+                     if self.__column_heights[column_index] < self.__height)
+
+    @property
+    def playable_columns(self):
+        """ Returns the bitmask of the columns that are not full (bit i for column i) """
+        return sum(1 << column_index for column_index in range(self.__width)
+                   if self.__column_heights[column_index] < self.__height)
+
+    def is_player_winning(self, player, winning_sequence_length):
+        """
+        Checks if the given player has a winning sequence on the BitBoard.
+
+        For every direction, the player's mask is repeatedly ANDed with itself
+        shifted by the direction step, so that after (length - 1) steps only the
+        bits starting a full sequence remain set.
+
+        :param player: the player to be checked as the winner
+        :tparam player: player id value
+
+        :param winning_sequence_length: the length of a winning sequence
+        :tparam winning_sequence_length: positive integer
+
+        :returns: True if the given player wins, False otherwise
+        """
+        mask = self.__player_masks.get(player, 0)
+
+        """ Vertical, horizontal, positive slope, negative slope """
+        for shift in (1, self.__column_stride, self.__column_stride + 1, self.__column_stride - 1):
+            sequence_mask = mask
+
+            for _ in range(winning_sequence_length - 1):
+                sequence_mask &= sequence_mask >> shift
+
+                if not sequence_mask:
+                    break
+
+            if sequence_mask:
+                return True
+
+        return False
+
+    @property
+    def height(self):
+        """ Returns the height of the BitBoard """
+        return self.__height
+
+    @property
+    def width(self):
+        """ Returns the width of the BitBoard """
+        return self.__width
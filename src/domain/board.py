@@ -11,10 +11,21 @@ class BoardFullColumnDropException(BoardException):
     """
     pass
 
-class Board:
+class BoardEmptyUndoException(BoardException):
+    """
+    Exception raised by Board when a piece removal is attempted
+    and no piece was dropped
     """
+    pass
+
+class Board:
+    """ 
     Basic implementation of Connect 4 board. 
     (matrix of pieces, with the ability to "drop" pieces into a column)
+
+    The pieces are stored as int8 cells. The height of every column, the
+    playable columns and the dropped pieces are tracked, so dropping / removing
+    a piece and looking up the top row or the valid moves do not scan the board.
     """
 
     def __init__(self, width, height):
@@ -30,7 +41,31 @@ class Board:
 
         :tparam: value from piece_types dict
         """
-        self.__board = np.zeros((height, width))
+        self.__board = np.zeros((height, width), dtype=np.int8)
+        self.__heights = [0] * width
+        self.__move_stack = []
+
+        self.__playable_columns = (1 << width) - 1
+        self.__valid_moves = tuple(range(width))
+
+        self.__create_view()
+
+    def __create_view(self):
+        """ Creates the read-only view of the cells """
+        self.__view = self.__board.view()
+        self.__view.setflags(write=False)
+
+    def __getstate__(self):
+        """ Returns the state to be copied / pickled (without the view, it would be copied apart from the cells) """
+        state = self.__dict__.copy()
+        del state["_Board__view"]
+
+        return state
+
+    def __setstate__(self, state):
+        """ Restores a copied / pickled Board, recreating the view of its cells """
+        self.__dict__.update(state)
+        self.__create_view()
 
     def __getitem__(self, row_index):
         """
@@ -39,9 +74,18 @@ class Board:
         :param row_index: the index of the row to be returned
         :tparam row_index: nonnegative integer
 
-        :returns: list of values from piece_types dict
+        :returns: read-only list of values from piece_types dict
+        """
+        return self.__view[row_index]
+
+    def get_view(self):
+        """
+        Returns the cells of the Board, without copying them
+        (the view follows the changes of the Board and can not be written)
+
+        :rtype: read-only numpy int8 array of shape (height, width)
         """
-        return self.__board[row_index]
+        return self.__view
 
     def drop_piece(self, column_index, player_id):
         """
@@ -56,13 +100,45 @@ class Board:
 
         :raises: BoardFullColumnDropException on full column drop attempt
         """
-        for row_index in range(self.__board.shape[0] - 1, -1, -1):
-            if self.__board[row_index][column_index] == 0:
-                self.__board[row_index][column_index] = player_id
+        column_height = self.__heights[column_index]
+        board_height = self.__board.shape[0]
+
+        if column_height == board_height:
+            raise BoardFullColumnDropException
+
+        self.__board[board_height - 1 - column_height, column_index] = player_id
+        self.__heights[column_index] = column_height + 1
+        self.__move_stack.append(column_index)
 
-                return
+        if column_height + 1 == board_height:
+            self.__playable_columns &= ~(1 << column_index)
+            self.__valid_moves = None
+
+    def pop_piece(self):
+        """
+        Removes the last dropped piece from the Board.
+        (undoes the last drop_piece call)
 
-        raise BoardFullColumnDropException
+        :returns: the column from which the piece was removed
+        :rtype: nonnegative integer
+
+        :raises: BoardEmptyUndoException if no piece was dropped
+        """
+        if not self.__move_stack:
+            raise BoardEmptyUndoException
+
+        column_index = self.__move_stack.pop()
+        board_height = self.__board.shape[0]
+
+        column_height = self.__heights[column_index] - 1
+        self.__heights[column_index] = column_height
+        self.__board[board_height - 1 - column_height, column_index] = 0
+
+        if column_height + 1 == board_height:
+            self.__playable_columns |= 1 << column_index
+            self.__valid_moves = None
+
+        return column_index
 
     def get_top_occupied_row_index(self, column_index):
         """
@@ -74,11 +150,26 @@ class Board:
         :returns: the index of the top occupied row
         :rtype: positive integer
         """
-        for row_index in range(0, self.__board.shape[0]):
-            if self.__board[row_index][column_index] != 0:
-                return row_index
+        return self.__board.shape[0] - self.__heights[column_index]
 
-        return self.__board.shape[0]
+    def get_column_height(self, column_index):
+        """
+        Returns the number of pieces in a given column
+
+        :param column_index: the column to look by
+        :tparam column_index: nonnegative integer
+
+        :rtype: nonnegative integer
+        """
+        return self.__heights[column_index]
+
+    def get_move_history(self):
+        """
+        Returns the columns of the dropped pieces, in the order they were dropped
+
+        :rtype: tuple of nonnegative integers
+        """
+        return tuple(self.__move_stack)
 
     def is_valid_move(self, column_index):
         """ 
@@ -88,15 +179,26 @@ class Board:
         :param column_index: the column to look into
         :tparam column_index: nonnegative integer
         """
-        return self.__board[0][column_index] == 0 
+        return self.__heights[column_index] < self.__board.shape[0]
 
     def get_valid_moves(self):
         """
-        Returns the list of valid moves
+        Returns the valid moves
+        (cached, rebuilt only after a column was filled / emptied, the tuple
+        itself is returned and not copied)
 
-        :rtype: list of nonnegative integers
+        :rtype: tuple of nonnegative integers
         """
-        return list(filter(self.is_valid_move, range(self.__board.shape[1])))
+        if self.__valid_moves is None:
+            self.__valid_moves = tuple(column_index for column_index in range(self.__board.shape[1])
+                                       if self.__playable_columns >> column_index & 1)
+
+        return self.__valid_moves
+
+    @property
+    def playable_columns(self):
+        """ Returns the bitmask of the columns that are not full (bit i for column i) """
+        return self.__playable_columns
 
     @property
     def height(self):
@@ -0,0 +1,203 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.domain.board import BoardFullColumnDropException
+
+class VectorBoard:
+    """
+    Many games played at once, for statistics and data generation.
+
+    The games are stored as one (N, height, width) int8 array of cells (row 0
+    is the top one, like in Board) and one (N, width) array of column heights.
+    Every step drops one piece in every game (each game has its own player to
+    move, the players taking turns), checks only the lines through the dropped
+    pieces and starts a new game in place of every finished one.
+
+    Public attributes:
+        - cells: the (N, height, width) pieces
+        - heights: the (N, width) number of pieces of every column
+        - players: the (N,) players to move
+        - move_counts: the (N,) number of pieces of every game
+        - wins: the number of finished games won by every player (indexed by player id)
+        - draws: the number of finished games without a winner
+    """
+
+    """ The lines checked for wins, as (row step, column step) """
+    DIRECTIONS = ((1, 0), (0, 1), (1, 1), (1, -1))
+
+    def __init__(self, number_of_games, width, height, winning_sequence_length, number_of_players=2):
+        """
+        Initializes the VectorBoard instance (all the games empty, player 1 to move).
+
+        :param number_of_games: the number of games played at once (N)
+        :tparam number_of_games: positive integer
+
+        :param width: the width of the boards
+        :tparam width: positive integer
+
+        :param height: the height of the boards
+        :tparam height: positive integer
+
+        :param winning_sequence_length: the number of pieces in a row that win a game
+        :tparam winning_sequence_length: positive integer
+
+        :param number_of_players: the number of players of every game
+        :tparam number_of_players: positive integer
+        """
+        self.number_of_games = number_of_games
+        self.width = width
+        self.height = height
+        self.winning_sequence_length = winning_sequence_length
+        self.number_of_players = number_of_players
+
+        self.cells = np.zeros((number_of_games, height, width), dtype=np.int8)
+        self.heights = np.zeros((number_of_games, width), dtype=np.int16)
+        self.players = np.ones(number_of_games, dtype=np.int8)
+        self.move_counts = np.zeros(number_of_games, dtype=np.int32)
+
+        self.wins = np.zeros(number_of_players + 1, dtype=np.int64)
+        self.draws = 0
+
+        self.__game_indices = np.arange(number_of_games)
+        """ The distances from a dropped piece of the cells that can share a winning line with it """
+        self.__line_offsets = np.arange(-(winning_sequence_length - 1), winning_sequence_length)
+
+    def reset(self, games=None):
+        """
+        Empties games (player 1 to move)
+
+        :param games: the games to be emptied / None for all of them
+        :tparam games: (N,) boolean array / array of game indices / None
+        """
+        if games is None:
+            games = slice(None)
+
+        self.cells[games] = 0
+        self.heights[games] = 0
+        self.players[games] = 1
+        self.move_counts[games] = 0
+
+    def get_valid_moves(self):
+        """ Returns the (N, width) boolean array of the columns that are not full """
+        return self.heights < self.height
+
+    def step(self, columns):
+        """
+        Drops a piece of the player to move in every game, then starts a new
+        game in place of every finished one
+
+        :param columns: the column chosen in every game
+        :tparam columns: (N,) array of nonnegative integers
+
+        :returns: tuple (winners, draws): the (N,) array of the players that won
+                  with this step (0 where no one did) and the (N,) boolean array
+                  of the games that ended with a draw
+        :raises: BoardFullColumnDropException if a chosen column is full
+        """
+        columns = np.asarray(columns, dtype=np.intp)
+        games = self.__game_indices
+
+        column_heights = self.heights[games, columns]
+        if (column_heights >= self.height).any():
+            raise BoardFullColumnDropException
+
+        rows = self.height - 1 - column_heights
+        players = self.players
+
+        self.cells[games, rows, columns] = players
+        self.heights[games, columns] += 1
+        self.move_counts += 1
+
+        is_winning = self.__is_winning_drop(rows, columns, players)
+        winners = np.where(is_winning, players, 0).astype(np.int8)
+        draws = ~is_winning & (self.move_counts == self.width * self.height)
+
+        self.players = (players % self.number_of_players + 1).astype(np.int8)
+
+        is_finished = is_winning | draws
+
+        if is_finished.any():
+            self.wins += np.bincount(winners[is_winning], minlength=self.number_of_players + 1)
+            self.draws += int(draws.sum())
+
+            self.reset(is_finished)
+
+        return winners, draws
+
+    def get_winning_moves(self):
+        """ Returns the (N, width) boolean array of the columns where the player to move wins right away """
+        games = self.__game_indices
+        winning_moves = np.zeros((self.number_of_games, self.width), dtype=bool)
+
+        for column_index in range(self.width):
+            playable_games = games[self.heights[:, column_index] < self.height]
+            columns = np.full(len(playable_games), column_index)
+            rows = self.height - 1 - self.heights[playable_games, column_index]
+            players = self.players[playable_games]
+
+            """ The piece is dropped only for the check """
+            self.cells[playable_games, rows, column_index] = players
+            winning_moves[playable_games, column_index] = \
+                    self.__is_winning_drop(rows, columns, players, playable_games)
+            self.cells[playable_games, rows, column_index] = 0
+
+        return winning_moves
+
+    def get_random_moves(self, random_generator):
+        """
+        Returns a random valid column for every game
+
+        :param random_generator: the source of randomness
+        :tparam random_generator: numpy.random.Generator
+
+        :rtype: (N,) array of nonnegative integers
+        """
+        scores = random_generator.random((self.number_of_games, self.width))
+        scores[~self.get_valid_moves()] = -1
+
+        return scores.argmax(axis=1)
+
+    def get_greedy_moves(self, random_generator):
+        """
+        Returns, for every game, a winning column if there is one, a random valid column otherwise
+
+        :param random_generator: the source of randomness
+        :tparam random_generator: numpy.random.Generator
+
+        :rtype: (N,) array of nonnegative integers
+        """
+        scores = random_generator.random((self.number_of_games, self.width))
+        scores[~self.get_valid_moves()] = -1
+        scores[self.get_winning_moves()] += 2
+
+        return scores.argmax(axis=1)
+
+    def __is_winning_drop(self, rows, columns, players, games=None):
+        """
+        Checks if the pieces at the given cells are part of winning lines
+        (only the cells that can share a line with them are looked at)
+
+        :param games: the games of the cells / None for all the games
+        :returns: boolean array, True where the piece wins the game
+        """
+        if games is None:
+            games = self.__game_indices
+
+        offsets = self.__line_offsets
+        is_winning = np.zeros(len(games), dtype=bool)
+
+        for row_step, column_step in VectorBoard.DIRECTIONS:
+            line_rows = rows[:, np.newaxis] + offsets * row_step
+            line_columns = columns[:, np.newaxis] + offsets * column_step
+
+            is_inside = (line_rows >= 0) & (line_rows < self.height) & \
+                        (line_columns >= 0) & (line_columns < self.width)
+
+            line = self.cells[games[:, np.newaxis],
+                              np.clip(line_rows, 0, self.height - 1),
+                              np.clip(line_columns, 0, self.width - 1)] == players[:, np.newaxis]
+            line &= is_inside
+
+            is_winning |= sliding_window_view(line, self.winning_sequence_length, axis=1).all(axis=2).any(axis=1)
+
+        return is_winning
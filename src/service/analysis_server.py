@@ -0,0 +1,361 @@
+import asyncio
+import json
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
+from time import perf_counter
+
+from src.domain.board import Board
+from src.ai.minimax_ai import MiniMaxAI
+from src.service.game_state_analyzer import GameStateAnalyzer
+from config import settings
+
+class AnalysisServerException(Exception):
+    """ General exception raised by the analysis server """
+    pass
+
+class InvalidRequestException(AnalysisServerException):
+    """ Raised when an analysis request is malformed or its position can not be analyzed """
+    pass
+
+def parse_moves(moves, width):
+    """
+    Returns the columns of a move string
+
+    The moves are 1-based column numbers: one digit per move ("4453") on
+    boards of at most 9 columns, comma separated ("10,11,10") otherwise.
+
+    :raises: InvalidRequestException if the string is malformed
+    """
+    if not isinstance(moves, str):
+        raise InvalidRequestException("moves must be a string")
+
+    if not moves:
+        return []
+
+    tokens = moves.split(",") if width > 9 or "," in moves else list(moves)
+
+    """ Only ASCII digits, str.isdigit also accepts digits int does not parse (e.g. "²") """
+    if not all(re.fullmatch(r"[0-9]+", token.strip()) for token in tokens):
+        raise InvalidRequestException("Invalid moves {}".format(moves))
+
+    return [int(token) - 1 for token in tokens]
+
+def format_moves(columns, width):
+    """ Returns the move string of columns (the inverse of parse_moves) """
+    separator = "," if width > 9 else ""
+
+    return separator.join(str(column_index + 1) for column_index in columns)
+
+def get_board(columns):
+    """
+    Returns the configured board with the given moves played (the players
+    taking turns, starting with player 1) and the player to move
+
+    :raises: InvalidRequestException if a move is not valid or the game is over
+    """
+    board = Board(settings["game"]["BOARD_WIDTH"], settings["game"]["BOARD_HEIGHT"])
+    number_of_players = settings["game"]["NUMBER_OF_PLAYERS"]
+
+    for move_index, column_index in enumerate(columns):
+        player = move_index % number_of_players + 1
+
+        if not 0 <= column_index < board.width or not board.is_valid_move(column_index):
+            raise InvalidRequestException("Invalid move {} (move {})".format(column_index + 1, move_index + 1))
+
+        board.drop_piece(column_index, player)
+
+        if GameStateAnalyzer.is_winning_move(board, board.get_top_occupied_row_index(column_index),
+                                             column_index, player):
+            raise InvalidRequestException("The game ended at move {}".format(move_index + 1))
+
+    if not board.get_valid_moves():
+        raise InvalidRequestException("The game is over")
+
+    return board, len(columns) % number_of_players + 1
+
+def initialize_worker():
+    """ Prepares a worker process (its searches run in that process only) """
+    settings["ai"]["minimax"]["WORKERS"] = 1
+
+def analyze_position(columns, depth, move_time):
+    """
+    Analyzes a position (run by the worker processes, whose MiniMaxAI caches
+    stay warm between the requests)
+
+    :returns: dict with the best_move, score, pv (1-based columns) and the searched depth
+    """
+    board, player = get_board(columns)
+    column_index, score, principal_variation, depth = MiniMaxAI.analyze(board, player, depth, move_time)
+
+    return {
+        "best_move": column_index + 1,
+        "score": score,
+        "pv": format_moves(principal_variation, board.width),
+        "depth": depth,
+    }
+
+class FairQueue:
+    """
+    Queue of the requests of many clients, served round robin across the
+    clients (a client sending many requests does not delay the others)
+    """
+
+    def __init__(self):
+        self.__queues = {}
+        self.__clients = deque()
+        self.__available = asyncio.Semaphore(0)
+
+    def put(self, client, item):
+        """ Adds an item to the queue of a client """
+        if client not in self.__queues:
+            self.__queues[client] = deque()
+            self.__clients.append(client)
+
+        self.__queues[client].append(item)
+        self.__available.release()
+
+    async def get(self):
+        """ Removes and returns the first item of the next client with items (waits for one) """
+        await self.__available.acquire()
+
+        client = self.__clients.popleft()
+        queue = self.__queues[client]
+        item = queue.popleft()
+
+        if queue:
+            self.__clients.append(client)
+        else:
+            del self.__queues[client]
+
+        return item
+
+    def get_pending_count(self, client):
+        """ Returns the number of queued items of a client """
+        return len(self.__queues.get(client, ()))
+
+    def __len__(self):
+        """ Returns the number of queued items """
+        return sum(len(queue) for queue in self.__queues.values())
+
+class AnalysisServer:
+    """
+    Analyzes positions for clients connected to a local TCP / Unix socket.
+
+    Every line sent by a client is a JSON request:
+        {"id": any, "moves": "4453", "depth": 8} or {"id": any, "moves": "4453", "move_time_ms": 500}
+    (no depth / move_time_ms: the configured DEPTH). Every request gets one
+    JSON line in response, in the order the analyses finish:
+        {"id": any, "best_move": 3, "score": 11, "pv": "3344", "depth": 8, "elapsed_ms": 12.5}
+        or {"id": any, "error": "message"}
+
+    The searches run in a pool of worker processes started with the server,
+    so the engine imports and caches stay warm between requests. The requests
+    wait in a FairQueue, so the clients get the workers in turns.
+    """
+
+    """ The longest request line in bytes, a longer one is answered by an error and closes the connection """
+    MAX_REQUEST_SIZE = 1 << 16
+
+    def __init__(self, workers, max_pending_requests, max_depth, max_move_time):
+        """
+        Initializes the AnalysisServer instance.
+
+        :param workers: the number of worker processes (the analyses run at once)
+        :tparam workers: positive integer
+
+        :param max_pending_requests: the most requests a client can have waiting
+        :tparam max_pending_requests: positive integer
+
+        :param max_depth: the largest depth a request can ask for
+        :tparam max_depth: positive integer
+
+        :param max_move_time: the largest move_time_ms a request can ask for
+        :tparam max_move_time: positive number
+        """
+        self.__workers = workers
+        self.__max_pending_requests = max_pending_requests
+        self.__max_depth = max_depth
+        self.__max_move_time = max_move_time
+
+        self.__executor = None
+        self.__server = None
+        self.__queue = None
+        self.__dispatchers = []
+        self.__client_ids = count()
+
+    async def start(self, host=None, port=None, unix_socket=None):
+        """
+        Starts the worker processes and listens on a TCP (host, port) or Unix socket
+
+        :returns: the listening socket address (e.g. the (host, port) tuple)
+        """
+        loop = asyncio.get_running_loop()
+
+        self.__executor = ProcessPoolExecutor(self.__workers, initializer=initialize_worker)
+        self.__queue = FairQueue()
+
+        """ Starts (and warms up) every worker before the first request """
+        await asyncio.gather(*(loop.run_in_executor(self.__executor, analyze_position, [], 1, None)
+                               for _ in range(self.__workers)))
+
+        self.__dispatchers = [asyncio.create_task(self.__dispatch()) for _ in range(self.__workers)]
+
+        if unix_socket is not None:
+            self.__server = await asyncio.start_unix_server(self.__handle_client, unix_socket,
+                                                            limit=AnalysisServer.MAX_REQUEST_SIZE)
+        else:
+            self.__server = await asyncio.start_server(self.__handle_client, host, port,
+                                                       limit=AnalysisServer.MAX_REQUEST_SIZE)
+
+        return self.__server.sockets[0].getsockname()
+
+    async def serve_forever(self):
+        """ Serves the clients until cancelled """
+        await self.__server.serve_forever()
+
+    async def close(self):
+        """ Stops listening and shuts the workers down """
+        self.__server.close()
+        await self.__server.wait_closed()
+
+        for dispatcher in self.__dispatchers:
+            dispatcher.cancel()
+
+        await asyncio.gather(*self.__dispatchers, return_exceptions=True)
+        self.__executor.shutdown(cancel_futures=True)
+
+    async def __dispatch(self):
+        """ Runs the queued analyses on a worker process, one at a time """
+        loop = asyncio.get_running_loop()
+
+        while True:
+            columns, depth, move_time, future = await self.__queue.get()
+
+            """ The client disconnected """
+            if future.cancelled():
+                continue
+
+            try:
+                result = await loop.run_in_executor(self.__executor, analyze_position, columns, depth, move_time)
+            except Exception as exception:
+                if not future.done():
+                    future.set_exception(exception)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+    @staticmethod
+    def __decode_request(line):
+        """
+        Returns the request object of a line
+
+        :raises: InvalidRequestException if the line is not a JSON object
+        """
+        try:
+            request = json.loads(line)
+        except ValueError:
+            raise InvalidRequestException("The request is not valid JSON")
+
+        if not isinstance(request, dict):
+            raise InvalidRequestException("The request is not a JSON object")
+
+        return request
+
+    def __parse_request(self, request):
+        """
+        Returns the (columns, depth, move_time) of a request
+
+        :raises: InvalidRequestException if the request is not valid
+        """
+        columns = parse_moves(request.get("moves", ""), settings["game"]["BOARD_WIDTH"])
+        depth = request.get("depth")
+        move_time = request.get("move_time_ms")
+
+        """ bool is an int subclass, JSON true / false are not numbers """
+        if depth is not None and (not isinstance(depth, int) or isinstance(depth, bool) or
+                                  not 0 < depth <= self.__max_depth):
+            raise InvalidRequestException("depth must be an integer in [1, {}]".format(self.__max_depth))
+
+        if move_time is not None and (not isinstance(move_time, (int, float)) or isinstance(move_time, bool) or
+                                      not 0 < move_time <= self.__max_move_time):
+            raise InvalidRequestException("move_time_ms must be a number in (0, {}]".format(self.__max_move_time))
+
+        """ Rejected here, so that invalid positions do not wait for a worker """
+        get_board(columns)
+
+        return columns, depth, move_time
+
+    async def __handle_client(self, reader, writer):
+        """ Reads the requests of a client, answering each one when its analysis finishes """
+        client_id = next(self.__client_ids)
+        write_lock = asyncio.Lock()
+        responses = set()
+        pending_futures = set()
+
+        async def send(response):
+            async with write_lock:
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+
+        async def respond(request_id, future, start_time):
+            try:
+                response = await future
+            except asyncio.CancelledError:
+                return
+            except Exception as exception:
+                response = {"error": str(exception)}
+            else:
+                response = dict(response, elapsed_ms=(perf_counter() - start_time) * 1000)
+            finally:
+                pending_futures.discard(future)
+
+            await send(dict(response, id=request_id))
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    """ Past MAX_REQUEST_SIZE, the rest of the stream can not be split into requests """
+                    await send({"id": None, "error": "The request is longer than {} bytes".format(
+                        AnalysisServer.MAX_REQUEST_SIZE)})
+                    break
+
+                if not line:
+                    break
+
+                request_id = None
+
+                try:
+                    if not line.strip():
+                        continue
+
+                    request = AnalysisServer.__decode_request(line)
+                    request_id = request.get("id")
+                    columns, depth, move_time = self.__parse_request(request)
+
+                    if len(pending_futures) >= self.__max_pending_requests:
+                        raise InvalidRequestException("Too many pending requests")
+                except InvalidRequestException as exception:
+                    await send({"id": request_id, "error": str(exception)})
+                    continue
+
+                future = asyncio.get_running_loop().create_future()
+                pending_futures.add(future)
+                self.__queue.put(client_id, (columns, depth, move_time, future))
+
+                response = asyncio.create_task(respond(request_id, future, perf_counter()))
+                responses.add(response)
+                response.add_done_callback(responses.discard)
+
+            """ The client stopped sending (or sent a too long request), its queued requests are still answered """
+            await asyncio.gather(*responses, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            for future in list(pending_futures):
+                future.cancel()
+
+            writer.close()
@@ -10,7 +10,7 @@ class GameException(Exception):
 class GameAlreadyEndedException(GameException):
     """ 
     Raised by Game when a move is attempted after a 
-    winner is already chosen
+    winner is already chosen or the game ended in a draw
     """
     pass
 
@@ -26,6 +26,7 @@ class Game:
         """
         self.__board = board
         self.__winner = None
+        self.__is_draw = False
 
     def make_move(self, column_index, player):
         """ 
@@ -37,16 +38,27 @@ class Game:
         :param player: the player that makes the move
         :tparam player: player id value
 
-        :raises: GameAlreadyEndedException if a winner was already determined
+        :raises: GameAlreadyEndedException if the game has already ended
         :raises: BoardFullColumnDropException if column is already chosen
         """
-        if self.__winner:
+        if self.is_over():
             raise GameAlreadyEndedException
 
         self.__board.drop_piece(column_index, player)
-        self.__winner = player if GameStateAnalyzer.is_player_winning(self.__board, player)  \
+        row_index = self.__board.get_top_occupied_row_index(column_index)
+
+        self.__winner = player if GameStateAnalyzer.is_winning_move(self.__board, row_index, column_index, player) \
                         else None
+        self.__is_draw = self.__winner is None and not self.__board.get_valid_moves()
 
     def get_winner(self):
         """ Returns the winner of the game / None """
         return self.__winner
+
+    def is_draw(self):
+        """ Returns True if the board was filled without a winner """
+        return self.__is_draw
+
+    def is_over(self):
+        """ Returns True if the game has a winner or ended in a draw """
+        return self.__winner is not None or self.__is_draw
@@ -0,0 +1,518 @@
+import asyncio
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
+from random import choice
+from time import perf_counter
+
+from src.domain.board import Board
+from src.service.game import Game
+from src.service.analysis_server import initialize_worker, format_moves
+from config import settings
+
+class GameHostException(Exception):
+    """ General exception raised by the game host """
+    pass
+
+class SessionNotFoundException(GameHostException):
+    """ Raised when a request names a session that does not exist (or was closed) """
+    pass
+
+class InvalidMoveException(GameHostException):
+    """ Raised when a move is not valid (not the turn of a human, full column, game over) """
+    pass
+
+class HostOverloadedException(GameHostException):
+    """ Raised when a request is rejected because the host is at capacity (it can be retried later) """
+    pass
+
+""" The engines of the worker process by specification (keeping their transposition tables between moves) """
+worker_engine_specs = {}
+
+def get_ai_move(engine_spec, moves, number_of_players, player):
+    """
+    Returns the move of an engine in a game (run by the worker processes of the GameHost)
+
+    :param engine_spec: the engine making the move
+    :tparam engine_spec: EngineSpec
+
+    :param moves: the columns played so far, the players taking turns starting with player 1
+    :tparam moves: tuple of nonnegative integers
+
+    :param number_of_players: the number of players of the game
+    :tparam number_of_players: positive integer
+
+    :param player: the player to move
+    :tparam player: player id value
+
+    :rtype: nonnegative integer / None
+    """
+    board = Board(settings["game"]["BOARD_WIDTH"], settings["game"]["BOARD_HEIGHT"])
+
+    for move_index, column_index in enumerate(moves):
+        board.drop_piece(column_index, move_index % number_of_players + 1)
+
+    """ The EngineSpec is copied without its transposition table, the one of the worker is kept """
+    engine_spec = worker_engine_specs.setdefault(str(engine_spec), engine_spec)
+
+    return engine_spec.get_move(board, player)
+
+class GameSession:
+    """ A game hosted by the GameHost """
+
+    def __init__(self, session_id, client_id, ai_players, move_timeout):
+        """
+        Initializes the GameSession instance (an empty board, player 1 to move).
+
+        :param session_id: the id of the session
+        :tparam session_id: nonnegative integer
+
+        :param client_id: the connection that created the session / None
+        :tparam client_id: nonnegative integer / None
+
+        :param ai_players: the players the engine moves for
+        :tparam ai_players: set of player id values
+
+        :param move_timeout: the time an AI move can take (waiting included), in seconds
+        :tparam move_timeout: positive number
+        """
+        self.session_id = session_id
+        self.client_id = client_id
+        self.ai_players = ai_players
+        self.move_timeout = move_timeout
+
+        self.number_of_players = settings["game"]["NUMBER_OF_PLAYERS"]
+        self.board = Board(settings["game"]["BOARD_WIDTH"], settings["game"]["BOARD_HEIGHT"])
+        self.game = Game(self.board)
+        self.player = 1
+        self.is_closed = False
+
+    def make_move(self, column_index):
+        """ Makes the move of the player to move and passes the turn """
+        self.game.make_move(column_index, self.player)
+        self.player = self.player % self.number_of_players + 1
+
+    def is_ai_turn(self):
+        """ Checks if the engine moves next """
+        return not self.game.is_over() and self.player in self.ai_players
+
+    def get_state(self):
+        """
+        Returns the state of the session
+
+        :returns: dict with the session id, the moves (1-based columns), the player
+                  to move (None once the game is over), the winner and is_draw
+        """
+        return {
+            "session": self.session_id,
+            "moves": format_moves(self.board.get_move_history(), self.board.width),
+            "to_move": None if self.game.is_over() else self.player,
+            "winner": self.game.get_winner(),
+            "is_draw": self.game.is_draw(),
+        }
+
+class GameHost:
+    """
+    Hosts many games at once in one asyncio event loop.
+
+    The humans send their moves, the AI moves are searched by a bounded pool
+    of worker processes running the get_move of one engine (an EngineSpec).
+    Every AI turn waits in one queue of at most max_queued_ai_moves turns.
+    The host applies back-pressure by rejecting the moves and new sessions
+    that would start an AI turn while the queue is full
+    (HostOverloadedException), so the waits stay bounded.
+
+    Every session has a deadline for its AI moves (move_timeout, counted from
+    when the turn is queued). When it passes, a random valid move is played
+    instead. A turn whose deadline passed while waiting is not searched at all.
+
+    Clients connect to a local TCP / Unix socket and send JSON lines:
+        {"id": any, "op": "new", "ai_players": [2], "move_timeout_ms": 500}
+        {"id": any, "op": "move", "session": 0, "column": 4}
+        {"id": any, "op": "close", "session": 0}
+        {"id": any, "op": "metrics"}
+    The columns are 1-based. "new" and "move" are answered once the AI turns
+    that follow were played, with the state of the session (see
+    GameSession.get_state), "metrics" with get_metrics. Errors are answered
+    with {"id": any, "error": "message"}. The requests of a connection are
+    handled concurrently (at most max_pending_requests at once, then the
+    connection is not read until one finishes). The sessions of a connection
+    are closed when it disconnects.
+    """
+
+    def __init__(self, engine_spec, workers, max_sessions, max_queued_ai_moves, move_timeout,
+                 max_move_timeout, max_pending_requests, latency_samples):
+        """
+        Initializes the GameHost instance.
+
+        :param engine_spec: the engine making the AI moves
+        :tparam engine_spec: EngineSpec
+
+        :param workers: the number of worker processes (the AI moves searched at once)
+        :tparam workers: positive integer
+
+        :param max_sessions: the most sessions open at once
+        :tparam max_sessions: positive integer
+
+        :param max_queued_ai_moves: the most AI turns waiting for a worker
+        :tparam max_queued_ai_moves: positive integer
+
+        :param move_timeout: the default AI move deadline of the sessions, in seconds
+        :tparam move_timeout: positive number
+
+        :param max_move_timeout: the largest AI move deadline a session can ask for, in seconds
+        :tparam max_move_timeout: positive number
+
+        :param max_pending_requests: the most requests of a connection handled at once
+        :tparam max_pending_requests: positive integer
+
+        :param latency_samples: the number of latest AI move latencies the metrics are computed from
+        :tparam latency_samples: positive integer
+        """
+        self.__engine_spec = engine_spec
+        self.__workers = workers
+        self.__max_sessions = max_sessions
+        self.__move_timeout = move_timeout
+        self.__max_move_timeout = max_move_timeout
+        self.__max_pending_requests = max_pending_requests
+
+        self.__sessions = {}
+        self.__session_ids = count()
+        self.__client_ids = count()
+
+        self.__executor = None
+        self.__server = None
+        self.__queue = asyncio.Queue(max_queued_ai_moves)
+        self.__dispatchers = []
+
+        self.__running_ai_moves = 0
+        self.__move_latencies = deque(maxlen=latency_samples)
+        self.__counters = {
+            "ai_moves": 0,
+            "human_moves": 0,
+            "timed_out_ai_moves": 0,
+            "failed_ai_moves": 0,
+            "rejected_requests": 0,
+        }
+
+    async def start(self):
+        """ Starts the worker processes """
+        loop = asyncio.get_running_loop()
+
+        self.__executor = ProcessPoolExecutor(self.__workers, initializer=initialize_worker)
+
+        """ No search, an engine may take long on the empty board (e.g. SolverAI) """
+        await asyncio.gather(*(loop.run_in_executor(self.__executor, initialize_worker)
+                               for _ in range(self.__workers)))
+
+        self.__dispatchers = [asyncio.create_task(self.__dispatch()) for _ in range(self.__workers)]
+
+    async def listen(self, host=None, port=None, unix_socket=None):
+        """
+        Listens for clients on a TCP (host, port) or Unix socket
+
+        :returns: the listening socket address (e.g. the (host, port) tuple)
+        """
+        if unix_socket is not None:
+            self.__server = await asyncio.start_unix_server(self.__handle_client, unix_socket)
+        else:
+            self.__server = await asyncio.start_server(self.__handle_client, host, port)
+
+        return self.__server.sockets[0].getsockname()
+
+    async def serve_forever(self):
+        """ Serves the clients until cancelled """
+        await self.__server.serve_forever()
+
+    async def close(self):
+        """ Stops listening, closes every session and shuts the workers down """
+        if self.__server is not None:
+            self.__server.close()
+            await self.__server.wait_closed()
+
+        for session_id in list(self.__sessions):
+            self.close_session(session_id)
+
+        for dispatcher in self.__dispatchers:
+            dispatcher.cancel()
+
+        await asyncio.gather(*self.__dispatchers, return_exceptions=True)
+        self.__executor.shutdown(cancel_futures=True)
+
+    async def create_session(self, ai_players, move_timeout=None, client_id=None):
+        """
+        Starts a game, playing the AI turns that come first
+
+        :param ai_players: the players the engine moves for
+        :tparam ai_players: iterable of player id values
+
+        :param move_timeout: the AI move deadline of the session in seconds / None for the default
+        :tparam move_timeout: positive number / None
+
+        :returns: the state of the session (see GameSession.get_state)
+        :raises: HostOverloadedException if the host is at capacity
+        """
+        ai_players = set(ai_players)
+        number_of_players = settings["game"]["NUMBER_OF_PLAYERS"]
+
+        if not ai_players <= set(range(1, number_of_players + 1)):
+            raise InvalidMoveException("The players are numbered from 1 to {}".format(number_of_players))
+
+        if move_timeout is None:
+            move_timeout = self.__move_timeout
+        elif not 0 < move_timeout <= self.__max_move_timeout:
+            raise InvalidMoveException("The AI move deadline must be in (0, {}] ms".format(
+                self.__max_move_timeout * 1000))
+
+        if len(self.__sessions) >= self.__max_sessions:
+            self.__reject("Too many sessions")
+
+        if 1 in ai_players and self.__queue.full():
+            self.__reject("Too many AI moves waiting")
+
+        session = GameSession(next(self.__session_ids), client_id, ai_players, move_timeout)
+        self.__sessions[session.session_id] = session
+
+        await self.__play_ai_turns(session)
+
+        return session.get_state()
+
+    async def make_move(self, session_id, column_index):
+        """
+        Makes the move of the human to move in a session, then plays the AI turns that follow
+
+        :param column_index: the column of the move
+        :tparam column_index: integer
+
+        :returns: the state of the session (see GameSession.get_state)
+        :raises: SessionNotFoundException if there is no such session
+        :raises: InvalidMoveException if it is not the turn of a human or the move is not valid
+        :raises: HostOverloadedException if the move would start an AI turn while the queue is full
+        """
+        session = self.__get_session(session_id)
+
+        if session.game.is_over():
+            raise InvalidMoveException("The game is over")
+
+        if session.player in session.ai_players:
+            raise InvalidMoveException("It is not the turn of a human")
+
+        if not isinstance(column_index, int) or not 0 <= column_index < session.board.width or \
+                not session.board.is_valid_move(column_index):
+            raise InvalidMoveException("Invalid move {}".format(column_index))
+
+        """ Checked before the move, so that a rejected move can be sent again """
+        if session.player % session.number_of_players + 1 in session.ai_players and self.__queue.full():
+            self.__reject("Too many AI moves waiting")
+
+        session.make_move(column_index)
+        self.__counters["human_moves"] += 1
+
+        await self.__play_ai_turns(session)
+
+        return session.get_state()
+
+    def close_session(self, session_id):
+        """
+        Ends a session (its queued AI turn is dropped)
+
+        :raises: SessionNotFoundException if there is no such session
+        """
+        self.__get_session(session_id).is_closed = True
+        del self.__sessions[session_id]
+
+    def get_metrics(self):
+        """
+        Returns the load and latency of the host
+
+        :returns: dict with the open sessions, the queue_depth (AI turns waiting),
+                  the running_ai_moves, the move counters and the AI move latency
+                  percentiles in ms (waiting included, over the latest moves)
+        """
+        latencies = sorted(self.__move_latencies)
+
+        def get_percentile(percentile):
+            if not latencies:
+                return None
+
+            return latencies[round(percentile * (len(latencies) - 1))] * 1000
+
+        return dict(self.__counters,
+                    sessions=len(self.__sessions),
+                    queue_depth=self.__queue.qsize(),
+                    running_ai_moves=self.__running_ai_moves,
+                    move_latency_ms={
+                        "p50": get_percentile(0.5),
+                        "p95": get_percentile(0.95),
+                        "p99": get_percentile(0.99),
+                        "max": get_percentile(1),
+                    })
+
+    def __get_session(self, session_id):
+        """ Returns an open session, raising SessionNotFoundException if there is none with the given id """
+        if session_id not in self.__sessions:
+            raise SessionNotFoundException("No session {}".format(session_id))
+
+        return self.__sessions[session_id]
+
+    def __reject(self, reason):
+        """ Counts and raises a HostOverloadedException """
+        self.__counters["rejected_requests"] += 1
+
+        raise HostOverloadedException(reason)
+
+    async def __play_ai_turns(self, session):
+        """ Queues the AI turns of a session until a human has to move, the game ends or the session is closed """
+        loop = asyncio.get_running_loop()
+
+        while session.is_ai_turn() and not session.is_closed:
+            future = loop.create_future()
+            queued_time = perf_counter()
+
+            await self.__queue.put((session, future, queued_time))
+
+            column_index = await future
+
+            if session.is_closed:
+                return
+
+            session.make_move(column_index)
+
+            self.__counters["ai_moves"] += 1
+            self.__move_latencies.append(perf_counter() - queued_time)
+
+    async def __dispatch(self):
+        """ Searches the queued AI turns on a worker process, one at a time """
+        loop = asyncio.get_running_loop()
+
+        while True:
+            session, future, queued_time = await self.__queue.get()
+
+            """ The turn of a closed session / of a cancelled request is dropped """
+            if session.is_closed or future.done():
+                if not future.done():
+                    future.set_result(None)
+                continue
+
+            valid_moves = session.board.get_valid_moves()
+            deadline = queued_time + session.move_timeout
+
+            if perf_counter() >= deadline:
+                self.__counters["timed_out_ai_moves"] += 1
+                if not future.done():
+                    future.set_result(choice(valid_moves))
+                continue
+
+            self.__running_ai_moves += 1
+            search = loop.run_in_executor(self.__executor, get_ai_move, self.__engine_spec,
+                                          session.board.get_move_history(), session.number_of_players,
+                                          session.player)
+
+            try:
+                done, _ = await asyncio.wait({search}, timeout=deadline - perf_counter())
+
+                if not done:
+                    self.__counters["timed_out_ai_moves"] += 1
+                    if not future.done():
+                        future.set_result(choice(valid_moves))
+
+                    """ The search can not be stopped, the worker stays busy until it ends """
+                    await asyncio.gather(search, return_exceptions=True)
+                    continue
+
+                try:
+                    column_index = search.result()
+                except Exception:
+                    column_index = None
+
+                if column_index not in valid_moves:
+                    self.__counters["failed_ai_moves"] += 1
+                    column_index = choice(valid_moves)
+
+                """ The request may have been cancelled during the search (e.g. its client disconnected) """
+                if not future.done():
+                    future.set_result(column_index)
+            finally:
+                self.__running_ai_moves -= 1
+
+    async def __handle_request(self, request, client_id):
+        """ Returns the response to a request of a client """
+        operation = request.get("op")
+
+        if operation == "new":
+            move_timeout = request.get("move_timeout_ms")
+
+            if move_timeout is not None and not isinstance(move_timeout, (int, float)):
+                raise InvalidMoveException("move_timeout_ms must be a number")
+
+            return await self.create_session(request.get("ai_players", []),
+                                             None if move_timeout is None else move_timeout / 1000,
+                                             client_id)
+
+        if operation == "move":
+            column = request.get("column")
+
+            return await self.make_move(request.get("session"), column - 1 if isinstance(column, int) else column)
+
+        if operation == "close":
+            self.close_session(request.get("session"))
+
+            return {"session": request.get("session")}
+
+        if operation == "metrics":
+            return self.get_metrics()
+
+        raise GameHostException("Unknown op {}".format(operation))
+
+    async def __handle_client(self, reader, writer):
+        """ Reads the requests of a client, answering each one when it is done """
+        client_id = next(self.__client_ids)
+        write_lock = asyncio.Lock()
+        pending_requests = asyncio.Semaphore(self.__max_pending_requests)
+        responses = set()
+
+        async def respond(request_id, request):
+            try:
+                response = dict(await self.__handle_request(request, client_id), id=request_id)
+            except (GameHostException, TypeError) as exception:
+                response = {"id": request_id, "error": str(exception)}
+            finally:
+                pending_requests.release()
+
+            async with write_lock:
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    request = None
+
+                if not isinstance(request, dict):
+                    request = {"op": None}
+
+                """ Back-pressure: the connection is not read while too many of its requests are pending """
+                await pending_requests.acquire()
+
+                response = asyncio.create_task(respond(request.get("id"), request))
+                responses.add(response)
+                response.add_done_callback(responses.discard)
+
+            await asyncio.gather(*responses, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            for session in list(self.__sessions.values()):
+                if session.client_id == client_id:
+                    self.close_session(session.session_id)
+
+            for response in responses:
+                response.cancel()
+
+            writer.close()
@@ -0,0 +1,372 @@
+import mmap
+import os
+import re
+import struct
+
+class GameRecordException(Exception):
+    """ General exception raised by the game records """
+    pass
+
+class GameRecordFormatException(GameRecordException):
+    """ Raised when a file is not a game record shard """
+    pass
+
+class GameRecord:
+    """ A recorded game: the columns played from the empty board and the result """
+
+    """ The result of a game that ended without a winner (otherwise the result is the winner) """
+    DRAW = 0
+
+    def __init__(self, moves, result, number_of_players):
+        """
+        Initializes the GameRecord instance.
+
+        :param moves: the columns of the moves, the players taking turns starting with player 1
+        :tparam moves: tuple of nonnegative integers
+
+        :param result: the winner / DRAW
+        :tparam result: player id value
+
+        :param number_of_players: the number of players of the game
+        :tparam number_of_players: positive integer
+        """
+        self.moves = moves
+        self.result = result
+        self.number_of_players = number_of_players
+
+    def replay(self, board):
+        """
+        Plays the moves of the game on a board, one at a time
+
+        :param board: the (empty) board to be used
+        :tparam board: Board
+
+        :returns: generator of the (column, player) moves, yielded after each drop
+        """
+        for move_index, column_index in enumerate(self.moves):
+            player = move_index % self.number_of_players + 1
+            board.drop_piece(column_index, player)
+
+            yield column_index, player
+
+class GameRecordShard:
+    """
+    The games of an append-only shard file, read from a memory map.
+
+    File layout (little endian):
+        - header: magic, version, board width, board height,
+                  winning sequence length, number of players
+        - games, one after another: (result: 1 byte, move count: 2 bytes,
+          moves: 4 bits each, the first one in the low bits of a byte)
+
+    Opening a shard finds where every game starts (reading only the 3 byte
+    game headers). The games are decoded lazily, as they are iterated / looked
+    up. The indexes by result and by opening are built on first use. A game
+    cut short by an interrupted write at the end of the file is ignored.
+    """
+
+    MAGIC = b"C4GR"
+    VERSION = 1
+
+    HEADER_FORMAT = "<4sHBBBB"
+    GAME_HEADER_FORMAT = "<BH"
+
+    HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+    GAME_HEADER_SIZE = struct.calcsize(GAME_HEADER_FORMAT)
+
+    """ The number of first moves keying the opening index """
+    OPENING_INDEX_PLIES = 4
+
+    def __init__(self, file_name):
+        """
+        Opens a shard file.
+
+        :param file_name: the path of the shard
+        :tparam file_name: string
+
+        :raises: GameRecordFormatException if the file is not a valid shard
+        """
+        with open(file_name, "rb") as shard_file:
+            if os.fstat(shard_file.fileno()).st_size < GameRecordShard.HEADER_SIZE:
+                raise GameRecordFormatException("{} is not a game record shard".format(file_name))
+
+            self.__shard = mmap.mmap(shard_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.width, self.height, self.winning_sequence_length, self.number_of_players = \
+                struct.unpack_from(GameRecordShard.HEADER_FORMAT, self.__shard)
+
+        if magic != GameRecordShard.MAGIC or version != GameRecordShard.VERSION:
+            self.__shard.close()
+            raise GameRecordFormatException("{} is not a game record shard".format(file_name))
+
+        self.__offsets, self.__size = self.__find_game_offsets()
+        self.__result_index = None
+        self.__opening_index = None
+
+    def __find_game_offsets(self):
+        """ Returns the offset of every complete game and the offset after the last one """
+        offsets = []
+        offset = GameRecordShard.HEADER_SIZE
+        shard_size = len(self.__shard)
+
+        while offset + GameRecordShard.GAME_HEADER_SIZE <= shard_size:
+            _, move_count = struct.unpack_from(GameRecordShard.GAME_HEADER_FORMAT, self.__shard, offset)
+            next_offset = offset + GameRecordShard.GAME_HEADER_SIZE + (move_count + 1) // 2
+
+            if next_offset > shard_size:
+                break
+
+            offsets.append(offset)
+            offset = next_offset
+
+        return offsets, offset
+
+    def __read_game(self, offset, move_limit=None):
+        """ Decodes the game at an offset (only its first move_limit moves, if given) """
+        result, move_count = struct.unpack_from(GameRecordShard.GAME_HEADER_FORMAT, self.__shard, offset)
+
+        if move_limit is not None:
+            move_count = min(move_count, move_limit)
+
+        data_offset = offset + GameRecordShard.GAME_HEADER_SIZE
+        packed_moves = self.__shard[data_offset:data_offset + (move_count + 1) // 2]
+
+        moves = []
+        for packed_move_pair in packed_moves:
+            moves.append(packed_move_pair & 0x0F)
+            moves.append(packed_move_pair >> 4)
+
+        return GameRecord(tuple(moves[:move_count]), result, self.number_of_players)
+
+    def get_size(self):
+        """ Returns the size in bytes of the header and the complete games (without a cut short last game) """
+        return self.__size
+
+    def __len__(self):
+        """ Returns the number of games in the shard """
+        return len(self.__offsets)
+
+    def __iter__(self):
+        """ Yields the games of the shard, in the order they were written """
+        for offset in self.__offsets:
+            yield self.__read_game(offset)
+
+    def get_game(self, game_index):
+        """
+        Returns a game of the shard
+
+        :param game_index: the position of the game in the shard
+        :tparam game_index: nonnegative integer
+
+        :rtype: GameRecord
+        """
+        return self.__read_game(self.__offsets[game_index])
+
+    def find_by_result(self, result):
+        """
+        Yields the games with a given result
+
+        :param result: the winner / GameRecord.DRAW
+        :tparam result: player id value
+        """
+        if self.__result_index is None:
+            self.__result_index = {}
+
+            for game_index, offset in enumerate(self.__offsets):
+                self.__result_index.setdefault(self.__shard[offset], []).append(game_index)
+
+        for game_index in self.__result_index.get(result, []):
+            yield self.get_game(game_index)
+
+    def find_by_opening(self, opening):
+        """
+        Yields the games starting with the given moves
+        (grouped by their first OPENING_INDEX_PLIES moves)
+
+        :param opening: the first columns played
+        :tparam opening: sequence of nonnegative integers
+        """
+        opening = tuple(opening)
+
+        if self.__opening_index is None:
+            self.__opening_index = {}
+
+            for game_index, offset in enumerate(self.__offsets):
+                moves = self.__read_game(offset, GameRecordShard.OPENING_INDEX_PLIES).moves
+                self.__opening_index.setdefault(moves, []).append(game_index)
+
+        """ The index is keyed by the first OPENING_INDEX_PLIES moves (all the moves of shorter games) """
+        key_length = min(len(opening), GameRecordShard.OPENING_INDEX_PLIES)
+
+        for key, game_indices in self.__opening_index.items():
+            if key[:key_length] != opening[:key_length]:
+                continue
+
+            for game_index in game_indices:
+                game = self.get_game(game_index)
+
+                """ The moves after the key are only known once the game is decoded """
+                if len(opening) <= len(key) or game.moves[:len(opening)] == opening:
+                    yield game
+
+    def close(self):
+        """ Unmaps the shard file """
+        self.__shard.close()
+
+class GameRecordWriter:
+    """
+    Appends games to the shard files of a directory
+
+    The shards are named games-000000.c4gr, games-000001.c4gr, ... A new
+    shard is started when the last one reached shard_size bytes or holds
+    games of another board shape / rule set. Every game is written (and
+    flushed) with a single write.
+    """
+
+    SHARD_NAME_FORMAT = "games-{:06d}.c4gr"
+    """ Matches the file names of the shards, capturing their index """
+    SHARD_NAME_PATTERN = r"games-([0-9]+)\.c4gr"
+
+    """ The largest column index that fits in 4 bits """
+    MAX_COLUMN_INDEX = 0x0F
+    """ The most moves a game record can hold (2 byte move count) """
+    MAX_MOVE_COUNT = 0xFFFF
+    """ The largest board height / sequence length / number of players / result (1 byte each) """
+    MAX_BYTE_VALUE = 0xFF
+
+    def __init__(self, directory, width, height, winning_sequence_length, number_of_players, shard_size):
+        """
+        Initializes the GameRecordWriter instance (creates the directory if needed)
+
+        :param directory: the directory of the shards
+        :tparam directory: string
+
+        :param shard_size: the size in bytes from which a new shard is started
+        :tparam shard_size: positive integer
+
+        :raises: GameRecordException if the columns of the board do not fit in 4 bits or the
+                 height / sequence length / number of players do not fit in a byte
+        """
+        if width - 1 > GameRecordWriter.MAX_COLUMN_INDEX:
+            raise GameRecordException("Boards wider than {} columns can not be recorded".format(
+                GameRecordWriter.MAX_COLUMN_INDEX + 1))
+
+        for name, value in (("height", height), ("winning sequence length", winning_sequence_length),
+                            ("number of players", number_of_players)):
+            if not 0 <= value <= GameRecordWriter.MAX_BYTE_VALUE:
+                raise GameRecordException("A {} of {} can not be recorded (at most {})".format(
+                    name, value, GameRecordWriter.MAX_BYTE_VALUE))
+
+        self.__directory = directory
+        self.__header = struct.pack(GameRecordShard.HEADER_FORMAT, GameRecordShard.MAGIC, GameRecordShard.VERSION,
+                                    width, height, winning_sequence_length, number_of_players)
+        self.__shard_size = shard_size
+        self.__shard_file = None
+
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def get_shard_names(directory):
+        """ Returns the paths of the shards in a directory, in the order they were started """
+        return [os.path.join(directory, file_name) for _, file_name in GameRecordWriter.__get_shards(directory)]
+
+    @staticmethod
+    def __get_shards(directory):
+        """ Returns the (index, file name) of the shards in a directory, sorted by index """
+        shards = []
+
+        for file_name in os.listdir(directory):
+            match = re.fullmatch(GameRecordWriter.SHARD_NAME_PATTERN, file_name)
+
+            if match is not None:
+                shards.append((int(match.group(1)), file_name))
+
+        return sorted(shards)
+
+    @staticmethod
+    def encode_game(moves, result):
+        """
+        Returns the bytes of a game record
+
+        :param moves: the columns played
+        :tparam moves: sequence of integers in [0, 15]
+
+        :param result: the winner / GameRecord.DRAW
+        :tparam result: player id value
+
+        :rtype: bytes
+
+        :raises: GameRecordException if the game has too many moves or the result does not fit in a byte
+        """
+        if len(moves) > GameRecordWriter.MAX_MOVE_COUNT:
+            raise GameRecordException("A game record can hold at most {} moves".format(
+                GameRecordWriter.MAX_MOVE_COUNT))
+
+        if not 0 <= result <= GameRecordWriter.MAX_BYTE_VALUE:
+            raise GameRecordException("A result of {} can not be recorded (at most {})".format(
+                result, GameRecordWriter.MAX_BYTE_VALUE))
+
+        packed_moves = bytearray((len(moves) + 1) // 2)
+
+        for move_index, column_index in enumerate(moves):
+            packed_moves[move_index // 2] |= column_index << (4 * (move_index % 2))
+
+        return struct.pack(GameRecordShard.GAME_HEADER_FORMAT, result, len(moves)) + bytes(packed_moves)
+
+    def __open_shard(self):
+        """ Opens the shard the next game is appended to """
+        shards = GameRecordWriter.__get_shards(self.__directory)
+
+        if shards:
+            last_shard_name = os.path.join(self.__directory, shards[-1][1])
+
+            with open(last_shard_name, "rb") as shard_file:
+                header = shard_file.read(GameRecordShard.HEADER_SIZE)
+
+            if header == self.__header and os.path.getsize(last_shard_name) < self.__shard_size:
+                shard = GameRecordShard(last_shard_name)
+                size = shard.get_size()
+                shard.close()
+
+                """ Drops a game cut short by an interrupted write, the next game is appended after the last complete one """
+                os.truncate(last_shard_name, size)
+
+                self.__shard_file = open(last_shard_name, "ab")
+                return
+
+        """ After the highest index (not the number of shards, an earlier one may have been removed) """
+        shard_index = shards[-1][0] + 1 if shards else 0
+        shard_name = os.path.join(self.__directory, GameRecordWriter.SHARD_NAME_FORMAT.format(shard_index))
+
+        """ Exclusive creation, an existing shard is never written over """
+        self.__shard_file = open(shard_name, "xb")
+        self.__shard_file.write(self.__header)
+
+    def write(self, moves, result):
+        """
+        Appends a game
+
+        :param moves: the columns played, the players taking turns starting with player 1
+        :tparam moves: sequence of nonnegative integers
+
+        :param result: the winner / GameRecord.DRAW
+        :tparam result: player id value
+        """
+        if self.__shard_file is None or self.__shard_file.tell() >= self.__shard_size:
+            self.close()
+            self.__open_shard()
+
+        self.__shard_file.write(GameRecordWriter.encode_game(moves, result))
+        self.__shard_file.flush()
+
+    def close(self):
+        """ Closes the current shard """
+        if self.__shard_file is not None:
+            self.__shard_file.close()
+            self.__shard_file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception_info):
+        self.close()
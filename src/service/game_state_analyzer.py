@@ -1,32 +1,101 @@
+from functools import lru_cache
+
+import numpy as np
+
+from src.domain.bitboard import BitBoard
 from config import settings
 
 class GameStateAnalyzer:
     @staticmethod
-    def __is_winning_4_sequence(sequence, player):
-        """ 
-        Checks if a sequence is a winning sequence for the given player
-        A sequence is a winning sequence for a player if it 
-            contains 4 of its pieces
+    @lru_cache(maxsize=None)
+    def get_window_indices(width, height, sequence_length):
+        """
+        Returns the flat cell indexes of every possible sequence on a board
+        (horizontal, vertical, positive slope and negative slope windows)
 
-        :param sequence: the sequence to be checked
-        :tparam sequence: iterable with hashable values
-                          usually list of ints
+        Computed once per board shape and cached.
 
-        :param player: the player to be checked as the winner
+        :param width: the width of the board
+        :tparam width: positive integer
+
+        :param height: the height of the board
+        :tparam height: positive integer
+
+        :param sequence_length: the length of a sequence
+        :tparam sequence_length: positive integer
+
+        :returns: read-only array of shape (number of windows, sequence_length)
+                  indexing the board flattened in row-major order
+        """
+        windows = []
+        offsets = range(sequence_length)
+
+        for row_step, column_step in ((0, 1), (1, 0), (1, 1), (-1, 1)):
+            for row in range(height):
+                for column in range(width):
+                    last_row = row + (sequence_length - 1) * row_step
+                    last_column = column + (sequence_length - 1) * column_step
+
+                    if 0 <= last_row < height and last_column < width:
+                        windows.append([(row + offset * row_step) * width + column + offset * column_step
+                                        for offset in offsets])
+
+        window_indices = np.array(windows, dtype=np.intp).reshape(len(windows), sequence_length)
+        window_indices.setflags(write=False)
+
+        return window_indices
+
+    @staticmethod
+    def is_winning_move(board, row_index, column_index, player):
+        """
+        Checks if the piece placed at the given position completes a winning
+        sequence for the given player.
+        (only the lines passing through the given cell are searched)
+
+        :param board: the board to be checked
+
+        :param row_index: the row of the last placed piece
+        :tparam row_index: nonnegative integer
+
+        :param column_index: the column of the last placed piece
+        :tparam column_index: nonnegative integer
+
+        :param player: the player that placed the piece
         :tparam player: player id value
 
-        :returns: True if the given sequence is winning for the player
-                  False otherwise
+        :returns: True if the piece completes a winning sequence, False otherwise
         """
-        piece_set = {*sequence}
+        winning_sequence_length = settings["game"]["WINNING_SEQUENCE_LENGTH"]
+
+        if isinstance(board, BitBoard):
+            return board.is_player_winning(player, winning_sequence_length)
+
+        """ Horizontal, vertical, positive slope, negative slope """
+        for row_step, column_step in ((0, 1), (1, 0), (-1, 1), (1, 1)):
+            sequence_length = 1
+
+            for direction in (1, -1):
+                row = row_index + direction * row_step
+                column = column_index + direction * column_step
+
+                while 0 <= row < board.height and 0 <= column < board.width \
+                        and board[row][column] == player:
+                    sequence_length += 1
+
+                    row += direction * row_step
+                    column += direction * column_step
 
-        return len(piece_set) == 1 and player in piece_set 
+            if sequence_length >= winning_sequence_length:
+                return True
+
+        return False
 
     @staticmethod 
     def is_player_winning(board, player):
         """ 
         Check if the given players wins the game by searching
         the board for winning sequences.
+        (all the windows are gathered and checked at once)
 
         :param board: the board to be checked
 
@@ -37,40 +106,33 @@ class GameStateAnalyzer:
         """
         winning_sequence_length = settings["game"]["WINNING_SEQUENCE_LENGTH"]
 
-        """ Check horizontal """
-        for column in range(board.width - winning_sequence_length + 1):
-            for row in range(board.height):
-                if GameStateAnalyzer.__is_winning_4_sequence(
-                    [board[row][column + index] for index in range(winning_sequence_length)], 
-                    player
-                ):
-                    return True
-
-        """ Check vertical"""
-        for column in range(board.width):
-            for row in range(board.height - winning_sequence_length + 1):
-                if GameStateAnalyzer.__is_winning_4_sequence(
-                    [board[row + index][column] for index in range(winning_sequence_length)], 
-                    player
-                ):
-                    return True
-
-        """ Check positive slope """
-        for column in range(board.width - winning_sequence_length + 1):
-            for row in range(board.height - winning_sequence_length + 1):
-                if GameStateAnalyzer.__is_winning_4_sequence(
-                    [board[row + index][column + index] for index in range(winning_sequence_length)],
-                    player
-                ):
-                    return True
-
-        """ Check negative slope """
-        for column in range(board.width - winning_sequence_length + 1):
-            for row in range(board.height):
-                if GameStateAnalyzer.__is_winning_4_sequence(
-                    [board[row - index][column + index] for index in range(winning_sequence_length)],
-                    player
-                ):
-                    return True
+        if isinstance(board, BitBoard):
+            return board.is_player_winning(player, winning_sequence_length)
 
-        return False
+        window_indices = GameStateAnalyzer.get_window_indices(
+                board.width, board.height, winning_sequence_length)
+        cells = np.asarray(board[:]).ravel()
+
+        return bool((cells[window_indices] == player).all(axis=1).any())
+
+    @staticmethod
+    def is_player_winning_batch(boards, player):
+        """
+        Checks if the given player wins on every board from a stack of boards.
+
+        :param boards: the boards to be checked
+        :tparam boards: array of shape (N, height, width)
+
+        :param player: the player to be checked as the winner
+        :tparam player: player id value
+
+        :returns: array of N booleans, True where the given player wins
+        """
+        boards = np.asarray(boards)
+        number_of_boards, height, width = boards.shape
+
+        window_indices = GameStateAnalyzer.get_window_indices(
+                width, height, settings["game"]["WINNING_SEQUENCE_LENGTH"])
+        cells = boards.reshape(number_of_boards, height * width)
+
+        return (cells[:, window_indices] == player).all(axis=2).any(axis=1)
@@ -0,0 +1,383 @@
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from math import inf, log10
+from random import Random
+from time import perf_counter
+
+import numpy as np
+
+from src.domain.board import Board
+from src.service.game import Game
+from src.ai.random_ai import RandomAI
+from src.ai.minimax_ai import MiniMaxAI
+from src.ai.solver_ai import SolverAI
+from src.ai.mcts_ai import MCTSAI
+from src.ai.transposition_table import TranspositionTable
+from config import settings
+
+class TournamentException(Exception):
+    """ General exception raised by Tournament """
+    pass
+
+class UnknownEngineException(TournamentException):
+    """ Raised when an engine specification names an engine that does not exist """
+    pass
+
+class EngineSpec:
+    """
+    An AI engine taking part in a tournament, given as "name" or "name:depth"
+    (e.g. "random", "minimax:4", "solver", "mcts")
+
+    Only the engines of DEPTH_SETTINGS take a depth, it sets their setting
+    for the moves of the engine.
+
+    The engines of TRANSPOSITION_TABLE_SETTINGS keep searched positions
+    between moves, so every EngineSpec searches with its own table (a
+    shallow engine would otherwise reuse the results of a deeper opponent).
+    The table is not copied with the EngineSpec, every game played by a
+    worker process starts with an empty one.
+    """
+
+    """ The engines that can take part in a tournament, by name """
+    ENGINES = {
+        "random": RandomAI,
+        "minimax": MiniMaxAI,
+        "solver": SolverAI,
+        "mcts": MCTSAI,
+    }
+
+    """ The (section, key) of the depth setting of the engines searching to a fixed depth """
+    DEPTH_SETTINGS = {
+        "minimax": ("minimax", "DEPTH"),
+    }
+
+    """ The (section, key) of the transposition table size of the engines keeping one between moves """
+    TRANSPOSITION_TABLE_SETTINGS = {
+        "minimax": ("minimax", "TRANSPOSITION_TABLE_SIZE"),
+    }
+
+    def __init__(self, name, depth=None):
+        """
+        Initializes the EngineSpec instance.
+
+        :param name: the name of the engine (a key of ENGINES)
+        :tparam name: string
+
+        :param depth: the search depth of the engine / None for the configured one
+        :tparam depth: positive integer / None
+
+        :raises: UnknownEngineException if there is no engine with the given name
+                 or a depth is given to an engine without one
+        """
+        if name not in EngineSpec.ENGINES:
+            raise UnknownEngineException("Unknown engine {} (known: {})".format(
+                name, ", ".join(sorted(EngineSpec.ENGINES))))
+
+        if depth is not None and name not in EngineSpec.DEPTH_SETTINGS:
+            raise UnknownEngineException("The {} engine does not take a depth".format(name))
+
+        self.name = name
+        self.depth = depth
+
+        self.__transposition_table = None
+
+    def __getstate__(self):
+        """ Returns the state to be copied / pickled (without the transposition table) """
+        state = self.__dict__.copy()
+        state["_EngineSpec__transposition_table"] = None
+
+        return state
+
+    @staticmethod
+    def parse(specification):
+        """
+        Returns the EngineSpec given by a "name" / "name:depth" string
+
+        :raises: UnknownEngineException if the engine or depth is not valid
+        """
+        name, _, depth = specification.partition(":")
+
+        if depth and not re.fullmatch(r"[1-9][0-9]*", depth):
+            raise UnknownEngineException("Invalid depth in {}".format(specification))
+
+        return EngineSpec(name, int(depth) if depth else None)
+
+    def get_move(self, board, player):
+        """ Returns the move of the engine (see the get_move of the AI engines) """
+        engine = EngineSpec.ENGINES[self.name]
+
+        if self.name in EngineSpec.TRANSPOSITION_TABLE_SETTINGS:
+            engine.set_transposition_table(self.__get_transposition_table())
+
+        if self.depth is not None:
+            section, key = EngineSpec.DEPTH_SETTINGS[self.name]
+
+            configured_depth = settings["ai"][section][key]
+            settings["ai"][section][key] = self.depth
+
+        try:
+            return engine.get_move(board, player)
+        finally:
+            if self.depth is not None:
+                settings["ai"][section][key] = configured_depth
+
+            if self.name in EngineSpec.TRANSPOSITION_TABLE_SETTINGS:
+                engine.set_transposition_table(None)
+
+    def __get_transposition_table(self):
+        """ Returns the transposition table of the engine (created on first use) """
+        section, key = EngineSpec.TRANSPOSITION_TABLE_SETTINGS[self.name]
+        size = settings["ai"][section][key]
+
+        if self.__transposition_table is None or self.__transposition_table.size != size:
+            self.__transposition_table = TranspositionTable(size)
+
+        return self.__transposition_table
+
+    def __str__(self):
+        return self.name if self.depth is None else "{}:{}".format(self.name, self.depth)
+
+class GameResult:
+    """ The outcome of a tournament game """
+
+    def __init__(self, game_index, first_engine_index, winner_engine_index, move_count, move_latencies):
+        """
+        Initializes the GameResult instance.
+
+        :param game_index: the index of the game in the tournament
+        :tparam game_index: nonnegative integer
+
+        :param first_engine_index: the engine that moved first (0 / 1)
+        :tparam first_engine_index: integer
+
+        :param winner_engine_index: the engine that won (0 / 1) / None for a draw
+        :tparam winner_engine_index: integer / None
+
+        :param move_count: the number of moves of the game
+        :tparam move_count: nonnegative integer
+
+        :param move_latencies: the get_move durations of each engine, in seconds
+        :tparam move_latencies: tuple of two lists of floats
+        """
+        self.game_index = game_index
+        self.first_engine_index = first_engine_index
+        self.winner_engine_index = winner_engine_index
+        self.move_count = move_count
+        self.move_latencies = move_latencies
+
+def play_game(engine_specs, game_index, opening_plies, seed):
+    """
+    Plays a tournament game without UI
+    (run by the worker processes of the Tournament)
+
+    The engines alternate moving first from one game to the next. The first
+    opening_plies moves are random, so games between deterministic engines differ.
+    Only two player games can be played (NUMBER_OF_PLAYERS must be 2).
+
+    :param engine_specs: the two engines of the tournament
+    :tparam engine_specs: tuple of EngineSpec
+
+    :param game_index: the index of the game in the tournament
+    :tparam game_index: nonnegative integer
+
+    :param opening_plies: the number of random moves starting the game
+    :tparam opening_plies: nonnegative integer
+
+    :param seed: the seed of the tournament
+    :tparam seed: integer
+
+    :rtype: GameResult
+
+    :raises: TournamentException if NUMBER_OF_PLAYERS is not 2
+    """
+    if settings["game"]["NUMBER_OF_PLAYERS"] != 2:
+        raise TournamentException("A tournament game is played by two players")
+
+    board = Board(settings["game"]["BOARD_WIDTH"], settings["game"]["BOARD_HEIGHT"])
+    game = Game(board)
+    random = Random("{}:{}".format(seed, game_index))
+
+    first_engine_index = game_index % 2
+    move_latencies = ([], [])
+    move_count = 0
+
+    while not game.is_over():
+        player = move_count % 2 + 1
+        engine_index = first_engine_index if player == 1 else 1 - first_engine_index
+
+        if move_count < opening_plies:
+            column_index = random.choice(board.get_valid_moves())
+        else:
+            start_time = perf_counter()
+            column_index = engine_specs[engine_index].get_move(board, player)
+            move_latencies[engine_index].append(perf_counter() - start_time)
+
+        game.make_move(column_index, player)
+        move_count += 1
+
+    winner = game.get_winner()
+    winner_engine_index = None if winner is None else \
+            (first_engine_index if winner == 1 else 1 - first_engine_index)
+
+    return GameResult(game_index, first_engine_index, winner_engine_index, move_count, move_latencies)
+
+class TournamentReport:
+    """ Statistics of the finished games of a tournament, seen from the first engine """
+
+    """ The reported move latency percentiles """
+    LATENCY_PERCENTILES = (50, 90, 99)
+
+    def __init__(self, engine_specs):
+        self.__engine_specs = engine_specs
+        self.__wins = 0
+        self.__draws = 0
+        self.__losses = 0
+        self.__move_latencies = ([], [])
+        self.__start_time = perf_counter()
+        self.__elapsed_time = 0
+
+    def add_result(self, result):
+        """
+        Adds a finished game to the statistics
+
+        :param result: the finished game
+        :tparam result: GameResult
+        """
+        if result.winner_engine_index is None:
+            self.__draws += 1
+        elif result.winner_engine_index == 0:
+            self.__wins += 1
+        else:
+            self.__losses += 1
+
+        for engine_index in range(2):
+            self.__move_latencies[engine_index].extend(result.move_latencies[engine_index])
+
+        self.__elapsed_time = perf_counter() - self.__start_time
+
+    @property
+    def games(self):
+        """ Returns the number of finished games """
+        return self.__wins + self.__draws + self.__losses
+
+    def get_rates(self):
+        """ Returns the (win, draw, loss) rates of the first engine """
+        if not self.games:
+            return (0, 0, 0)
+
+        return (self.__wins / self.games, self.__draws / self.games, self.__losses / self.games)
+
+    def get_elo_difference(self):
+        """
+        Returns the Elo rating difference of the first engine over the second one,
+        estimated from its score (wins + draws / 2) / None if no game finished
+
+        :rtype: float (inf / -inf if one engine won every game) / None
+        """
+        if not self.games:
+            return None
+
+        score = (self.__wins + self.__draws / 2) / self.games
+
+        if score == 0:
+            return -inf
+        if score == 1:
+            return inf
+
+        return 400 * log10(score / (1 - score))
+
+    def get_games_per_second(self):
+        """ Returns the number of finished games per second of tournament """
+        return self.games / self.__elapsed_time if self.__elapsed_time else 0
+
+    def get_latency_percentiles(self, engine_index):
+        """
+        Returns the get_move latency percentiles of an engine, in milliseconds
+
+        :rtype: dict of percentile to float / None if the engine made no move
+        """
+        latencies = self.__move_latencies[engine_index]
+
+        if not latencies:
+            return None
+
+        return dict(zip(TournamentReport.LATENCY_PERCENTILES,
+                        (float(value) * 1000 for value in
+                         np.percentile(latencies, TournamentReport.LATENCY_PERCENTILES))))
+
+    def format(self):
+        """ Returns the report as text """
+        win_rate, draw_rate, loss_rate = self.get_rates()
+        lines = [
+            "{} vs {}: {} games".format(self.__engine_specs[0], self.__engine_specs[1], self.games),
+            "W/D/L: {} / {} / {} ({:.1%} / {:.1%} / {:.1%})".format(
+                self.__wins, self.__draws, self.__losses, win_rate, draw_rate, loss_rate),
+            "Elo difference: {:+.0f}".format(self.get_elo_difference() or 0),
+            "Games per second: {:.2f}".format(self.get_games_per_second()),
+        ]
+
+        for engine_index, engine_spec in enumerate(self.__engine_specs):
+            percentiles = self.get_latency_percentiles(engine_index)
+
+            if percentiles is not None:
+                lines.append("{} move latency: {}".format(engine_spec, ", ".join(
+                    "p{} {:.2f}ms".format(percentile, value) for percentile, value in percentiles.items())))
+
+        return "\n".join(lines)
+
+class Tournament:
+    """
+    Plays games between two AI engines without UI, spread across a pool of
+    worker processes. The results are returned as the games finish.
+    """
+
+    def __init__(self, engine_specs, games, workers=1, opening_plies=0, seed=0):
+        """
+        Initializes the Tournament instance.
+
+        :param engine_specs: the two engines of the tournament
+        :tparam engine_specs: tuple of EngineSpec
+
+        :param games: the number of games to be played
+        :tparam games: nonnegative integer
+
+        :param workers: the number of worker processes
+        :tparam workers: positive integer
+
+        :param opening_plies: the number of random moves starting every game
+        :tparam opening_plies: nonnegative integer
+
+        :param seed: the seed of the random opening moves
+        :tparam seed: integer
+
+        :raises: TournamentException if not given two engines or NUMBER_OF_PLAYERS is not 2
+        """
+        if len(engine_specs) != 2:
+            raise TournamentException("A tournament is played between two engines")
+
+        if settings["game"]["NUMBER_OF_PLAYERS"] != 2:
+            raise TournamentException("A tournament game is played by two players")
+
+        self.__engine_specs = tuple(engine_specs)
+        self.__games = games
+        self.__workers = workers
+        self.__opening_plies = opening_plies
+        self.__seed = seed
+
+        self.report = TournamentReport(self.__engine_specs)
+
+    def run(self):
+        """
+        Plays the games, yielding the GameResult of every game as soon as it finishes
+        (the results are added to the report)
+        """
+        with ProcessPoolExecutor(self.__workers) as executor:
+            futures = [executor.submit(play_game, self.__engine_specs, game_index,
+                                       self.__opening_plies, self.__seed)
+                       for game_index in range(self.__games)]
+
+            for future in as_completed(futures):
+                result = future.result()
+                self.report.add_result(result)
+
+                yield result
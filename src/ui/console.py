@@ -1,12 +1,17 @@
+import time
 from functools import reduce
 
 from src.domain.board import Board
 from config import settings
 
 class ConsoleUI:
+    """ The seconds between two checks of a running AI search """
+    THINKING_POLL_INTERVAL = 0.05
+
     def __init__(self):
         """ Constructs the console UI (sets up player symbols) """ 
         self.__player_to_symbol = { 0: settings["console"]["EMPTY_SYMBOL"] }
+        self.__thinking_player = None
 
         for player in range(1, settings["game"]["NUMBER_OF_PLAYERS"] + 1):
             self.__player_to_symbol[player] = settings["console"]["PLAYER_{}_SYMBOL".format(player)]
@@ -19,8 +24,8 @@ class ConsoleUI:
         :tparam board: Board
         """
         print()
-        for row_index in range(settings["game"]["BOARD_HEIGHT"]):
-            print("".join([self.__player_to_symbol[player] for player in board[row_index]]))
+        for row in board.get_view():
+            print("".join([self.__player_to_symbol[player] for player in row.tolist()]))
         print()
 
     def get_move(self, player, valid_moves):
@@ -44,6 +49,31 @@ class ConsoleUI:
 
         return int(column_choice) - 1
 
+    def display_thinking(self, board, player):
+        """
+        Prints a message when an AI player starts thinking, then waits a bit
+        for the search (Ctrl+C cancels it, see MasterController)
+
+        :param board: the Board being searched (unused)
+        :tparam board: Board
+
+        :param player: the thinking player
+        :tparam player: player id value
+
+        :return: True (the search is cancelled by the KeyboardInterrupt of Ctrl+C)
+        :rtype: bool
+        """
+        if self.__thinking_player != player:
+            self.__thinking_player = player
+
+            print("{} ({}) is thinking... (Ctrl+C to move now)".format(
+                settings["game"]["PLAYER_{}_NAME".format(player)],
+                self.__player_to_symbol[player]))
+
+        time.sleep(ConsoleUI.THINKING_POLL_INTERVAL)
+
+        return True
+
     def make_move(self, column_choice, player):
         """
         Prints message describing move that was made
@@ -54,6 +84,8 @@ class ConsoleUI:
         :param player: the player that made the move
         :tparam player: player id value
         """
+        self.__thinking_player = None
+
         print("\n{} ({}) moved on column {} \n".format(
                 settings["game"]["PLAYER_{}_NAME".format(player)],
                 self.__player_to_symbol[player],
@@ -70,3 +102,7 @@ class ConsoleUI:
             settings["game"]["PLAYER_{}_NAME".format(winner)],
             self.__player_to_symbol[winner])
         )
+
+    def display_draw(self):
+        """ Displays the draw message (board filled without a winner) """
+        print("DRAW: the board is full")
@@ -27,6 +27,9 @@ class PyGameUI:
         self.__current_column_index = None
         self.__current_player = None
 
+        self.__clock = pygame.time.Clock()
+        self.__font = pygame.font.SysFont(settings["gui"]["FONT_NAME"], settings["gui"]["FONT_SIZE"])
+
     def __get_x_from_column_index(self, column_index):
         """ 
         Returns the x position given by a board column index
@@ -101,9 +104,11 @@ class PyGameUI:
                          settings["gui"]["BOARD_WIDTH"],
                          settings["gui"]["BOARD_HEIGHT"]))
 
+        cells = board.get_view()
+
         for row_index in range(board.height):
             for column_index in range(board.width):
-                self.__draw_board_piece(row_index, column_index, board[row_index][column_index])
+                self.__draw_board_piece(row_index, column_index, int(cells[row_index, column_index]))
 
     def __draw_falling_piece(self, x_position, board, player):
         """ Draws falling piece animation """
@@ -205,21 +210,62 @@ class PyGameUI:
 
                     return self.__current_column_index
 
-    def display_winner(self, winner):
-        """ 
-        Displays the winner player
+    def display_thinking(self, board, player):
+        """
+        Draws a frame while an AI player is thinking (the board and a thinking
+        indicator in the drop zone), keeping the FPS render rate
 
-        :param winner: the winner player
-        :tparam winner: player value id
+        Closing the window quits the program, the ESCAPE key cancels the search.
+
+        :param board: the Board to be drawn
+        :tparam board: Board
+
+        :param player: the thinking player
+        :tparam player: player id value
+
+        :return: False if the user asked to cancel the search, True otherwise
+        :rtype: bool
         """
+        keep_searching = True
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                sys.exit()
+
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                keep_searching = False
+
+        self.__draw_board(board)
+        self.__draw_drop_zone()
+
+        """ One to three dots, changing twice a second """
+        dots = "." * (pygame.time.get_ticks() // 500 % 3 + 1)
+        text = self.__font.render("{} is thinking{}".format(settings["game"]["PLAYER_{}_NAME".format(player)], dots),
+                                  True,
+                                  self.__player_to_color[player],
+                                  settings["gui"]["DROP_ZONE_COLOR"])
+
+        text_rect = text.get_rect()
+        text_rect.midleft = (settings["gui"]["DROP_ZONE_X"] + self.__circle_radius,
+                             settings["gui"]["DROP_ZONE_Y"] + settings["gui"]["DROP_ZONE_HEIGHT"] // 2)
+
+        self.__screen.blit(text, text_rect)
+
+        pygame.display.flip()
+        self.__clock.tick(settings["gui"]["FPS"])
+
+        return keep_searching
+
+    def __display_message(self, message, color):
+        """ Displays a message in the center of an empty screen """
         self.__screen.fill(settings["gui"]["WINNER_BACKGROUND_COLOR"])
 
         font = pygame.font.SysFont(settings["gui"]["FONT_NAME"],
                                    settings["gui"]["FONT_SIZE"])
 
-        text = font.render("{} won!".format(settings["game"]["PLAYER_{}_NAME".format(winner)]),
+        text = font.render(message,
                            True, 
-                           self.__player_to_color[winner],
+                           color,
                            settings["gui"]["WINNER_BACKGROUND_COLOR"])
 
         text_rect = text.get_rect()
@@ -229,3 +275,17 @@ class PyGameUI:
 
         pygame.display.flip()
         time.sleep(1)
+
+    def display_winner(self, winner):
+        """ 
+        Displays the winner player
+
+        :param winner: the winner player
+        :tparam winner: player value id
+        """
+        self.__display_message("{} won!".format(settings["game"]["PLAYER_{}_NAME".format(winner)]),
+                               self.__player_to_color[winner])
+
+    def display_draw(self):
+        """ Displays the draw message (board filled without a winner) """
+        self.__display_message("Draw!", settings["gui"]["DRAW_COLOR"])
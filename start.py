@@ -1,10 +1,14 @@
 from src.controller.master_controller import MasterController
 
 from src.domain.board import Board
+from src.domain.bitboard import BitBoard
 from src.service.game import Game
+from src.service.game_record import GameRecordWriter
 
 from src.ai.random_ai import RandomAI
 from src.ai.minimax_ai import MiniMaxAI
+from src.ai.solver_ai import SolverAI
+from src.ai.mcts_ai import MCTSAI
 
 from src.ui.console import ConsoleUI
 from src.ui.graphical import PyGameUI
@@ -16,16 +20,40 @@ class MasterControllerFactory:
 
     @staticmethod
     def get_ai_engine():
+        if settings["game"]["USE_SOLVER"]:
+            return SolverAI
+
+        if settings["game"]["USE_MCTS"]:
+            return MCTSAI
+
         return MiniMaxAI if settings["game"]["USE_MINIMAX"] else RandomAI
 
+    @staticmethod
+    def get_board():
+        board_type = BitBoard if settings["game"]["USE_BITBOARD"] else Board
+
+        return board_type(settings["game"]["BOARD_WIDTH"],
+                          settings["game"]["BOARD_HEIGHT"])
+
     @staticmethod
     def get_ui():
         return PyGameUI() if settings["game"]["USE_GUI"] else ConsoleUI()
 
+    @staticmethod
+    def get_game_recorder():
+        if not settings["records"]["DIRECTORY"]:
+            return None
+
+        return GameRecordWriter(settings["records"]["DIRECTORY"],
+                                settings["game"]["BOARD_WIDTH"],
+                                settings["game"]["BOARD_HEIGHT"],
+                                settings["game"]["WINNING_SEQUENCE_LENGTH"],
+                                settings["game"]["NUMBER_OF_PLAYERS"],
+                                settings["records"]["SHARD_SIZE"])
+
     @staticmethod
     def get_controller():
-        board = Board(settings["game"]["BOARD_WIDTH"],
-                      settings["game"]["BOARD_HEIGHT"])
+        board = MasterControllerFactory.get_board()
         game = Game(board)
 
         return MasterController(
@@ -33,7 +61,8 @@ class MasterControllerFactory:
                 game,
                 MasterControllerFactory.get_ai_engine(),
                 MasterControllerFactory.get_ui(),
-                settings["game"]["AI_PLAYERS"]
+                settings["game"]["AI_PLAYERS"],
+                MasterControllerFactory.get_game_recorder()
         )
 
 if __name__ == "__main__":
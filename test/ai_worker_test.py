@@ -0,0 +1,72 @@
+import unittest
+from time import sleep
+from unittest.mock import patch
+
+from test.config import settings
+import config
+
+from src.domain.board import Board
+from src.ai.random_ai import RandomAI
+from src.ai.minimax_ai import MiniMaxAI
+from src.controller.ai_worker import AIWorker
+
+class FailingAI:
+    @staticmethod
+    def get_move(board, player, stop_event=None):
+        raise ValueError("no move")
+
+class AIWorkerTest(unittest.TestCase):
+    def test_get_result(self):
+        board = Board(7, 6)
+        for column_index in range(3):
+            board.drop_piece(column_index, 1)
+
+        worker = AIWorker(MiniMaxAI, board, 2)
+        worker.start()
+
+        self.assertEqual(worker.get_result(), 3)
+        self.assertTrue(worker.is_done())
+        self.assertFalse(worker.is_cancelled())
+
+        """ The searched board is a copy """
+        worker = AIWorker(RandomAI, board, 2)
+        board.drop_piece(3, 1)
+        worker.start()
+
+        self.assertIn(worker.get_result(), range(7))
+
+    def test_cancel(self):
+        board = Board(7, 6)
+
+        with patch.dict(config.settings["ai"]["minimax"], {"MOVE_TIME_MS": 60_000}):
+            MiniMaxAI.clear_transposition_table()
+
+            worker = AIWorker(MiniMaxAI, board, 1)
+            worker.start()
+            sleep(0.2)
+
+            self.assertFalse(worker.is_done())
+            worker.cancel()
+
+            """ The iterative deepening search plays the best move found before it was stopped """
+            self.assertIn(worker.get_result(), board.get_valid_moves())
+            self.assertTrue(worker.is_cancelled())
+
+        with patch.dict(config.settings["ai"]["minimax"], {"DEPTH": 42}):
+            MiniMaxAI.clear_transposition_table()
+
+            worker = AIWorker(MiniMaxAI, board, 1)
+            worker.start()
+            worker.cancel()
+
+            """ A fixed depth search finds no move """
+            self.assertIsNone(worker.get_result())
+
+        MiniMaxAI.clear_transposition_table()
+
+    def test_engine_exception(self):
+        worker = AIWorker(FailingAI, Board(7, 6), 1)
+        worker.start()
+
+        with self.assertRaises(ValueError):
+            worker.get_result()
@@ -0,0 +1,140 @@
+import asyncio
+import json
+import unittest
+
+from src.service.analysis_server import AnalysisServer, FairQueue, InvalidRequestException, \
+        parse_moves, format_moves, get_board, analyze_position
+from test.config import settings
+
+class AnalysisServerTest(unittest.TestCase):
+    def test_moves(self):
+        self.assertEqual(parse_moves("4453", 7), [3, 3, 4, 2])
+        self.assertEqual(parse_moves("", 7), [])
+        self.assertEqual(parse_moves("10,1,12", 12), [9, 0, 11])
+        self.assertEqual(format_moves([9, 0, 11], 12), "10,1,12")
+        self.assertEqual(format_moves([3, 3, 4, 2], 7), "4453")
+
+        with self.assertRaises(InvalidRequestException):
+            parse_moves("44a", 7)
+        with self.assertRaises(InvalidRequestException):
+            parse_moves("4\u00b2", 7)
+        with self.assertRaises(InvalidRequestException):
+            parse_moves("10,\u00b2", 12)
+        with self.assertRaises(InvalidRequestException):
+            parse_moves(44, 7)
+
+    def test_get_board(self):
+        board, player = get_board([3, 3, 4])
+
+        self.assertEqual(board.get_move_history(), (3, 3, 4))
+        self.assertEqual(player, 2)
+
+        """ Out of the board, full column, game over """
+        for columns in ([7], [-1], [0] * 7, [0, 1, 0, 1, 0, 1, 0], [0, 1, 0, 1, 0, 1, 0, 1]):
+            with self.assertRaises(InvalidRequestException):
+                get_board(columns)
+
+    def test_analyze_position(self):
+        """ Player 1 wins with a fourth piece in the bottom row """
+        result = analyze_position([0, 0, 1, 1, 2, 2], 3, None)
+
+        self.assertEqual(result["best_move"], 4)
+        self.assertEqual(result["pv"], "4")
+        self.assertEqual(result["depth"], 3)
+
+    def test_fair_queue(self):
+        async def get_all(queue, count):
+            return [await queue.get() for _ in range(count)]
+
+        queue = FairQueue()
+        for item in ("a1", "a2", "a3"):
+            queue.put("a", item)
+        queue.put("b", "b1")
+        queue.put("c", "c1")
+        queue.put("c", "c2")
+
+        self.assertEqual(len(queue), 6)
+        self.assertEqual(queue.get_pending_count("a"), 3)
+
+        self.assertEqual(asyncio.run(get_all(queue, 6)), ["a1", "b1", "c1", "a2", "c2", "a3"])
+        self.assertEqual(queue.get_pending_count("a"), 0)
+
+    def test_server(self):
+        async def exchange(port, requests):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+            for request in requests:
+                writer.write((request if isinstance(request, str) else json.dumps(request)).encode() + b"\n")
+            await writer.drain()
+
+            responses = [json.loads(await reader.readline()) for _ in requests]
+            writer.close()
+
+            return {response["id"]: response for response in responses}
+
+        async def run():
+            server = AnalysisServer(1, 3, 6, 1000)
+            _, port = await server.start("127.0.0.1", 0)
+
+            try:
+                responses = await exchange(port, [
+                    {"id": 1, "moves": "112233", "depth": 3},
+                    {"id": 2, "moves": "", "move_time_ms": 50},
+                    {"id": 3, "moves": "1111111"},
+                    {"id": 4, "moves": "44", "depth": 20},
+                    {"id": 5, "moves": "4\u00b2"},
+                    {"id": 6, "moves": "44", "depth": True},
+                    {"id": 7, "moves": "44", "move_time_ms": False},
+                    {"id": 8, "moves": "44", "move_time_ms": 0.001},
+                    "not json",
+                ])
+
+                """ Two clients at once """
+                both = await asyncio.gather(exchange(port, [{"id": "a", "moves": "4"}]),
+                                            exchange(port, [{"id": "b", "moves": "44"}]))
+
+                """ Past MAX_REQUEST_SIZE, answered by an error before the connection is closed """
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(b"x" * (AnalysisServer.MAX_REQUEST_SIZE + 10) + b"\n")
+                await writer.drain()
+
+                too_long = json.loads(await reader.readline())
+                closed = await reader.read() == b""
+                writer.close()
+
+                """ Past MAX_PENDING_REQUESTS """
+                limited = await exchange(port, [{"id": index, "moves": "", "depth": 6} for index in range(4)])
+            finally:
+                await server.close()
+
+            return responses, both, limited, too_long, closed
+
+        responses, both, limited, too_long, closed = asyncio.run(run())
+
+        self.assertEqual(responses[1]["best_move"], 4)
+        self.assertEqual(responses[1]["pv"][0], "4")
+        self.assertGreater(responses[1]["elapsed_ms"], 0)
+
+        self.assertIn(responses[2]["best_move"], range(1, 8))
+        self.assertGreaterEqual(responses[2]["depth"], 1)
+
+        self.assertIn("error", responses[3])
+        self.assertIn("error", responses[4])
+        self.assertIn("error", responses[5])
+        self.assertIn("error", responses[6])
+        self.assertIn("error", responses[7])
+
+        """ The budget runs out before depth 1, which is searched anyway """
+        self.assertEqual(responses[8]["depth"], 1)
+        self.assertEqual(responses[8]["pv"], str(responses[8]["best_move"]))
+        self.assertIsNotNone(responses[8]["score"])
+
+        self.assertIn("error", too_long)
+        self.assertTrue(closed)
+        self.assertIn("error", responses[None])
+
+        self.assertEqual(both[0]["a"]["depth"], settings["ai"]["minimax"]["DEPTH"])
+        self.assertIn("best_move", both[1]["b"])
+
+        self.assertEqual(sum("error" in response for response in limited.values()), 1)
+        self.assertIn("error", limited[3])
@@ -0,0 +1,33 @@
+import random
+import unittest
+
+import numpy as np
+
+from src.ai.batch_evaluator import BatchEvaluator
+from src.ai.incremental_evaluator import IncrementalEvaluator
+from test.config import settings
+from test.evaluator_fixtures import SEQUENCE_SCORES, CENTER_MULTIPLIER, get_random_board
+
+class BatchEvaluatorTest(unittest.TestCase):
+    def test_score_boards(self):
+        generator = random.Random(0)
+
+        for width, height, sequence_length in [(7, 6, 4), (5, 4, 3), (12, 10, 5)]:
+            boards = []
+            expected_scores = []
+
+            for _ in range(10):
+                board = get_random_board(width, height, generator, generator.randrange(width * height))
+
+                boards.append(np.array(board[:]))
+                expected_scores.append(IncrementalEvaluator(
+                    board, 1, 2, sequence_length, CENTER_MULTIPLIER, SEQUENCE_SCORES).get_score())
+
+            scores = BatchEvaluator.score_boards(
+                    np.stack(boards), 1, 2, sequence_length, CENTER_MULTIPLIER, SEQUENCE_SCORES)
+
+            self.assertEqual(list(scores), expected_scores)
+
+    def test_empty_stack(self):
+        scores = BatchEvaluator.score_boards(np.zeros((0, 6, 7)), 1, 2, 4, CENTER_MULTIPLIER, SEQUENCE_SCORES)
+        self.assertEqual(scores.shape, (0,))
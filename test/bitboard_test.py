@@ -0,0 +1,114 @@
+import unittest
+from random import Random
+
+from src.domain.board import Board, BoardFullColumnDropException, BoardEmptyUndoException
+from src.domain.bitboard import BitBoard
+from src.service.game_state_analyzer import GameStateAnalyzer
+from test.config import settings
+
+class BitBoardTest(unittest.TestCase):
+    def setUp(self):
+        self.board = BitBoard(4, 4)
+
+    def test_constructor_getitem(self):
+        self.assertFalse(self.board[:].any())
+
+        for row_index in range(self.board.height):
+            for column_index in range(self.board.width):
+                self.assertEqual(self.board[row_index][column_index], 0)
+
+    def test_drop_piece(self):
+        for _ in range(4):
+            self.board.drop_piece(0, 1)
+
+        for row_index in range(self.board.height):
+            self.assertEqual(self.board[row_index][0], 1)
+
+        with self.assertRaises(BoardFullColumnDropException):
+            self.board.drop_piece(0, 1)
+
+    def test_get_top_occupied_row_index(self):
+        for _ in range(4):
+            self.board.drop_piece(0, 1)
+
+        self.assertEqual(self.board.get_top_occupied_row_index(0), 0)
+        self.assertEqual(self.board.get_top_occupied_row_index(1), 4)
+
+        self.board.drop_piece(2, 1)
+        self.assertEqual(self.board.get_top_occupied_row_index(2), 3)
+
+    def test_pop_piece(self):
+        with self.assertRaises(BoardEmptyUndoException):
+            self.board.pop_piece()
+
+        self.board.drop_piece(1, 1)
+        self.board.drop_piece(1, 2)
+        self.board.drop_piece(3, 1)
+
+        self.assertEqual(self.board.pop_piece(), 3)
+        self.assertEqual(self.board[3][3], 0)
+        self.assertEqual(self.board.get_top_occupied_row_index(3), 4)
+
+        self.assertEqual(self.board.pop_piece(), 1)
+        self.assertEqual(self.board[2][1], 0)
+        self.assertEqual(self.board[3][1], 1)
+
+        self.board.drop_piece(1, 2)
+        self.assertEqual(self.board[2][1], 2)
+
+    def test_get_valid_moves(self):
+        for _ in range(3):
+            self.board.drop_piece(0, 1)
+
+        self.assertEqual(len(self.board.get_valid_moves()), 4)
+
+        self.board.drop_piece(0, 1)
+        self.assertEqual(len(self.board.get_valid_moves()), 3)
+        self.assertNotIn(0, self.board.get_valid_moves())
+        self.assertFalse(self.board.is_valid_move(0))
+
+    def test_is_player_winning(self):
+        horizontal = BitBoard(4, 4)
+        for column_index in range(4):
+            horizontal.drop_piece(column_index, 1)
+        self.assertTrue(horizontal.is_player_winning(1, 4))
+        self.assertFalse(horizontal.is_player_winning(2, 4))
+
+        negative_slope = BitBoard(4, 4)
+        for column_index, players in enumerate([[2, 2, 2, 1], [2, 2, 1], [2, 1], [1]]):
+            for player in players:
+                negative_slope.drop_piece(column_index, player)
+        self.assertTrue(negative_slope.is_player_winning(1, 4))
+        self.assertFalse(negative_slope.is_player_winning(2, 4))
+
+        """ Sequences must not wrap around into the next column """
+        wrapping = BitBoard(2, 4)
+        wrapping.drop_piece(0, 1)
+        wrapping.drop_piece(0, 1)
+        wrapping.drop_piece(1, 1)
+        wrapping.drop_piece(1, 1)
+        self.assertFalse(wrapping.is_player_winning(1, 4))
+
+    def test_matches_board(self):
+        random = Random(4)
+
+        for width, height in [(7, 6), (12, 9)]:
+            board = Board(width, height)
+            bitboard = BitBoard(width, height)
+            player = 1
+
+            while board.get_valid_moves() and not GameStateAnalyzer.is_player_winning(board, 3 - player):
+                column_index = random.choice(board.get_valid_moves())
+
+                board.drop_piece(column_index, player)
+                bitboard.drop_piece(column_index, player)
+
+                self.assertTrue((board[:] == bitboard[:]).all())
+                self.assertEqual(board.get_valid_moves(), bitboard.get_valid_moves())
+                self.assertEqual(board.playable_columns, bitboard.playable_columns)
+                self.assertEqual(board.get_move_history(), bitboard.get_move_history())
+                self.assertTrue((board.get_view() == bitboard.get_view()).all())
+                self.assertEqual(GameStateAnalyzer.is_player_winning(board, player),
+                                 GameStateAnalyzer.is_player_winning(bitboard, player))
+
+                player = 3 - player
@@ -1,6 +1,9 @@
 import unittest
+from copy import deepcopy
 
-from src.domain.board import Board, BoardFullColumnDropException
+import numpy as np
+
+from src.domain.board import Board, BoardFullColumnDropException, BoardEmptyUndoException
 from test.config import settings
 
 class BoardTest(unittest.TestCase):
@@ -51,6 +54,25 @@ class BoardTest(unittest.TestCase):
         self.assertTrue(self.board.is_valid_move(2))
         self.assertTrue(self.board.is_valid_move(3))
 
+    def test_pop_piece(self):
+        with self.assertRaises(BoardEmptyUndoException):
+            self.board.pop_piece()
+
+        self.board.drop_piece(1, 1)
+        self.board.drop_piece(1, 2)
+        self.board.drop_piece(3, 1)
+
+        self.assertEqual(self.board.pop_piece(), 3)
+        self.assertEqual(self.board[3][3], 0)
+        self.assertEqual(self.board.get_top_occupied_row_index(3), 4)
+
+        self.assertEqual(self.board.pop_piece(), 1)
+        self.assertEqual(self.board[2][1], 0)
+        self.assertEqual(self.board[3][1], 1)
+
+        self.board.drop_piece(1, 2)
+        self.assertEqual(self.board[2][1], 2)
+
     def test_get_valid_moves(self):
         for _ in range(3):
             self.board.drop_piece(0, 1)
@@ -60,3 +82,51 @@ class BoardTest(unittest.TestCase):
         self.board.drop_piece(0, 1)
         self.assertEqual(len(self.board.get_valid_moves()), 3)
         self.assertNotIn(0, self.board.get_valid_moves())
+
+    def test_view(self):
+        view = self.board.get_view()
+        self.assertEqual(view.dtype, np.int8)
+
+        with self.assertRaises(ValueError):
+            view[3][0] = 1
+
+        """ The view follows the board, it is not a copy """
+        self.board.drop_piece(0, 2)
+        self.assertEqual(view[3][0], 2)
+
+        with self.assertRaises(ValueError):
+            self.board[3][0] = 1
+
+        copied_board = deepcopy(self.board)
+        copied_board.drop_piece(1, 1)
+        self.assertEqual(copied_board.get_view()[3][1], 1)
+        self.assertEqual(view[3][1], 0)
+
+    def test_column_heights_and_history(self):
+        self.board.drop_piece(2, 1)
+        self.board.drop_piece(2, 2)
+        self.board.drop_piece(0, 1)
+
+        self.assertEqual([self.board.get_column_height(column_index) for column_index in range(4)], [1, 0, 2, 0])
+        self.assertEqual(self.board.get_move_history(), (2, 2, 0))
+
+        self.board.pop_piece()
+        self.assertEqual(self.board.get_move_history(), (2, 2))
+
+    def test_playable_columns(self):
+        self.assertEqual(self.board.playable_columns, 0b1111)
+
+        for _ in range(4):
+            self.board.drop_piece(1, 1)
+        self.assertEqual(self.board.playable_columns, 0b1101)
+        self.assertEqual(self.board.get_valid_moves(), (0, 2, 3))
+
+        """ The cached moves are returned without a copy, and can not be changed """
+        self.assertIs(self.board.get_valid_moves(), self.board.get_valid_moves())
+
+        with self.assertRaises(AttributeError):
+            self.board.get_valid_moves().remove(0)
+
+        self.board.pop_piece()
+        self.assertEqual(self.board.playable_columns, 0b1111)
+        self.assertEqual(self.board.get_valid_moves(), (0, 1, 2, 3))
@@ -0,0 +1,47 @@
+from src.domain.board import Board
+from src.service.game_state_analyzer import GameStateAnalyzer
+
+""" The evaluation settings used by the evaluator tests """
+SEQUENCE_SCORES = [100, 5, 2, -5]
+CENTER_MULTIPLIER = 3
+
+def score_board(board, player, opponent, sequence_length):
+    """ Scores every window of the board from scratch """
+    score = list(board[:, board.width // 2]).count(player) * CENTER_MULTIPLIER
+
+    for window in GameStateAnalyzer.get_window_indices(board.width, board.height, sequence_length):
+        sequence = list(board[:].flatten()[window])
+
+        if sequence.count(player) == sequence_length - 1 and sequence.count(0) == 1:
+            score += SEQUENCE_SCORES[1]
+        elif sequence.count(player) == sequence_length - 2 and sequence.count(0) == 2:
+            score += SEQUENCE_SCORES[2]
+        elif sequence.count(opponent) == sequence_length - 1 and sequence.count(0) == 1:
+            score += SEQUENCE_SCORES[3]
+
+    return score
+
+def drop_random_pieces(board, generator, moves):
+    """
+    Drops pieces in random columns, players 1 and 2 alternating,
+    yielding the (column, player) of every drop once it is made
+
+    :param generator: the source of the random columns (seeded by the tests)
+    :tparam generator: random.Random
+    """
+    for move_index in range(moves):
+        column_index = generator.choice(board.get_valid_moves())
+        player = move_index % 2 + 1
+
+        board.drop_piece(column_index, player)
+
+        yield column_index, player
+
+def get_random_board(width, height, generator, moves):
+    """ Returns a board with pieces dropped in random columns (see drop_random_pieces) """
+    board = Board(width, height)
+
+    for _ in drop_random_pieces(board, generator, moves):
+        pass
+
+    return board
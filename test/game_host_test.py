@@ -0,0 +1,212 @@
+import asyncio
+import json
+import socket
+import struct
+import unittest
+
+from src.service.game_host import GameHost, HostOverloadedException, InvalidMoveException, \
+        SessionNotFoundException
+from src.service.tournament import EngineSpec
+
+def get_host(engine="random", max_queued_ai_moves=100, move_timeout=5, max_sessions=100):
+    return GameHost(EngineSpec.parse(engine), 1, max_sessions, max_queued_ai_moves, move_timeout, 10, 16, 100)
+
+class GameHostTest(unittest.TestCase):
+    def test_sessions(self):
+        async def run():
+            host = get_host()
+            await host.start()
+
+            try:
+                state = await host.create_session([2])
+                self.assertEqual(state["moves"], "")
+                self.assertEqual(state["to_move"], 1)
+
+                """ The AI replies before the move returns """
+                state = await host.make_move(state["session"], 3)
+                self.assertEqual(len(state["moves"]), 2)
+                self.assertEqual(state["moves"][0], "4")
+                self.assertEqual(state["to_move"], 1)
+
+                """ The AI moves first """
+                ai_first_state = await host.create_session([1])
+                self.assertEqual(len(ai_first_state["moves"]), 1)
+                self.assertEqual(ai_first_state["to_move"], 2)
+
+                with self.assertRaises(InvalidMoveException):
+                    await host.make_move(state["session"], 7)
+                with self.assertRaises(InvalidMoveException):
+                    await host.create_session([3])
+                with self.assertRaises(SessionNotFoundException):
+                    await host.make_move(100, 0)
+
+                """ Two humans, the moves alternate """
+                humans_state = await host.create_session([])
+                for column_index in (0, 1, 0, 1, 0, 1):
+                    await host.make_move(humans_state["session"], column_index)
+
+                humans_state = await host.make_move(humans_state["session"], 0)
+                self.assertEqual(humans_state["winner"], 1)
+                self.assertIsNone(humans_state["to_move"])
+
+                with self.assertRaises(InvalidMoveException):
+                    await host.make_move(humans_state["session"], 2)
+
+                """ AI against AI, played to the end """
+                ai_state = await host.create_session([1, 2])
+                self.assertTrue(ai_state["winner"] is not None or ai_state["is_draw"])
+
+                metrics = host.get_metrics()
+                host.close_session(state["session"])
+
+                with self.assertRaises(SessionNotFoundException):
+                    await host.make_move(state["session"], 0)
+            finally:
+                await host.close()
+
+            return metrics
+
+        metrics = asyncio.run(run())
+
+        self.assertEqual(metrics["sessions"], 4)
+        self.assertEqual(metrics["human_moves"], 8)
+        self.assertGreaterEqual(metrics["ai_moves"], 2 + 7)
+        self.assertEqual(metrics["queue_depth"], 0)
+        self.assertEqual(metrics["timed_out_ai_moves"], 0)
+        self.assertGreater(metrics["move_latency_ms"]["p50"], 0)
+        self.assertGreaterEqual(metrics["move_latency_ms"]["max"], metrics["move_latency_ms"]["p95"])
+
+    def test_deadline(self):
+        async def run():
+            host = get_host("minimax:9", move_timeout=0.01)
+            await host.start()
+
+            try:
+                state = await host.create_session([2])
+                state = await host.make_move(state["session"], 3)
+            finally:
+                await host.close()
+
+            return state, host.get_metrics()
+
+        state, metrics = asyncio.run(run())
+
+        """ A random move was played in time """
+        self.assertEqual(len(state["moves"]), 2)
+        self.assertEqual(metrics["timed_out_ai_moves"], 1)
+        self.assertLess(metrics["move_latency_ms"]["max"], 500)
+
+    def test_back_pressure(self):
+        async def run():
+            host = get_host("minimax:4", max_queued_ai_moves=2, max_sessions=3)
+            await host.start()
+
+            try:
+                results = await asyncio.gather(*(host.create_session([1]) for _ in range(6)),
+                                               return_exceptions=True)
+
+                """ Past max_sessions, with or without AI turns """
+                await host.create_session([])
+                with self.assertRaises(HostOverloadedException):
+                    await host.create_session([])
+
+                metrics = host.get_metrics()
+            finally:
+                await host.close()
+
+            return results, metrics
+
+        results, metrics = asyncio.run(run())
+        rejected = [result for result in results if isinstance(result, HostOverloadedException)]
+
+        """ The turns are queued before the worker takes any, the queue holds two """
+        self.assertEqual(len(rejected), 4)
+        self.assertEqual(metrics["ai_moves"], 2)
+        self.assertEqual(metrics["sessions"], 3)
+        self.assertEqual(metrics["rejected_requests"], 5)
+
+    def test_connection_reset(self):
+        async def run():
+            host = get_host("minimax:10")
+            await host.start()
+            _, port = await host.listen("127.0.0.1", 0)
+
+            try:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+                for request_id in range(3):
+                    writer.write(json.dumps({"id": request_id, "op": "new", "ai_players": [1]}).encode() + b"\n")
+                await writer.drain()
+                await asyncio.sleep(0.05)
+
+                """ Resets the connection (RST) while the first search runs """
+                writer.get_extra_info("socket").setsockopt(socket.SOL_SOCKET, socket.SO_LINGER,
+                                                          struct.pack("ii", 1, 0))
+                writer.transport.abort()
+                await asyncio.sleep(0.05)
+
+                """ The dispatcher survived, the next AI turn is played """
+                state = await asyncio.wait_for(host.create_session([2]), 10)
+                state = await asyncio.wait_for(host.make_move(state["session"], 0), 10)
+                metrics = host.get_metrics()
+            finally:
+                await host.close()
+
+            return state, metrics
+
+        state, metrics = asyncio.run(run())
+
+        self.assertEqual(len(state["moves"]), 2)
+        self.assertEqual(metrics["sessions"], 1)
+        self.assertEqual(metrics["queue_depth"], 0)
+
+    def test_server(self):
+        async def send(reader, writer, request):
+            writer.write(json.dumps(request).encode() + b"\n")
+            await writer.drain()
+
+            return json.loads(await reader.readline())
+
+        async def run():
+            host = get_host()
+            await host.start()
+            _, port = await host.listen("127.0.0.1", 0)
+
+            try:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+                state = await send(reader, writer, {"id": 1, "op": "new", "ai_players": [2]})
+                moved_state = await send(reader, writer,
+                                         {"id": 2, "op": "move", "session": state["session"], "column": 4})
+                errors = [await send(reader, writer, request) for request in (
+                    {"id": 3, "op": "move", "session": state["session"], "column": 8},
+                    {"id": 4, "op": "move", "session": 100, "column": 1},
+                    {"id": 5, "op": "jump"},
+                    {"id": 6, "op": "new", "move_timeout_ms": 60000},
+                )]
+                metrics = await send(reader, writer, {"id": 7, "op": "metrics"})
+
+                writer.close()
+                await asyncio.sleep(0.1)
+
+                """ The sessions of a connection end with it """
+                sessions_after_disconnect = host.get_metrics()["sessions"]
+            finally:
+                await host.close()
+
+            return state, moved_state, errors, metrics, sessions_after_disconnect
+
+        state, moved_state, errors, metrics, sessions_after_disconnect = asyncio.run(run())
+
+        self.assertEqual(state["id"], 1)
+        self.assertEqual(state["to_move"], 1)
+        self.assertEqual(moved_state["id"], 2)
+        self.assertEqual(moved_state["moves"][0], "4")
+        self.assertEqual(len(moved_state["moves"]), 2)
+
+        self.assertEqual([error["id"] for error in errors], [3, 4, 5, 6])
+        self.assertTrue(all("error" in error for error in errors))
+
+        self.assertEqual(metrics["sessions"], 1)
+        self.assertEqual(metrics["ai_moves"], 1)
+        self.assertEqual(sessions_after_disconnect, 0)
@@ -0,0 +1,148 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.domain.board import Board
+from src.service.game import Game
+from src.service.game_record import GameRecord, GameRecordShard, GameRecordWriter, \
+        GameRecordException, GameRecordFormatException
+from src.ai.random_ai import RandomAI
+from src.controller.master_controller import MasterController
+from test.master_controller_test import FakeUI, WinnerException
+from test.config import settings
+
+GAMES = [
+    ((3, 3, 2, 4, 1, 5, 0), 1),
+    ((0, 1, 0, 1, 0, 1, 6, 1), 2),
+    ((3, 3, 2, 4, 4, 2), GameRecord.DRAW),
+    ((), GameRecord.DRAW),
+]
+
+class GameRecordTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write_games(self, games, shard_size=1 << 20, width=7):
+        with GameRecordWriter(self.directory, width, 6, 4, 2, shard_size) as writer:
+            for moves, result in games:
+                writer.write(moves, result)
+
+        return GameRecordWriter.get_shard_names(self.directory)
+
+    def test_encode_game(self):
+        """ 3 header bytes, then 2 moves per byte """
+        self.assertEqual(GameRecordWriter.encode_game((3, 4, 15), 2), b"\x02\x03\x00\x43\x0f")
+        self.assertEqual(len(GameRecordWriter.encode_game((0,) * 42, GameRecord.DRAW)), 3 + 21)
+
+    def test_read_games(self):
+        shard_names = self.write_games(GAMES)
+        self.assertEqual(len(shard_names), 1)
+
+        shard = GameRecordShard(shard_names[0])
+
+        self.assertEqual((shard.width, shard.height, shard.winning_sequence_length, shard.number_of_players),
+                         (7, 6, 4, 2))
+        self.assertEqual(len(shard), len(GAMES))
+        self.assertEqual([(game.moves, game.result) for game in shard], GAMES)
+        self.assertEqual(shard.get_game(1).moves, GAMES[1][0])
+
+        self.assertEqual([game.moves for game in shard.find_by_result(GameRecord.DRAW)], [GAMES[2][0], ()])
+        self.assertEqual([game.moves for game in shard.find_by_result(3)], [])
+
+        self.assertEqual([game.moves for game in shard.find_by_opening([3, 3, 2, 4])],
+                         [GAMES[0][0], GAMES[2][0]])
+        self.assertEqual([game.moves for game in shard.find_by_opening([3, 3, 2, 4, 1])], [GAMES[0][0]])
+        self.assertEqual([game.moves for game in shard.find_by_opening([0])], [GAMES[1][0]])
+        self.assertEqual(len(list(shard.find_by_opening([]))), len(GAMES))
+
+        shard.close()
+
+    def test_append_and_shards(self):
+        self.write_games(GAMES[:2])
+        shard_names = self.write_games(GAMES[2:])
+
+        """ The second writer appends to the same shard """
+        self.assertEqual(len(shard_names), 1)
+        self.assertEqual(len(GameRecordShard(shard_names[0])), len(GAMES))
+
+        """ Another board shape starts a new shard """
+        shard_names = self.write_games(GAMES[:1], width=5)
+        self.assertEqual(len(shard_names), 2)
+        self.assertEqual(GameRecordShard(shard_names[1]).width, 5)
+
+        """ Small shards hold one game each """
+        shutil.rmtree(self.directory)
+        shard_names = self.write_games(GAMES, shard_size=1)
+
+        self.assertEqual(len(shard_names), len(GAMES))
+        self.assertEqual([list(GameRecordShard(shard_name))[0].result for shard_name in shard_names],
+                         [result for _, result in GAMES])
+
+        """ A removed shard leaves a gap, the next shard comes after the last one """
+        os.remove(shard_names[1])
+        shard_names = self.write_games(GAMES[:1], shard_size=1)
+
+        self.assertEqual(os.path.basename(shard_names[-1]), GameRecordWriter.SHARD_NAME_FORMAT.format(len(GAMES)))
+        self.assertEqual(len(GameRecordShard(shard_names[-2])), 1)
+
+    def test_truncated_and_invalid_files(self):
+        shard_name = self.write_games(GAMES[:2])[0]
+
+        with open(shard_name, "ab") as shard_file:
+            shard_file.write(GameRecordWriter.encode_game((1, 2, 3, 4), 1)[:-1])
+
+        self.assertEqual(len(GameRecordShard(shard_name)), 2)
+
+        """ Appending after a cut short game drops it """
+        self.write_games(GAMES[2:])
+        shard = GameRecordShard(shard_name)
+
+        self.assertEqual([(game.moves, game.result) for game in shard], GAMES)
+        self.assertEqual(shard.get_size(), os.path.getsize(shard_name))
+        shard.close()
+
+        with open(shard_name, "wb") as shard_file:
+            shard_file.write(b"not a shard file")
+
+        with self.assertRaises(GameRecordFormatException):
+            GameRecordShard(shard_name)
+
+        with self.assertRaises(GameRecordException):
+            GameRecordWriter(self.directory, 17, 6, 4, 2, 1 << 20)
+        with self.assertRaises(GameRecordException):
+            GameRecordWriter(self.directory, 7, 256, 4, 2, 1 << 20)
+        with self.assertRaises(GameRecordException):
+            GameRecordWriter(self.directory, 7, 6, 300, 2, 1 << 20)
+        with self.assertRaises(GameRecordException):
+            GameRecordWriter(self.directory, 7, 6, 4, 256, 1 << 20)
+        with self.assertRaises(GameRecordException):
+            GameRecordWriter.encode_game((3, 4), 256)
+
+    def test_replay(self):
+        moves, result = GAMES[0]
+        board = Board(7, 6)
+        game = Game(board)
+
+        for column_index, player in GameRecord(moves, result, 2).replay(Board(7, 6)):
+            game.make_move(column_index, player)
+
+        self.assertEqual(game.get_winner(), result)
+
+    def test_master_controller_recording(self):
+        board = Board(7, 6)
+        game = Game(board)
+
+        with GameRecordWriter(self.directory, 7, 6, 4, 2, 1 << 20) as writer:
+            controller = MasterController(board, game, RandomAI, FakeUI(), {"PLAYER_1", "PLAYER_2"}, writer)
+
+            with self.assertRaises(WinnerException):
+                controller.run()
+
+        recorded_game = list(GameRecordShard(GameRecordWriter.get_shard_names(self.directory)[0]))[0]
+
+        self.assertEqual(recorded_game.moves, board.get_move_history())
+        self.assertEqual(recorded_game.result, game.get_winner() or GameRecord.DRAW)
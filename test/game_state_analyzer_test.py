@@ -1,5 +1,7 @@
 import unittest
 
+import numpy as np
+
 from src.domain.board import Board, BoardFullColumnDropException
 from src.service.game_state_analyzer import GameStateAnalyzer
 
@@ -66,3 +68,37 @@ class GameStateAnalyzerTest(unittest.TestCase):
 
         self.assertTrue(GameStateAnalyzer.is_player_winning(self.negative_slope, 1))
         self.assertFalse(GameStateAnalyzer.is_player_winning(self.negative_slope, 2))
+
+    def test_is_winning_move(self):
+        self.assertTrue(GameStateAnalyzer.is_winning_move(self.horizontal, 3, 3, 1))
+        self.assertTrue(GameStateAnalyzer.is_winning_move(self.horizontal, 3, 1, 1))
+        self.assertFalse(GameStateAnalyzer.is_winning_move(self.horizontal, 3, 1, 2))
+
+        self.assertTrue(GameStateAnalyzer.is_winning_move(self.vertical, 0, 0, 1))
+        self.assertTrue(GameStateAnalyzer.is_winning_move(self.positive_slope, 0, 3, 1))
+        self.assertTrue(GameStateAnalyzer.is_winning_move(self.negative_slope, 0, 0, 1))
+        self.assertTrue(GameStateAnalyzer.is_winning_move(self.negative_slope, 3, 3, 1))
+
+        self.assertFalse(GameStateAnalyzer.is_winning_move(self.positive_slope, 1, 3, 2))
+
+    def test_get_window_indices(self):
+        self.assertEqual(GameStateAnalyzer.get_window_indices(7, 6, 4).shape, (69, 4))
+        self.assertEqual(GameStateAnalyzer.get_window_indices(4, 4, 4).shape, (10, 4))
+        self.assertEqual(GameStateAnalyzer.get_window_indices(3, 3, 4).shape, (0, 4))
+
+    def test_no_wrapping_sequences(self):
+        wrapping = Board(4, 4)
+        for column_index, players in enumerate([[2, 2, 2, 1], [1], [2, 1], [2, 2, 1]]):
+            for player in players:
+                wrapping.drop_piece(column_index, player)
+
+        self.assertFalse(GameStateAnalyzer.is_player_winning(wrapping, 1))
+
+    def test_is_player_winning_batch(self):
+        boards = [self.empty, self.vertical, self.horizontal, self.positive_slope, self.negative_slope]
+        stacked_boards = np.stack([board[:] for board in boards])
+
+        self.assertEqual(list(GameStateAnalyzer.is_player_winning_batch(stacked_boards, 1)),
+                         [False, True, True, True, True])
+        self.assertEqual(list(GameStateAnalyzer.is_player_winning_batch(stacked_boards, 2)),
+                         [False] * len(boards))
@@ -30,3 +30,20 @@ class GameTest(unittest.TestCase):
 
         with self.assertRaises(GameAlreadyEndedException):
             self.game.make_move(0, 1)
+
+    def test_draw(self):
+        board = Board(2, 2)
+        game = Game(board)
+
+        game.make_move(0, 1)
+        game.make_move(0, 2)
+        game.make_move(1, 1)
+        self.assertFalse(game.is_over())
+
+        game.make_move(1, 2)
+        self.assertTrue(game.is_draw())
+        self.assertTrue(game.is_over())
+        self.assertIsNone(game.get_winner())
+
+        with self.assertRaises(GameAlreadyEndedException):
+            game.make_move(0, 1)
@@ -0,0 +1,49 @@
+import random
+import unittest
+
+from src.ai.incremental_evaluator import IncrementalEvaluator
+from src.domain.board import Board
+from src.service.game_state_analyzer import GameStateAnalyzer
+from test.config import settings
+from test.evaluator_fixtures import SEQUENCE_SCORES, CENTER_MULTIPLIER, score_board, drop_random_pieces
+
+class IncrementalEvaluatorTest(unittest.TestCase):
+    def test_get_cell_windows(self):
+        cell_windows = IncrementalEvaluator.get_cell_windows(7, 6, 4)
+
+        """ A corner is in 1 horizontal, 1 vertical and 1 diagonal window """
+        self.assertEqual(len(cell_windows[0]), 3)
+        self.assertEqual(sum(len(windows) for windows in cell_windows),
+                         GameStateAnalyzer.get_window_indices(7, 6, 4).size)
+
+    def test_initial_score(self):
+        board = Board(7, 6)
+        evaluator = IncrementalEvaluator(board, 1, 2, 4, CENTER_MULTIPLIER, SEQUENCE_SCORES)
+        self.assertEqual(evaluator.get_score(), 0)
+
+        for column_index in [3, 3, 2, 4, 2]:
+            board.drop_piece(column_index, 1 if column_index != 4 else 2)
+
+        evaluator = IncrementalEvaluator(board, 1, 2, 4, CENTER_MULTIPLIER, SEQUENCE_SCORES)
+        self.assertEqual(evaluator.get_score(), score_board(board, 1, 2, 4))
+
+    def test_drop_and_pop(self):
+        generator = random.Random(0)
+
+        for width, height, sequence_length in [(7, 6, 4), (5, 4, 3), (9, 7, 5)]:
+            board = Board(width, height)
+            evaluator = IncrementalEvaluator(board, 2, 1, sequence_length, CENTER_MULTIPLIER, SEQUENCE_SCORES)
+            scores = [evaluator.get_score()]
+
+            for column_index, player in drop_random_pieces(board, generator, width * height // 2):
+                evaluator.drop_piece(board.get_top_occupied_row_index(column_index), column_index, player)
+
+                self.assertEqual(evaluator.get_score(), score_board(board, 2, 1, sequence_length))
+                scores.append(evaluator.get_score())
+
+            while scores:
+                self.assertEqual(evaluator.get_score(), scores.pop())
+
+                if scores:
+                    board.pop_piece()
+                    evaluator.pop_piece()
@@ -1,11 +1,15 @@
 import unittest
 from copy import deepcopy
+from unittest.mock import patch
 
 from test.config import settings
+import config
 
 from src.domain.board import Board
 from src.service.game import Game
 from src.ai.random_ai import RandomAI
+from src.ai.minimax_ai import MiniMaxAI
+from src.ai.search_context import SearchTimeoutException
 from src.controller.master_controller import MasterController
 
 class WinnerException(Exception):
@@ -22,9 +26,49 @@ class FakeUI():
     def get_move(self, _x, _y):
         pass
 
+    def display_thinking(self, _x, _y):
+        return True
+
     def display_winner(self, winner):
         raise WinnerException(winner)
 
+    def display_draw(self):
+        raise WinnerException(None)
+
+class CancellingUI(FakeUI):
+    """ Cancels every AI search """
+    def display_thinking(self, _x, _y):
+        return False
+
+class InterruptedUI(FakeUI):
+    """ Gets a Ctrl+C while polling every AI search """
+    def display_thinking(self, _x, _y):
+        raise KeyboardInterrupt
+
+class HumanUI(FakeUI):
+    """ Plays the first valid move for the human players """
+    def get_move(self, _x, valid_moves):
+        return valid_moves[0]
+
+class PonderingAI(RandomAI):
+    """ Counts the ponder calls """
+    ponder_calls = 0
+
+    @staticmethod
+    def ponder(board, player, stop_event):
+        PonderingAI.ponder_calls += 1
+
+class StoppableAI:
+    """ Searches until it is stopped """
+    stopped_searches = 0
+
+    @staticmethod
+    def get_move(board, player, stop_event=None):
+        stop_event.wait()
+        StoppableAI.stopped_searches += 1
+
+        raise SearchTimeoutException
+
 class MasterControllerTest(unittest.TestCase):
     def setUp(self):
         self.board = Board(7, 6)
@@ -40,3 +84,63 @@ class MasterControllerTest(unittest.TestCase):
             self.controller.run()
         except WinnerException as winner_ex:
             self.assertEqual(winner_ex.winner, self.game.get_winner())
+
+    def test_run_draw(self):
+        board = Board(2, 2)
+        game = Game(board)
+        controller = MasterController(board, game, self.ai_engine, self.ui, {"PLAYER_1", "PLAYER_2"})
+
+        with self.assertRaises(WinnerException) as winner_ex:
+            controller.run()
+
+        self.assertIsNone(winner_ex.exception.winner)
+        self.assertTrue(game.is_draw())
+
+    def test_cancel_ai_move(self):
+        board = Board(2, 2)
+        game = Game(board)
+        controller = MasterController(board, game, StoppableAI, CancellingUI(), {"PLAYER_1", "PLAYER_2"})
+
+        with self.assertRaises(WinnerException):
+            controller.run()
+
+        """ The cancelled searches are replaced by random moves """
+        self.assertEqual(StoppableAI.stopped_searches, 4)
+        self.assertTrue(game.is_draw())
+
+    def test_interrupt_ai_move(self):
+        board = Board(2, 2)
+        game = Game(board)
+        controller = MasterController(board, game, StoppableAI, InterruptedUI(), {"PLAYER_1", "PLAYER_2"})
+
+        StoppableAI.stopped_searches = 0
+
+        """ Ctrl+C cancels the searches instead of ending the program """
+        with self.assertRaises(WinnerException):
+            controller.run()
+
+        self.assertEqual(StoppableAI.stopped_searches, 4)
+        self.assertTrue(game.is_draw())
+
+    def test_ponder(self):
+        with patch.dict(config.settings["game"], {"PONDER": True}):
+            board = Board(7, 6)
+            game = Game(board)
+            controller = MasterController(board, game, PonderingAI, HumanUI(), {"PLAYER_2"})
+
+            with self.assertRaises(WinnerException):
+                controller.run()
+
+            """ The AI pondered during every human move """
+            self.assertEqual(PonderingAI.ponder_calls, (len(board.get_move_history()) + 1) // 2)
+
+            board = Board(7, 6)
+            game = Game(board)
+            controller = MasterController(board, game, MiniMaxAI, HumanUI(), {"PLAYER_2"})
+
+            with self.assertRaises(WinnerException):
+                controller.run()
+
+            self.assertTrue(game.is_over())
+
+        MiniMaxAI.clear_transposition_table()
@@ -0,0 +1,126 @@
+import random
+import unittest
+from threading import Event
+from unittest.mock import patch
+
+from src.ai.mcts_ai import MCTSAI, MCTSPosition
+from src.domain.board import Board
+from src.service.game import Game
+from src.service.game_state_analyzer import GameStateAnalyzer
+from test.config import settings
+import config
+
+class MCTSAITest(unittest.TestCase):
+    def setUp(self):
+        MCTSAI.clear_tree()
+
+        """ The playouts are random, seeded so the searched moves do not change between runs """
+        random.seed(0)
+
+    def test_position(self):
+        board = Board(7, 6)
+        for column_index, player in [(3, 1), (3, 2), (4, 1), (2, 3)]:
+            board.drop_piece(column_index, player)
+
+        position = MCTSPosition.from_board(board, 3, 4)
+
+        self.assertEqual(position.player_masks[1], (1 << 3 * 7) | (1 << 4 * 7))
+        self.assertEqual(position.player_masks[2], 1 << 3 * 7 + 1)
+        self.assertEqual(position.player_masks[3], 1 << 2 * 7)
+        self.assertEqual(position.column_heights, [0, 0, 1, 2, 1, 0, 0])
+        self.assertEqual(position.moves, 4)
+        self.assertEqual(position.get_next_player(3), 1)
+
+        copy = position.copy()
+        copy.play(0, 2)
+        self.assertEqual(position.column_heights[0], 0)
+        self.assertEqual(position.player_masks[2], 1 << 3 * 7 + 1)
+
+        copy.undo(0, 2)
+        self.assertEqual(copy.player_masks, position.player_masks)
+
+    def test_is_winning(self):
+        """ Random boards, compared with GameStateAnalyzer """
+        for winning_sequence_length in range(2, 7):
+            with patch.dict(config.settings["game"], {"WINNING_SEQUENCE_LENGTH": winning_sequence_length}):
+                for seed in range(30):
+                    board = Board(8, 7)
+                    moves = (seed * 7919) % 40 + 5
+
+                    for move_index in range(moves):
+                        valid_moves = board.get_valid_moves()
+                        board.drop_piece(valid_moves[(seed + move_index * 31) % len(valid_moves)],
+                                         move_index % 2 + 1)
+
+                    position = MCTSPosition.from_board(board, 2, winning_sequence_length)
+
+                    for player in (1, 2):
+                        self.assertEqual(position.is_winning(player),
+                                         GameStateAnalyzer.is_player_winning(board, player))
+
+    def test_get_move(self):
+        board = Board(7, 6)
+        for column_index in range(3):
+            board.drop_piece(column_index, 1)
+
+        """ Wins right away """
+        self.assertEqual(MCTSAI.get_move(board, 1), 3)
+
+        """ Blocks the three in a row """
+        self.assertEqual(MCTSAI.get_move(board, 2), 3)
+
+        board = Board(2, 2)
+        for column_index, player in [(0, 1), (0, 2), (1, 1), (1, 2)]:
+            board.drop_piece(column_index, player)
+
+        self.assertIsNone(MCTSAI.get_move(board, 1))
+
+    def test_tree_reuse(self):
+        board = Board(7, 6)
+
+        column_index = MCTSAI.get_move(board, 1)
+        statistics = MCTSAI.get_search_statistics()
+
+        self.assertEqual(statistics["playouts"], config.settings["ai"]["mcts"]["PLAYOUTS"])
+        self.assertEqual(statistics["reused_playouts"], 0)
+        self.assertGreater(statistics["playouts_per_second"], 0)
+
+        board.drop_piece(column_index, 1)
+        board.drop_piece(column_index, 2)
+
+        MCTSAI.get_move(board, 1)
+        self.assertGreater(MCTSAI.get_search_statistics()["reused_playouts"], 0)
+
+        """ A position the game did not reach from the kept root """
+        MCTSAI.get_move(Board(7, 6), 1)
+        self.assertEqual(MCTSAI.get_search_statistics()["reused_playouts"], 0)
+
+    def test_budget(self):
+        board = Board(7, 6)
+
+        with patch.dict(config.settings["ai"]["mcts"], {"MOVE_TIME_MS": 100}):
+            MCTSAI.get_move(board, 1)
+            statistics = MCTSAI.get_search_statistics()
+
+            """ Only the lower bound, a loaded machine can take longer """
+            self.assertGreaterEqual(statistics["elapsed_time"], 0.1)
+
+        stop_event = Event()
+        stop_event.set()
+
+        MCTSAI.clear_tree()
+        self.assertIn(MCTSAI.get_move(board, 1, stop_event), range(7))
+        self.assertEqual(MCTSAI.get_search_statistics()["playouts"], 0)
+
+    def test_three_players(self):
+        with patch.dict(config.settings["game"], {"NUMBER_OF_PLAYERS": 3}), \
+             patch.dict(config.settings["ai"]["mcts"], {"PLAYOUTS": 300}):
+            board = Board(7, 6)
+            game = Game(board)
+            player = 1
+
+            while not game.is_over():
+                game.make_move(MCTSAI.get_move(board, player), player)
+                player = player % 3 + 1
+
+            self.assertTrue(game.is_draw() or game.get_winner() in (1, 2, 3))
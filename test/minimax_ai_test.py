@@ -1,12 +1,19 @@
 import unittest
+from threading import Event, Thread
+from time import perf_counter, sleep
+from unittest.mock import patch
 
 from src.ai.random_ai import RandomAI
 from src.ai.minimax_ai import MiniMaxAI
+from src.ai.root_parallel_search import RootParallelSearch
+from src.ai.lazy_smp_search import LazySMPSearch
+from src.ai.search_context import SearchTimeoutException
 
 from src.service.game import Game
 from src.domain.board import Board
 
 from test.config import settings
+import config
 
 def player_turn_sequence_generator():
     current_player = 1
@@ -27,7 +34,7 @@ class NoUI_Random_VS_MinimaxController:
         self.player_turn_iterator = player_turn_sequence_generator()
 
     def run(self):
-        while self.game.get_winner() is None:
+        while not self.game.is_over():
             current_player = next(self.player_turn_iterator)
 
             if current_player == 1:
@@ -110,3 +117,245 @@ class MiniMaxAITest(unittest.TestCase):
                 self.board.drop_piece(column_index, 3)
 
         self.assertIsNone(MiniMaxAI.get_move(self.board, 2))
+
+    def test_move_time_budget(self):
+        board = Board(7, 6)
+        board.drop_piece(3, 1)
+        board.drop_piece(3, 2)
+
+        with patch.dict(config.settings["ai"]["minimax"], {"MOVE_TIME_MS": 300}):
+            start_time = perf_counter()
+            column_index = MiniMaxAI.get_move(board, 1)
+            elapsed_time = perf_counter() - start_time
+
+        self.assertIn(column_index, board.get_valid_moves())
+        self.assertLess(elapsed_time, 1)
+
+        """ The searched board is left unchanged """
+        self.assertEqual(board.get_top_occupied_row_index(3), 4)
+
+    def test_parallel_search(self):
+        board = Board(7, 6)
+        for column_index, player in [(3, 1), (3, 2), (2, 1), (4, 2), (4, 1)]:
+            board.drop_piece(column_index, player)
+
+        try:
+            with patch.dict(config.settings["ai"]["minimax"], {"WORKERS": 2}):
+                moves = [MiniMaxAI.get_move(board, 2) for _ in range(3)]
+                self.assertEqual(MiniMaxAI.get_move(self.board, 2), 3)
+
+                with patch.dict(config.settings["ai"]["minimax"], {"MOVE_TIME_MS": 300}):
+                    self.assertIn(MiniMaxAI.get_move(board, 2), board.get_valid_moves())
+
+                """ The workers stop with the stop event of the calling process """
+                stop_event = Event()
+                stop_event.set()
+                start_time = perf_counter()
+
+                with self.assertRaises(SearchTimeoutException):
+                    RootParallelSearch.search(MiniMaxAI, board, 2, 12, 2, stop_event=stop_event)
+
+                self.assertLess(perf_counter() - start_time, 1)
+
+                """ The settings changed after the workers were started are used by the workers """
+                empty_board = Board(7, 6)
+                with patch.dict(config.settings["ai"]["minimax"], {"DEPTH": 2, "CENTER_ARRAY_SCORE_MULTIPLIER": -50}):
+                    parallel_move = MiniMaxAI.get_move(empty_board, 1)
+
+                    with patch.dict(config.settings["ai"]["minimax"], {"WORKERS": 1}):
+                        MiniMaxAI.clear_transposition_table()
+                        self.assertEqual(parallel_move, MiniMaxAI.get_move(empty_board, 1))
+
+                self.assertNotEqual(parallel_move, 3)
+        finally:
+            RootParallelSearch.shutdown()
+
+        """ Results at a fixed depth do not depend on worker scheduling """
+        self.assertEqual(len(set(moves)), 1)
+        self.assertIn(moves[0], board.get_valid_moves())
+
+    def test_lazy_smp_search(self):
+        board = Board(7, 6)
+        for column_index, player in [(3, 1), (3, 2), (2, 1), (4, 2), (4, 1)]:
+            board.drop_piece(column_index, player)
+
+        try:
+            with patch.dict(config.settings["ai"]["minimax"], {"WORKERS": 2, "PARALLEL_MODE": "LAZY_SMP"}):
+                self.assertIn(MiniMaxAI.get_move(board, 2), board.get_valid_moves())
+                self.assertIn(MiniMaxAI.get_move(self.board, 2), self.board.get_valid_moves())
+
+                """ The shared table is only installed during the search """
+                self.assertIsNone(MiniMaxAI._MiniMaxAI__installed_transposition_table)
+        finally:
+            LazySMPSearch.shutdown()
+
+    def test_batched_leaf_evaluation(self):
+        board = Board(7, 6)
+        for column_index, player in [(3, 1), (3, 2), (2, 1), (4, 2), (4, 1), (1, 2)]:
+            board.drop_piece(column_index, player)
+
+        for depth in range(1, 5):
+            MiniMaxAI.clear_transposition_table()
+            score = MiniMaxAI.search_position(board, 1, depth)[MiniMaxAI.SCORE_INDEX]
+
+            with patch.dict(config.settings["ai"]["minimax"], {"BATCHED_LEAF_EVALUATION": True}):
+                MiniMaxAI.clear_transposition_table()
+                self.assertEqual(MiniMaxAI.search_position(board, 1, depth)[MiniMaxAI.SCORE_INDEX], score)
+
+        board = Board(7, 6)
+        for column_index in range(3):
+            board.drop_piece(column_index, 1)
+
+        with patch.dict(config.settings["ai"]["minimax"], {"BATCHED_LEAF_EVALUATION": True}):
+            self.assertEqual(MiniMaxAI.get_move(board, 2), 3)
+
+    def test_active_columns_only(self):
+        board = Board(50, 50)
+        for column_index, player in [(25, 1), (25, 2), (24, 1), (26, 2), (23, 1)]:
+            board.drop_piece(column_index, player)
+
+        with patch.dict(config.settings["game"], {"BOARD_WIDTH": 50, "BOARD_HEIGHT": 50,
+                                                  "WINNING_SEQUENCE_LENGTH": 5}), \
+             patch.dict(config.settings["ai"]["minimax"], {"ACTIVE_COLUMNS_ONLY": True}):
+            MiniMaxAI.clear_transposition_table()
+            self.assertTrue(23 - 4 <= MiniMaxAI.get_move(board, 2) <= 26 + 4)
+
+            """ Blocks the four on the bottom row (22 - 25, 26 is taken) """
+            board.drop_piece(22, 1)
+            self.assertEqual(MiniMaxAI.get_move(board, 2), 21)
+
+        MiniMaxAI.clear_transposition_table()
+
+    def test_search_statistics(self):
+        board = Board(7, 6)
+        for column_index, player in [(3, 1), (3, 2), (2, 1), (4, 2)]:
+            board.drop_piece(column_index, player)
+
+        MiniMaxAI.clear_transposition_table()
+        MiniMaxAI.get_move(board, 1)
+        self.assertIsNone(MiniMaxAI.get_search_statistics())
+
+        with patch.dict(config.settings["ai"]["minimax"], {"DEPTH": 3, "COLLECT_STATISTICS": True}):
+            MiniMaxAI.clear_transposition_table()
+            MiniMaxAI.get_move(board, 1)
+
+        statistics = MiniMaxAI.get_search_statistics()
+
+        self.assertEqual(len(statistics.nodes_per_ply), 4)
+        self.assertEqual(statistics.nodes_per_ply[0], 1)
+        self.assertEqual(statistics.nodes, sum(statistics.nodes_per_ply))
+        self.assertTrue(0 < statistics.leaf_evaluations <= statistics.nodes_per_ply[3])
+        self.assertTrue(0 < statistics.first_move_cutoffs <= statistics.cutoffs)
+        self.assertTrue(0 < statistics.get_first_move_cutoff_rate() <= 1)
+        self.assertTrue(statistics.evaluation_time > 0 and statistics.win_detection_time > 0)
+        self.assertTrue(statistics.evaluation_time + statistics.win_detection_time < statistics.elapsed_time)
+        self.assertGreater(statistics.get_nodes_per_second(), 0)
+        self.assertTrue(0 < statistics.transposition_stores <= statistics.transposition_probes)
+        self.assertLessEqual(statistics.transposition_hits, statistics.transposition_probes)
+        self.assertEqual(statistics.as_dict()["nodes"], statistics.nodes)
+
+        """ The positions of the first search are found by the second one """
+        with patch.dict(config.settings["ai"]["minimax"], {"DEPTH": 3, "COLLECT_STATISTICS": True}):
+            MiniMaxAI.get_move(board, 1)
+
+        statistics = MiniMaxAI.get_search_statistics()
+        self.assertGreater(statistics.transposition_hits, 0)
+        self.assertTrue(0 < statistics.get_transposition_hit_rate() <= 1)
+        self.assertEqual(statistics.as_dict()["transposition_hits"], statistics.transposition_hits)
+
+        MiniMaxAI.clear_transposition_table()
+
+    def test_stopped_search(self):
+        class CountdownEvent:
+            """ Reports being set after a given number of checks """
+            def __init__(self, checks):
+                self.checks = checks
+
+            def is_set(self):
+                self.checks -= 1
+                return self.checks < 0
+
+        board = Board(7, 6)
+        for column_index, player in [(3, 1), (3, 2), (2, 1), (4, 2)]:
+            board.drop_piece(column_index, player)
+
+        with patch.dict(config.settings["ai"]["minimax"], {"DEPTH": 4, "COLLECT_STATISTICS": True}):
+            MiniMaxAI.clear_transposition_table()
+            column_index = MiniMaxAI.get_move(board, 1)
+            nodes = MiniMaxAI.get_search_statistics().nodes
+
+            """ Stopped at the last node, the best of the searched root moves is returned """
+            MiniMaxAI.clear_transposition_table()
+            self.assertEqual(MiniMaxAI.get_move(board, 1, CountdownEvent(nodes - 1)), column_index)
+
+            """ Stopped before a root move was searched """
+            MiniMaxAI.clear_transposition_table()
+            with self.assertRaises(SearchTimeoutException):
+                MiniMaxAI.get_move(board, 1, CountdownEvent(1))
+
+        MiniMaxAI.clear_transposition_table()
+
+    def test_ponder(self):
+        board = Board(7, 6)
+        for column_index, player in [(3, 1), (3, 2), (2, 1)]:
+            board.drop_piece(column_index, player)
+
+        MiniMaxAI.clear_transposition_table()
+
+        """ With a fixed DEPTH, pondering ends when every reply is searched to DEPTH """
+        MiniMaxAI.ponder(board, 1, Event())
+        self.assertEqual(board.get_move_history(), (3, 3, 2))
+
+        board.drop_piece(4, 2)
+
+        with patch.dict(config.settings["ai"]["minimax"], {"COLLECT_STATISTICS": True}):
+            pondered_column_index = MiniMaxAI.get_move(board, 1)
+            self.assertEqual(MiniMaxAI.get_search_statistics().nodes, 0)
+
+            MiniMaxAI.clear_transposition_table()
+            self.assertEqual(MiniMaxAI.get_move(board, 1), pondered_column_index)
+            self.assertGreater(MiniMaxAI.get_search_statistics().nodes, 0)
+
+        """ With a time budget, pondering runs until stopped """
+        with patch.dict(config.settings["ai"]["minimax"], {"MOVE_TIME_MS": 200, "PONDER_REPLIES": 2}):
+            stop_event = Event()
+            ponder_thread = Thread(target=MiniMaxAI.ponder, args=(board, 2, stop_event))
+            ponder_thread.start()
+
+            sleep(0.3)
+            self.assertTrue(ponder_thread.is_alive())
+
+            stop_event.set()
+            ponder_thread.join(1)
+            self.assertFalse(ponder_thread.is_alive())
+
+            board.drop_piece(3, 1)
+            self.assertIn(MiniMaxAI.get_move(board, 2), board.get_valid_moves())
+
+        MiniMaxAI.clear_transposition_table()
+
+    def test_analyze(self):
+        board = Board(7, 6)
+        for column_index, player in [(0, 1), (0, 2), (1, 1), (1, 2), (2, 1)]:
+            board.drop_piece(column_index, player)
+
+        MiniMaxAI.clear_transposition_table()
+
+        """ Player 2 has to block the three in a row """
+        column_index, score, principal_variation, depth = MiniMaxAI.analyze(board, 2, 4)
+
+        self.assertEqual(column_index, 3)
+        self.assertEqual(principal_variation[0], 3)
+        self.assertTrue(1 <= len(principal_variation) <= 4)
+        self.assertEqual(depth, 4)
+        self.assertEqual(board.get_move_history(), (0, 0, 1, 1, 2))
+
+        """ The principal variation is made of valid moves """
+        for move_index, column_index in enumerate(principal_variation):
+            board.drop_piece(column_index, (move_index + 1) % 2 + 1)
+
+        column_index, score, principal_variation, depth = MiniMaxAI.analyze(Board(7, 6), 1, move_time=50)
+
+        self.assertIn(column_index, range(7))
+        self.assertGreaterEqual(depth, 1)
+        self.assertEqual(principal_variation[0], column_index)
@@ -0,0 +1,54 @@
+import unittest
+
+from src.ai.move_ordering import MoveOrderer
+from test.config import settings
+
+class MoveOrdererTest(unittest.TestCase):
+    def test_no_heuristics(self):
+        move_orderer = MoveOrderer(7, [])
+
+        self.assertEqual(move_orderer.order_moves([0, 1, 2, 3, 4, 5, 6], 0), [0, 1, 2, 3, 4, 5, 6])
+        self.assertEqual(move_orderer.order_moves([0, 1, 2, 3, 4, 5, 6], 0, 5), [5, 0, 1, 2, 3, 4, 6])
+
+    def test_center(self):
+        move_orderer = MoveOrderer(7, [MoveOrderer.CENTER])
+
+        self.assertEqual(move_orderer.order_moves([0, 1, 2, 3, 4, 5, 6], 0), [3, 2, 4, 1, 5, 0, 6])
+        self.assertEqual(move_orderer.order_moves([0, 1, 5, 6], 0), [1, 5, 0, 6])
+        self.assertEqual(move_orderer.order_moves([0, 1, 5, 6], 0, 6), [6, 1, 5, 0])
+
+    def test_killer(self):
+        move_orderer = MoveOrderer(7, [MoveOrderer.CENTER, MoveOrderer.KILLER])
+
+        move_orderer.record_cutoff(6, 2, 3, 4)
+        move_orderer.record_cutoff(0, 2, 3, 1)
+
+        self.assertEqual(move_orderer.order_moves([0, 1, 2, 3, 4, 5, 6], 2), [0, 6, 3, 2, 4, 1, 5])
+        self.assertEqual(move_orderer.order_moves([0, 1, 2, 3, 4, 5, 6], 1), [3, 2, 4, 1, 5, 0, 6])
+
+        """ Only the last KILLER_MOVES_PER_PLY moves are kept """
+        move_orderer.record_cutoff(5, 2, 3, 0)
+        self.assertEqual(move_orderer.order_moves([0, 1, 2, 3, 4, 5, 6], 2), [5, 0, 3, 2, 4, 1, 6])
+
+    def test_history(self):
+        move_orderer = MoveOrderer(7, [MoveOrderer.CENTER, MoveOrderer.HISTORY])
+
+        move_orderer.record_cutoff(1, 4, 2, 1)
+        move_orderer.record_cutoff(5, 3, 3, 0)
+
+        self.assertEqual(move_orderer.order_moves([0, 1, 2, 3, 4, 5, 6], 0), [5, 1, 3, 2, 4, 0, 6])
+
+    def test_get_statistics(self):
+        move_orderer = MoveOrderer(7, [MoveOrderer.CENTER])
+
+        for _ in range(4):
+            move_orderer.order_moves([0, 1, 2], 0)
+        move_orderer.record_cutoff(1, 0, 1, 0)
+        move_orderer.record_cutoff(2, 0, 1, 2)
+
+        statistics = move_orderer.get_statistics()
+        self.assertEqual(statistics["expanded_nodes"], 4)
+        self.assertEqual(statistics["cutoffs"], 2)
+        self.assertEqual(statistics["first_move_cutoffs"], 1)
+        self.assertEqual(statistics["cutoff_rate"], 0.5)
+        self.assertEqual(statistics["first_move_cutoff_rate"], 0.5)
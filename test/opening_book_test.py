@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.ai.opening_book import OpeningBook, OpeningBookException, OpeningBookFormatException
+from src.ai.minimax_ai import MiniMaxAI
+from src.domain.board import Board
+from test.config import settings
+import config
+
+class OpeningBookTest(unittest.TestCase):
+    def setUp(self):
+        self.book_file_name = os.path.join(tempfile.mkdtemp(), "book.bin")
+
+        """ Fake engine, always plays the leftmost valid move """
+        entries = OpeningBook.build(Board(7, 6), 3, lambda board, player: board.get_valid_moves()[0])
+        OpeningBook.write(self.book_file_name, 7, 6, 4, entries)
+
+        self.book = OpeningBook(self.book_file_name)
+
+    def tearDown(self):
+        self.book.close()
+        os.remove(self.book_file_name)
+
+    def test_get_position_key(self):
+        board = Board(7, 6)
+        self.assertEqual(OpeningBook.get_position_key(board), sum(1 << (column_index * 7) for column_index in range(7)))
+
+        board.drop_piece(0, 1)
+        board.drop_piece(6, 2)
+        self.assertNotEqual(OpeningBook.get_position_key(board), OpeningBook.get_position_key(board, True))
+
+        mirrored_board = Board(7, 6)
+        mirrored_board.drop_piece(6, 1)
+        mirrored_board.drop_piece(0, 2)
+        self.assertEqual(OpeningBook.get_position_key(board, True), OpeningBook.get_position_key(mirrored_board))
+
+    def test_get_move(self):
+        """ 1 + 7 + 49 positions, mirror images sharing an entry """
+        self.assertEqual(len(self.book), 1 + 4 + 25)
+
+        board = Board(7, 6)
+        self.assertEqual(self.book.get_move(board, 1, 4, 2), 0)
+
+        board.drop_piece(0, 1)
+        self.assertEqual(self.book.get_move(board, 2, 4, 2), 0)
+
+        """ Mirrored position, the move stored for its mirror image is mirrored back """
+        board.pop_piece()
+        board.drop_piece(6, 1)
+        self.assertEqual(self.book.get_move(board, 2, 4, 2), 6)
+
+        """ Not the player to move / outside the book / other game shape """
+        self.assertIsNone(self.book.get_move(board, 1, 4, 2))
+        board.drop_piece(3, 2)
+        board.drop_piece(3, 1)
+        self.assertIsNone(self.book.get_move(board, 2, 4, 2))
+        self.assertIsNone(self.book.get_move(Board(7, 6), 1, 5, 2))
+        self.assertIsNone(self.book.get_move(Board(6, 6), 1, 4, 2))
+
+        """ A book of two player games is not used with more players """
+        self.assertIsNone(self.book.get_move(Board(7, 6), 1, 4, 3))
+
+    def test_invalid_file(self):
+        with open(self.book_file_name, "wb") as book_file:
+            book_file.write(b"not a book file")
+
+        with self.assertRaises(OpeningBookFormatException):
+            OpeningBook(self.book_file_name)
+
+        open(self.book_file_name, "wb").close()
+
+        with self.assertRaises(OpeningBookFormatException):
+            OpeningBook(self.book_file_name)
+
+        with self.assertRaises(OpeningBookException):
+            OpeningBook.write(self.book_file_name, 10, 10, 4, {})
+
+    def test_minimax_ai_book_move(self):
+        board = Board(7, 6)
+        board.drop_piece(3, 1)
+
+        with patch.dict(config.settings["ai"]["minimax"], {"OPENING_BOOK": self.book_file_name}):
+            self.assertEqual(MiniMaxAI.get_move(board, 2), 0)
+
+            """ Not a two player game, the book is not used """
+            with patch.dict(config.settings["game"], {"NUMBER_OF_PLAYERS": 3}):
+                self.assertNotEqual(MiniMaxAI.get_move(board, 2), 0)
@@ -0,0 +1,60 @@
+import unittest
+
+from src.ai.shared_transposition_table import SharedTranspositionTable
+from src.ai.transposition_table import TranspositionTable
+from test.config import settings
+
+class SharedTranspositionTableTest(unittest.TestCase):
+    def setUp(self):
+        self.table = SharedTranspositionTable(8)
+
+    def tearDown(self):
+        self.table.close()
+
+    def test_probe_store(self):
+        self.assertIsNone(self.table.probe(3))
+
+        self.table.store(3, 4, -999_999, TranspositionTable.UPPER_BOUND, None)
+        self.assertEqual(self.table.probe(3), (3, 4, -999_999, TranspositionTable.UPPER_BOUND, None))
+
+        self.table.store(3, 5, 17, TranspositionTable.EXACT, 6)
+        self.assertEqual(self.table.probe(3), (3, 5, 17, TranspositionTable.EXACT, 6))
+
+        large_key = (1 << 64) - 5
+        self.table.store(large_key, 2, 0, TranspositionTable.LOWER_BOUND, 0)
+        self.assertEqual(self.table.probe(large_key), (large_key, 2, 0, TranspositionTable.LOWER_BOUND, 0))
+        self.assertIsNone(self.table.probe(11))
+
+        self.table.clear()
+        self.assertIsNone(self.table.probe(3))
+
+    def test_two_tier_replacement(self):
+        self.table.store(3, 4, 10, TranspositionTable.EXACT, 2)
+        self.table.store(11, 2, 20, TranspositionTable.LOWER_BOUND, 1)
+        self.assertIsNotNone(self.table.probe(3))
+        self.assertIsNotNone(self.table.probe(11))
+
+        self.table.store(19, 5, 40, TranspositionTable.EXACT, 3)
+        self.assertIsNotNone(self.table.probe(19))
+        self.assertIsNotNone(self.table.probe(3))
+        self.assertIsNone(self.table.probe(11))
+
+    def test_attach(self):
+        attached_table = SharedTranspositionTable(8, self.table.name)
+
+        try:
+            attached_table.store(5, 3, 12, TranspositionTable.EXACT, 4)
+            self.assertEqual(self.table.probe(5), (5, 3, 12, TranspositionTable.EXACT, 4))
+        finally:
+            attached_table.close()
+
+        self.assertEqual(self.table.probe(5), (5, 3, 12, TranspositionTable.EXACT, 4))
+
+    def test_torn_entry(self):
+        self.table.store(3, 4, 10, TranspositionTable.EXACT, 2)
+
+        """ A data word changed by a concurrent write, without its checked key """
+        entries = self.table._SharedTranspositionTable__entries
+        entries[3, 0, 1] = entries[3, 0, 1] ^ 1
+
+        self.assertIsNone(self.table.probe(3))
@@ -0,0 +1,154 @@
+import unittest
+from unittest.mock import patch
+from threading import Event, Timer
+from time import perf_counter
+
+from src.ai.solver_ai import SolverAI, SolverAIException, SolverPosition
+from src.ai.search_context import SearchTimeoutException
+from src.domain.board import Board
+from src.service.game_state_analyzer import GameStateAnalyzer
+from test.config import settings
+import config
+
+def drop_pieces(board, columns):
+    """ Drops pieces in the given columns, players 1 and 2 alternating """
+    for move_index, column_index in enumerate(columns):
+        board.drop_piece(column_index, move_index % 2 + 1)
+
+    return len(columns) % 2 + 1
+
+def solve_exhaustively(board, player, moves):
+    """ Plain negamax over the whole game tree, using the SolverAI score convention """
+    cells = board.width * board.height
+    best_score = None
+
+    for column_index in board.get_valid_moves():
+        board.drop_piece(column_index, player)
+
+        if GameStateAnalyzer.is_player_winning(board, player):
+            score = (cells + 1 - moves) // 2
+        elif moves + 1 == cells:
+            score = 0
+        else:
+            score = -solve_exhaustively(board, 3 - player, moves + 1)
+
+        board.pop_piece()
+
+        if best_score is None or score > best_score:
+            best_score = score
+
+    return best_score
+
+class SolverAITest(unittest.TestCase):
+    def setUp(self):
+        SolverAI.clear_transposition_table()
+
+    def test_position(self):
+        board = Board(7, 6)
+        player = drop_pieces(board, [3, 3, 2])
+
+        position = SolverPosition.from_board(board, player, 4)
+        self.assertEqual(position.moves, 3)
+        self.assertTrue(position.can_play(3))
+
+        key = position.get_key()
+        position.play(4)
+        self.assertEqual(position.moves, 4)
+        position.undo(4)
+        self.assertEqual(position.get_key(), key)
+
+        for _ in range(4):
+            position.play(3)
+        self.assertFalse(position.can_play(3))
+
+    def test_winning_mask(self):
+        board = Board(7, 6)
+        player = drop_pieces(board, [1, 1, 2, 2, 3])
+
+        """ Player 2 can not block both ends of 1-2-3 """
+        position = SolverPosition.from_board(board, player, 4)
+        self.assertEqual(position.get_non_losing_mask(), 0)
+
+        board.drop_piece(4, 2)
+        position = SolverPosition.from_board(board, 1, 4)
+        self.assertTrue(position.can_win_next())
+
+    def test_solve_small_boards(self):
+        with patch.dict(config.settings["game"], {"WINNING_SEQUENCE_LENGTH": 3}):
+            board = Board(4, 4)
+            player = drop_pieces(board, [0, 3, 1, 2, 1, 2, 0])
+            self.assertEqual(SolverAI.solve(board, player), solve_exhaustively(board, player, 7))
+
+            board = Board(4, 4)
+            player = drop_pieces(board, [0, 1, 3, 2, 1, 2])
+            self.assertEqual(SolverAI.solve(board, player), solve_exhaustively(board, player, 6))
+
+        board = Board(5, 4)
+        player = drop_pieces(board, [2, 2, 1, 3, 2, 2, 4, 0, 1, 3])
+        self.assertEqual(SolverAI.solve(board, player), solve_exhaustively(board, player, 10))
+
+    def test_rules_change(self):
+        """ The positions cached for one WINNING_SEQUENCE_LENGTH are not used for another """
+        board = Board(4, 4)
+        player = drop_pieces(board, [3, 0, 1, 2, 0])
+
+        with patch.dict(config.settings["game"], {"WINNING_SEQUENCE_LENGTH": 3}):
+            SolverAI.solve(board, player)
+
+        self.assertEqual(SolverAI.solve(board, player), solve_exhaustively(board, player, 5))
+
+    def test_two_players_only(self):
+        with patch.dict(config.settings["game"], {"NUMBER_OF_PLAYERS": 3}):
+            with self.assertRaises(SolverAIException):
+                SolverAI.get_move(Board(7, 6), 1)
+
+            with self.assertRaises(SolverAIException):
+                SolverAI.solve(Board(7, 6), 1)
+
+    def test_solve_distance(self):
+        board = Board(7, 6)
+        drop_pieces(board, [1, 6, 2, 6, 3])
+
+        """ Player 2 can not block both ends, player 1 wins with its 4th piece (of 21) """
+        self.assertEqual(SolverAI.solve(board, 2), -18)
+
+        board.drop_piece(0, 2)
+        self.assertEqual(SolverAI.solve(board, 1), 18)
+
+    def test_get_move(self):
+        board = Board(7, 6)
+        drop_pieces(board, [0, 6, 1, 6, 2, 6])
+        self.assertEqual(SolverAI.get_move(board, 1), 3)
+
+        board = Board(5, 4)
+        drop_pieces(board, [0, 4, 1, 4, 2])
+        self.assertEqual(SolverAI.get_move(board, 2), 3)
+
+        board = Board(4, 4)
+        for column_index in range(4):
+            for row_index in range(4):
+                board.drop_piece(column_index, (column_index // 2 + row_index) % 2 + 1)
+        self.assertIsNone(SolverAI.get_move(board, 1))
+
+    def test_stop_event(self):
+        stop_event = Event()
+        stop_event.set()
+
+        SolverAI.clear_transposition_table()
+
+        with self.assertRaises(SearchTimeoutException):
+            SolverAI.get_move(Board(7, 6), 1, stop_event)
+
+        board = Board(7, 6)
+        drop_pieces(board, [0, 6, 1, 6, 2, 6])
+        self.assertEqual(SolverAI.get_move(board, 1, stop_event), 3)
+
+        """ Stops inside a null window search (solving the empty board takes far too long) """
+        stop_event = Event()
+        Timer(0.2, stop_event.set).start()
+        start_time = perf_counter()
+
+        with self.assertRaises(SearchTimeoutException):
+            SolverAI.get_move(Board(7, 6), 1, stop_event)
+
+        self.assertLess(perf_counter() - start_time, 1)
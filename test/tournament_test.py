@@ -0,0 +1,103 @@
+import pickle
+import unittest
+from math import inf
+from random import Random
+from unittest.mock import patch
+
+from src.ai.minimax_ai import MiniMaxAI
+from src.domain.board import Board
+
+from src.service.tournament import EngineSpec, GameResult, Tournament, TournamentReport, \
+                                   TournamentException, UnknownEngineException, play_game
+from test.config import settings
+import config
+
+class TournamentTest(unittest.TestCase):
+    def test_engine_spec(self):
+        engine_spec = EngineSpec.parse("minimax:3")
+        self.assertEqual((engine_spec.name, engine_spec.depth), ("minimax", 3))
+        self.assertEqual(str(engine_spec), "minimax:3")
+
+        self.assertIsNone(EngineSpec.parse("random").depth)
+
+        with self.assertRaises(UnknownEngineException):
+            EngineSpec.parse("alphazero")
+        with self.assertRaises(UnknownEngineException):
+            EngineSpec.parse("minimax:deep")
+        with self.assertRaises(UnknownEngineException):
+            EngineSpec.parse("minimax:0")
+        with self.assertRaises(UnknownEngineException):
+            EngineSpec.parse("minimax:\u00b2")
+
+        """ Only the engines searching to a fixed depth take one """
+        for name in ("random", "solver", "mcts"):
+            with self.assertRaises(UnknownEngineException):
+                EngineSpec.parse("{}:3".format(name))
+
+    def test_transposition_tables(self):
+        """ The moves of a shallow engine do not depend on the searches of a deeper opponent """
+        generator = Random(0)
+        MiniMaxAI.clear_transposition_table()
+
+        for _ in range(10):
+            board = Board(7, 6)
+            for move_index in range(8):
+                board.drop_piece(generator.choice(board.get_valid_moves()), move_index % 2 + 1)
+
+            shallow_move = EngineSpec("minimax", 2).get_move(board, 1)
+
+            shallow_engine_spec = EngineSpec("minimax", 2)
+            shallow_engine_spec.get_move(board, 1)
+            EngineSpec("minimax", 5).get_move(board, 1)
+
+            self.assertEqual(shallow_engine_spec.get_move(board, 1), shallow_move)
+
+        """ The table is not copied with the EngineSpec """
+        self.assertIsNone(pickle.loads(pickle.dumps(shallow_engine_spec))._EngineSpec__transposition_table)
+
+    def test_play_game(self):
+        engine_specs = (EngineSpec("minimax", 2), EngineSpec("random"))
+
+        result = play_game(engine_specs, 1, 2, 0)
+        self.assertEqual(result.game_index, 1)
+        self.assertEqual(result.first_engine_index, 1)
+        self.assertIn(result.winner_engine_index, [0, 1, None])
+
+        """ The random opening moves are not timed """
+        self.assertEqual(sum(len(latencies) for latencies in result.move_latencies), result.move_count - 2)
+
+    def test_report(self):
+        report = TournamentReport((EngineSpec("minimax"), EngineSpec("random")))
+        self.assertIsNone(report.get_elo_difference())
+
+        for game_index, winner_engine_index in enumerate([0, 0, 0, None, 1]):
+            report.add_result(GameResult(game_index, game_index % 2, winner_engine_index, 10, ([0.001], [0.002])))
+
+        self.assertEqual(report.games, 5)
+        self.assertEqual(report.get_rates(), (0.6, 0.2, 0.2))
+
+        """ A 70% score is worth about 147 Elo """
+        self.assertAlmostEqual(report.get_elo_difference(), 147.2, places=1)
+        self.assertAlmostEqual(report.get_latency_percentiles(1)[50], 2)
+        self.assertIn("W/D/L: 3 / 1 / 1", report.format())
+
+        report = TournamentReport((EngineSpec("minimax"), EngineSpec("random")))
+        report.add_result(GameResult(0, 0, 0, 7, ([], [])))
+        self.assertEqual(report.get_elo_difference(), inf)
+        self.assertIsNone(report.get_latency_percentiles(0))
+
+    def test_run(self):
+        with self.assertRaises(TournamentException):
+            Tournament((EngineSpec("random"),), 1)
+
+        with patch.dict(config.settings["game"], {"NUMBER_OF_PLAYERS": 3}):
+            with self.assertRaises(TournamentException):
+                Tournament((EngineSpec("random"), EngineSpec("random")), 1)
+            with self.assertRaises(TournamentException):
+                play_game((EngineSpec("random"), EngineSpec("random")), 0, 0, 0)
+
+        tournament = Tournament((EngineSpec("minimax", 1), EngineSpec("random")), 4, 2, 1)
+        results = list(tournament.run())
+
+        self.assertEqual(sorted(result.game_index for result in results), [0, 1, 2, 3])
+        self.assertEqual(tournament.report.games, 4)
@@ -0,0 +1,69 @@
+import unittest
+
+from src.ai.transposition_table import TranspositionTable, ZobristHasher
+from src.domain.board import Board
+from test.config import settings
+
+class ZobristHasherTest(unittest.TestCase):
+    def setUp(self):
+        self.hasher = ZobristHasher(7, 6)
+
+    def test_hash_board(self):
+        board = Board(7, 6)
+        self.assertEqual(self.hasher.hash_board(board), 0)
+
+        board.drop_piece(3, 1)
+        board.drop_piece(3, 2)
+        board.drop_piece(4, 1)
+
+        incremental_hash = self.hasher.get_piece_key(5, 3, 1) ^ \
+                           self.hasher.get_piece_key(4, 3, 2) ^ \
+                           self.hasher.get_piece_key(5, 4, 1)
+        self.assertEqual(self.hasher.hash_board(board), incremental_hash)
+
+        """ Keys do not depend on the hasher instance """
+        self.assertEqual(ZobristHasher(7, 6).hash_board(board), incremental_hash)
+
+    def test_get_side_key(self):
+        self.assertNotEqual(self.hasher.get_side_key(1, True), self.hasher.get_side_key(1, False))
+        self.assertNotEqual(self.hasher.get_side_key(1, True), self.hasher.get_side_key(2, True))
+        self.assertEqual(self.hasher.get_side_key(2, False), self.hasher.get_side_key(2, False))
+
+class TranspositionTableTest(unittest.TestCase):
+    def setUp(self):
+        self.table = TranspositionTable(8)
+
+    def test_probe_store(self):
+        self.assertIsNone(self.table.probe(3))
+
+        self.table.store(3, 4, 10, TranspositionTable.EXACT, 2)
+        self.assertEqual(self.table.probe(3), (3, 4, 10, TranspositionTable.EXACT, 2))
+        self.assertIsNone(self.table.probe(11))
+
+        self.table.clear()
+        self.assertIsNone(self.table.probe(3))
+
+    def test_two_tier_replacement(self):
+        self.table.store(3, 4, 10, TranspositionTable.EXACT, 2)
+
+        """ Shallower entries go to the always-replace tier """
+        self.table.store(11, 2, 20, TranspositionTable.LOWER_BOUND, 1)
+        self.assertIsNotNone(self.table.probe(3))
+        self.assertIsNotNone(self.table.probe(11))
+
+        self.table.store(19, 1, 30, TranspositionTable.UPPER_BOUND, 0)
+        self.assertIsNotNone(self.table.probe(3))
+        self.assertIsNone(self.table.probe(11))
+        self.assertIsNotNone(self.table.probe(19))
+
+        """ Deeper entries take the depth-preferred tier, demoting the old entry """
+        self.table.store(27, 5, 40, TranspositionTable.EXACT, 3)
+        self.assertIsNotNone(self.table.probe(27))
+        self.assertIsNotNone(self.table.probe(3))
+        self.assertIsNone(self.table.probe(19))
+
+    def test_disabled(self):
+        table = TranspositionTable(0)
+        table.store(3, 4, 10, TranspositionTable.EXACT, 2)
+
+        self.assertIsNone(table.probe(3))
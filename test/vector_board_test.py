@@ -0,0 +1,86 @@
+import unittest
+
+import numpy as np
+
+from src.domain.board import Board, BoardFullColumnDropException
+from src.domain.vector_board import VectorBoard
+from src.service.game import Game
+from test.config import settings
+
+class VectorBoardTest(unittest.TestCase):
+    def test_step(self):
+        vector_board = VectorBoard(3, 7, 6, 4)
+
+        winners, draws = vector_board.step([0, 3, 6])
+
+        self.assertEqual(winners.tolist(), [0, 0, 0])
+        self.assertEqual(draws.tolist(), [False, False, False])
+        self.assertEqual(vector_board.cells[1, 5, 3], 1)
+        self.assertEqual(vector_board.heights[2].tolist(), [0, 0, 0, 0, 0, 0, 1])
+        self.assertEqual(vector_board.players.tolist(), [2, 2, 2])
+
+        vector_board.step([0, 0, 0])
+        self.assertEqual(vector_board.cells[0, 4, 0], 2)
+        self.assertEqual(vector_board.move_counts.tolist(), [2, 2, 2])
+
+        for _ in range(4):
+            vector_board.step([0, 1, 1])
+
+        with self.assertRaises(BoardFullColumnDropException):
+            vector_board.step([0, 1, 1])
+
+    def test_matches_game(self):
+        """ Random games, compared with Game on Board objects (the finished ones restart) """
+        random_generator = np.random.default_rng(0)
+        number_of_games = 40
+
+        vector_board = VectorBoard(number_of_games, 5, 4, 4)
+        boards = [Board(5, 4) for _ in range(number_of_games)]
+        games = [Game(board) for board in boards]
+
+        for _ in range(200):
+            players = vector_board.players.copy()
+            columns = vector_board.get_random_moves(random_generator)
+
+            winners, draws = vector_board.step(columns)
+
+            for game_index in range(number_of_games):
+                games[game_index].make_move(int(columns[game_index]), int(players[game_index]))
+
+                self.assertEqual(winners[game_index], games[game_index].get_winner() or 0)
+                self.assertEqual(draws[game_index], games[game_index].is_draw())
+
+                if games[game_index].is_over():
+                    boards[game_index] = Board(5, 4)
+                    games[game_index] = Game(boards[game_index])
+
+                self.assertTrue((vector_board.cells[game_index] == boards[game_index].get_view()).all())
+
+        self.assertGreater(vector_board.wins[1], 0)
+        self.assertGreater(vector_board.draws, 0)
+
+    def test_winning_moves(self):
+        vector_board = VectorBoard(2, 7, 6, 4, number_of_players=3)
+
+        """ Player 1 gets three in a row in game 0 (players 2 and 3 drop elsewhere) """
+        for columns in ([0, 6], [6, 6], [5, 5], [1, 0], [6, 0], [5, 1], [2, 4]):
+            vector_board.step(columns)
+
+        self.assertEqual(vector_board.players.tolist(), [2, 2])
+
+        """ Player 2 to move: no win in game 0 """
+        self.assertFalse(vector_board.get_winning_moves()[0].any())
+
+        vector_board.step([4, 4])
+        vector_board.step([4, 4])
+
+        winning_moves = vector_board.get_winning_moves()
+        self.assertEqual(np.flatnonzero(winning_moves[0]).tolist(), [3])
+
+        columns = vector_board.get_greedy_moves(np.random.default_rng(0))
+        self.assertEqual(columns[0], 3)
+
+        winners, _ = vector_board.step(columns)
+        self.assertEqual(winners[0], 1)
+        self.assertEqual(vector_board.wins[1], 1)
+        self.assertEqual(vector_board.move_counts[0], 0)
@@ -0,0 +1,39 @@
+import argparse
+import os
+
+from src.service.tournament import EngineSpec, Tournament
+
+def parse_arguments():
+    """ Parses the command line arguments of the tournament runner """
+    parser = argparse.ArgumentParser(
+            description="Plays AI engine games without UI on the configured board and reports the results")
+
+    parser.add_argument("engines", nargs=2, type=EngineSpec.parse,
+                        help="the two engines, as name or name:depth (names: {}, with a depth: {})".format(
+                            ", ".join(sorted(EngineSpec.ENGINES)), ", ".join(sorted(EngineSpec.DEPTH_SETTINGS))))
+    parser.add_argument("--games", type=int, default=100, help="the number of games (default: 100)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="the number of worker processes (default: the number of CPUs)")
+    parser.add_argument("--opening-plies", type=int, default=2,
+                        help="the number of random moves starting every game (default: 2)")
+    parser.add_argument("--seed", type=int, default=0, help="the seed of the random opening moves (default: 0)")
+
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+
+    tournament = Tournament(arguments.engines, arguments.games, arguments.workers,
+                            arguments.opening_plies, arguments.seed)
+
+    for result in tournament.run():
+        if result.winner_engine_index is None:
+            outcome = "draw"
+        else:
+            outcome = "{} wins".format(arguments.engines[result.winner_engine_index])
+
+        print("game {}: {} moved first, {} in {} moves".format(
+            result.game_index, arguments.engines[result.first_engine_index], outcome, result.move_count), flush=True)
+
+    print()
+    print(tournament.report.format())